@@ -1,6 +1,9 @@
 from fastapi import APIRouter
 
-from app.api.api_v1.endpoints import economic
+from app.api.api_v1.endpoints import admin, alerts, economic, live
 
 api_router = APIRouter()
-api_router.include_router(economic.router, prefix="/economic", tags=["economic"]) 
\ No newline at end of file
+api_router.include_router(economic.router, prefix="/economic", tags=["economic"]) 
+api_router.include_router(live.router, prefix="/economic/live", tags=["live"])
+api_router.include_router(alerts.router, prefix="/economic/alerts", tags=["alerts"])
+api_router.include_router(admin.router, prefix="/admin", tags=["admin"])
@@ -0,0 +1,35 @@
+import hmac
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import PlainTextResponse
+
+from app.core.config import settings
+from app.core.profiling import profile_store
+
+router = APIRouter()
+
+def require_profiling_token(x_profile: Optional[str] = Header(default=None)) -> None:
+    """Admin access uses the same token that opts requests into profiling"""
+    if not settings.PROFILING_TOKEN:
+        raise HTTPException(status_code=404, detail="Profiling is disabled")
+    if x_profile is None or not hmac.compare_digest(x_profile.encode(), settings.PROFILING_TOKEN.encode()):
+        raise HTTPException(status_code=403, detail="Invalid profiling token")
+
+@router.get("/profiles", dependencies=[Depends(require_profiling_token)])
+async def list_profiles():
+    """Recorded request profiles, newest first"""
+    return {"profiles": profile_store.list()}
+
+@router.get("/profiles/{profile_id}", response_class=PlainTextResponse, dependencies=[Depends(require_profiling_token)])
+async def get_profile(profile_id: int):
+    """Folded stacks for one profile, ready for flamegraph.pl or speedscope"""
+    profile = profile_store.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail=f"Profile {profile_id} not found")
+    return profile["folded"]
+
+@router.delete("/profiles", dependencies=[Depends(require_profiling_token)])
+async def clear_profiles():
+    profile_store.clear()
+    return {"message": "Profiles cleared"}
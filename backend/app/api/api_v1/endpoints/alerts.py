@@ -0,0 +1,65 @@
+import asyncio
+
+from fastapi import APIRouter, HTTPException, Query
+
+from app.core.config import settings
+from app.api.api_v1.endpoints.economic import alert_engine, series_store
+from app.services.alerting import MemoryAlertSink
+
+router = APIRouter()
+
+# Recent events served by /events
+recent_alerts = MemoryAlertSink(maxlen=500)
+alert_engine.add_sink(recent_alerts)
+
+@router.post("/rules")
+async def create_alert_rule(rule_data: dict):
+    """Register a threshold or change rule on a FRED series or market symbol"""
+    try:
+        rule = alert_engine.add_rule(
+            series_id=rule_data["series_id"],
+            operator=rule_data.get("operator", ">"),
+            threshold=float(rule_data["threshold"]),
+            transform=rule_data.get("transform", "level"),
+            window=int(rule_data.get("window", 1)),
+            over=int(rule_data.get("over", 0)),
+            name=rule_data.get("name")
+        )
+    except (KeyError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid rule: {str(e)}")
+
+    try:
+        # Warm the rule's rolling state from stored history so it can fire on the next observation
+        stored = await series_store.get(rule["series_id"])
+        if stored is not None:
+            alert_engine.ingest(rule["series_id"], stored[0], stored[1])
+            alert_engine.prime(rule["series_id"], stored[1])
+        series_store.watch_alerts(settings.ALERT_REFRESH_INTERVAL_SECONDS)
+        return {"rule": rule, "message": "Rule created successfully"}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error loading series for rule: {str(e)}")
+
+@router.get("/rules")
+async def list_alert_rules(series_id: str = Query(default=None, description="Only rules on this series")):
+    """Registered rules with their current value and whether they are active"""
+    return {"rules": alert_engine.rules(series_id)}
+
+@router.delete("/rules/{rule_id}")
+async def delete_alert_rule(rule_id: int):
+    if not alert_engine.remove_rule(rule_id):
+        raise HTTPException(status_code=404, detail=f"Rule {rule_id} not found")
+    return {"message": "Rule deleted successfully"}
+
+@router.get("/events")
+async def get_alert_events(limit: int = Query(default=50, ge=1, le=500)):
+    """Most recent alert events, newest first"""
+    return {"events": recent_alerts.recent(limit)}
+
+@router.post("/evaluate")
+async def evaluate_alerts():
+    """Refresh every series that has rules; stale series are refetched and new observations evaluated"""
+    try:
+        await asyncio.gather(*(series_store.get(series_id) for series_id in alert_engine.series))
+        return {"series": alert_engine.series, "events": recent_alerts.recent(50)}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error evaluating alerts: {str(e)}")
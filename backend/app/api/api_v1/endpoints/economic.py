@@ -1,17 +1,38 @@
-from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response
 from typing import List, Optional
 import asyncio
+import pandas as pd
 from datetime import datetime
 
 from app.services.real_data_service import RealDataService
 from app.services.economic_model import EconomicModelService
+from app.services.series_store import SeriesStore
+from app.services.alerting import AlertEngine, LogAlertSink
+from app.services.correlation import CorrelationService
+from app.core.config import settings
+from app.utils.downsampling import downsample
 from app.schemas.economic import EconomicIndicator, ForecastResponse, RiskAssessment, Scenario
 
 router = APIRouter()
 
 # Initialize services
-real_data_service = RealDataService()
 model_service = EconomicModelService()
+real_data_service = RealDataService(model_service)
+alert_engine = AlertEngine(sinks=[LogAlertSink()])
+series_store = SeriesStore(
+    real_data_service,
+    settings.SERIES_STORE_DIR,
+    ttl=settings.SERIES_STORE_TTL_SECONDS,
+    alert_engine=alert_engine
+)
+correlation_service = CorrelationService(real_data_service)
+
+def _not_modified(request: Request, response: Response, etag: str, max_age: int = 300) -> bool:
+    """Set caching headers and report whether the client already holds this ETag"""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = f"public, max-age={max_age}"
+    if_none_match = request.headers.get("if-none-match", "")
+    return etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*"
 
 @router.get("/indicators", response_model=dict)
 async def get_economic_indicators():
@@ -24,21 +45,34 @@ async def get_economic_indicators():
 
 @router.get("/forecast", response_model=dict)
 async def get_economic_forecast(
+    request: Request,
+    response: Response,
     periods: int = Query(default=12, ge=1, le=24, description="Number of periods to forecast")
 ):
     """Get economic forecast based on real historical data"""
     try:
         forecast_data = await real_data_service.get_forecast_data(periods=periods)
+        if forecast_data["vintage"] == "fallback":
+            # Not a data vintage: shared caches must not keep serving it once upstream recovers
+            response.headers["Cache-Control"] = "no-store"
+            return forecast_data
+        if _not_modified(request, response, f'"{forecast_data["vintage"]}-{periods}"'):
+            return Response(status_code=304, headers=dict(response.headers))
         return forecast_data
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error generating forecast: {str(e)}")
 
 @router.get("/risk-assessment", response_model=dict)
-async def get_risk_assessment():
-    """Get current risk assessment based on real market conditions"""
+async def get_risk_assessment(
+    horizon: int = Query(default=4, ge=1, le=24, description="Quarters ahead for tail metrics")
+):
+    """Get current risk assessment based on real market conditions and simulated tail risk"""
     try:
-        risks = await real_data_service.get_risk_assessments()
-        return {"risks": risks}
+        # Both come from the one cached simulation for the current data vintage
+        tail_risk = await real_data_service.get_tail_risk(horizon=horizon)
+        year_ahead = tail_risk if horizon == 4 else await real_data_service.get_tail_risk(horizon=4)
+        risks = await real_data_service.get_risk_assessments(tail_risk=year_ahead)
+        return {"risks": risks, "tail_risk": tail_risk}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error calculating risks: {str(e)}")
 
@@ -53,6 +87,66 @@ async def get_market_data(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching market data: {str(e)}")
 
+@router.get("/dashboard", response_model=dict)
+async def get_dashboard(
+    fields: Optional[List[str]] = Query(
+        default=None,
+        description="Panels to include: indicators, forecast, risks, market_data (all when omitted)"
+    )
+):
+    """Get several dashboard panels in one round trip, sharing upstream data between them"""
+    try:
+        return await real_data_service.get_dashboard(fields=fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error building dashboard: {str(e)}")
+
+@router.get("/correlations", response_model=dict)
+async def get_correlations(
+    series: Optional[List[str]] = Query(default=None, description="FRED series ids (at least two)"),
+    method: str = Query(default="ew", pattern="^(ew|rolling)$", description="Exponentially weighted or rolling window"),
+    freq: str = Query(default="Q", pattern="^[DWMQA]$", description="Panel frequency"),
+    transform: str = Query(default="diff", pattern="^(pct_change|diff|level)$", description="Applied to each series first")
+):
+    """Get the cross-indicator covariance and correlation matrices"""
+    try:
+        series_ids = series or ["GDPC1", "CPIAUCSL", "UNRATE", "FEDFUNDS"]
+        return await correlation_service.get_matrix(series_ids, method=method, freq=freq, transform=transform)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error computing correlations: {str(e)}")
+
+@router.get("/series/{series_id}", response_model=dict)
+async def get_series_history(
+    series_id: str,
+    start: Optional[datetime] = Query(default=None, description="First date to include"),
+    end: Optional[datetime] = Query(default=None, description="Last date to include"),
+    points: int = Query(default=1000, ge=3, le=10000, description="Maximum number of points returned"),
+    method: str = Query(default="lttb", pattern="^(lttb|minmax|none)$", description="Downsampling method")
+):
+    """Get the history of a FRED series or market symbol, downsampled server-side"""
+    try:
+        history = await series_store.query(series_id, start=start, end=end)
+        if history is None:
+            raise HTTPException(status_code=404, detail=f"No history available for {series_id}")
+        
+        dates, values = history
+        total = len(dates)
+        dates, values = downsample(dates, values, points, method=method)
+        return {
+            "series_id": series_id,
+            "method": method if total > points else "none",
+            "total_points": total,
+            "labels": pd.to_datetime(dates).strftime("%Y-%m-%d").tolist(),
+            "data": values.round(4).tolist()
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching series history: {str(e)}")
+
 @router.get("/analysis/{model_type}")
 async def get_economic_analysis(
     model_type: str,
@@ -75,23 +169,21 @@ async def get_economic_analysis(
             # Filter for GDP data
             gdp_datasets = [ds for ds in forecast_data["datasets"] if "GDP" in ds["label"]]
             
-            # Add confidence intervals (simplified version)
-            if gdp_datasets:
-                gdp_data = gdp_datasets[0]["data"]
-                confidence_upper = [val * 1.15 for val in gdp_data]  # +15% confidence band
-                confidence_lower = [val * 0.85 for val in gdp_data]  # -15% confidence band
-                
+            # Add bootstrap confidence intervals from the fitted VAR
+            bands = await real_data_service.get_forecast_bands(periods=periods)
+            if gdp_datasets and bands is not None and "GDP Growth" in bands["upper"]:
+                forecast_data["confidence_level"] = bands["level"]
                 forecast_data["datasets"].extend([
                     {
                         "label": "Confidence Interval (Upper)",
-                        "data": confidence_upper,
+                        "data": bands["upper"]["GDP Growth"],
                         "borderColor": "rgba(75, 192, 192, 0.3)",
                         "borderDash": [5, 5],
                         "tension": 0.1
                     },
                     {
                         "label": "Confidence Interval (Lower)",
-                        "data": confidence_lower,
+                        "data": bands["lower"]["GDP Growth"],
                         "borderColor": "rgba(75, 192, 192, 0.3)",
                         "borderDash": [5, 5],
                         "tension": 0.1
@@ -144,6 +236,23 @@ async def create_scenario(scenario_data: dict):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error creating scenario: {str(e)}")
 
+@router.post("/scenarios/optimize-policy")
+async def optimize_policy(request_data: dict):
+    """Search for the interest-rate path that best meets inflation/unemployment targets"""
+    try:
+        return await real_data_service.optimize_policy(
+            targets=request_data.get("targets", {"Inflation": 2.0, "Unemployment": 4.0}),
+            weights=request_data.get("weights"),
+            horizon=int(request_data.get("horizon", 12)),
+            smoothing=float(request_data.get("smoothing", 0.1)),
+            bounds=tuple(request_data.get("bounds", (0.0, 10.0))),
+            method=request_data.get("method", "analytic")
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error optimizing policy path: {str(e)}")
+
 @router.get("/scenarios/{scenario_id}/results")
 async def get_scenario_results(scenario_id: int):
     """Get results for a specific scenario"""
@@ -0,0 +1,70 @@
+import json
+
+from fastapi import APIRouter, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+
+from app.core.config import settings
+from app.api.api_v1.endpoints.economic import alert_engine, real_data_service
+from app.services.live_updates import LiveUpdateBroadcaster
+
+router = APIRouter()
+
+# Shared by every connection so upstream polling happens once regardless of viewer count
+broadcaster = LiveUpdateBroadcaster(
+    real_data_service,
+    interval=settings.LIVE_UPDATE_INTERVAL_SECONDS,
+    queue_size=settings.LIVE_UPDATE_QUEUE_SIZE
+)
+
+# Alert events reach live clients as their own message type
+alert_engine.add_sink(broadcaster.publish_alert)
+
+# Seconds between SSE keep-alive comments when nothing has changed
+HEARTBEAT_SECONDS = 15
+
+@router.get("/stream")
+async def stream_updates(request: Request):
+    """Server-Sent Events stream of indicator and market data changes"""
+    subscriber = await broadcaster.subscribe()
+
+    async def events():
+        try:
+            while not await request.is_disconnected():
+                message = await subscriber.next_message(timeout=HEARTBEAT_SECONDS)
+                if message is None:
+                    yield ": keep-alive\n\n"
+                else:
+                    yield f"event: {message['type']}\ndata: {json.dumps(message['data'], default=float)}\n\n"
+        finally:
+            broadcaster.unsubscribe(subscriber)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.websocket("/ws")
+async def websocket_updates(websocket: WebSocket):
+    """WebSocket channel carrying the same snapshot/update messages as /stream"""
+    await websocket.accept()
+    subscriber = await broadcaster.subscribe()
+    try:
+        while True:
+            message = await subscriber.next_message(timeout=HEARTBEAT_SECONDS)
+            if message is None:
+                message = {"type": "heartbeat", "data": {}}
+            await websocket.send_text(json.dumps(message, default=float))
+    except (WebSocketDisconnect, RuntimeError):
+        pass
+    finally:
+        broadcaster.unsubscribe(subscriber)
+
+@router.get("/status")
+async def live_status():
+    """Number of connected subscribers and whether a snapshot is held"""
+    return {
+        "subscribers": broadcaster.subscriber_count,
+        "interval_seconds": broadcaster.interval,
+        "has_snapshot": bool(broadcaster.snapshot)
+    }
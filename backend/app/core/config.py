@@ -15,11 +15,40 @@ class Settings(BaseSettings):
     POSTGRES_PASSWORD: str = "postgres"
     POSTGRES_DB: str = "executive_decision_support"
     SQLALCHEMY_DATABASE_URI: str = f"postgresql://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_SERVER}/{POSTGRES_DB}"
+    # Async engine URL; derived from SQLALCHEMY_DATABASE_URI (asyncpg driver) when empty
+    ASYNC_SQLALCHEMY_DATABASE_URI: str = ""
+    
+    # Connection pool sizing (ignored for SQLite)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
     
     # Redis Configuration
     REDIS_HOST: str = "localhost"
     REDIS_PORT: int = 6379
     
+    # Live update channel: one shared poll of upstream data, fanned out to every subscriber
+    LIVE_UPDATE_INTERVAL_SECONDS: int = 60
+    LIVE_UPDATE_QUEUE_SIZE: int = 16
+    
+    # Local history store for /series (one .npz file per series, refreshed after the TTL)
+    SERIES_STORE_DIR: str = "data/series"
+    SERIES_STORE_TTL_SECONDS: int = 6 * 3600
+    
+    # Monte Carlo paths behind /risk-assessment tail metrics, simulated once per data vintage
+    TAIL_RISK_PATHS: int = 100_000
+    
+    # Series with alert rules are refetched at this interval and new observations evaluated
+    ALERT_REFRESH_INTERVAL_SECONDS: int = 900
+    
+    # Per-request sampling profiler: runs for requests sending PROFILING_TOKEN in the
+    # X-Profile header and for a PROFILING_SAMPLE_RATE fraction of traffic; off without a token
+    PROFILING_TOKEN: str = ""
+    PROFILING_SAMPLE_RATE: float = 0.0
+    PROFILING_INTERVAL_MS: int = 5
+    PROFILING_BUFFER_SIZE: int = 50
+    
     # JWT Configuration
     SECRET_KEY: str = "your-secret-key-here"  # Change in production
     ALGORITHM: str = "HS256"
@@ -30,6 +59,21 @@ class Settings(BaseSettings):
     ALPHA_VANTAGE_API_KEY: str = ""
     BLS_API_KEY: str = ""
     
+    @property
+    def async_database_uri(self) -> str:
+        if self.ASYNC_SQLALCHEMY_DATABASE_URI:
+            return self.ASYNC_SQLALCHEMY_DATABASE_URI
+        url = self.SQLALCHEMY_DATABASE_URI
+        # Swap the sync driver for its async counterpart: asyncpg for PostgreSQL, aiosqlite for SQLite
+        for sync_prefix, async_prefix in (("postgresql+psycopg2://", "postgresql+asyncpg://"),
+                                          ("postgresql://", "postgresql+asyncpg://"),
+                                          ("postgres://", "postgresql+asyncpg://"),
+                                          ("sqlite+pysqlite://", "sqlite+aiosqlite://"),
+                                          ("sqlite://", "sqlite+aiosqlite://")):
+            if url.startswith(sync_prefix):
+                return async_prefix + url[len(sync_prefix):]
+        return url
+    
     class Config:
         case_sensitive = True
         env_file = ".env"
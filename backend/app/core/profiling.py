@@ -0,0 +1,102 @@
+import itertools
+import os
+import sys
+import threading
+from collections import Counter, deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional
+
+from app.core.config import settings
+
+# Modules an idle thread-pool worker sits in; stacks made only of these are not sampled
+_IDLE_MODULES = {"threading.py", "thread.py", "queue.py"}
+
+class SamplingProfiler:
+    """Background thread that samples Python stacks at a fixed interval
+
+    Every thread except the profilers is sampled, and each stack is rooted
+    at a ``[thread name]`` frame. Work a request hands to ``asyncio.to_thread``
+    therefore shows up under its worker thread instead of leaving only the
+    idle event loop. Worker threads waiting for work are skipped. Stacks are
+    counted rather than stored, and rendered in the folded format
+    (``outer;inner;leaf count`` per line) read by flamegraph.pl and
+    speedscope. The profiled threads run untouched; the only cost is the
+    sampler waking up every ``interval`` seconds. Other requests served
+    concurrently by the same process show up in the samples too.
+    """
+
+    def __init__(self, thread_id: int, interval: float = 0.005):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                name = names.get(ident, str(ident))
+                if name == "request-profiler":
+                    continue
+                stack = []
+                modules = set()
+                while frame is not None:
+                    code = frame.f_code
+                    filename = os.path.basename(code.co_filename)
+                    modules.add(filename)
+                    stack.append(f"{code.co_name} ({filename}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                if not stack or (ident != self.thread_id and modules <= _IDLE_MODULES):
+                    continue
+                stack.append(f"[{name}]")
+                self.samples[tuple(reversed(stack))] += 1
+
+    def folded(self) -> str:
+        return "\n".join(f"{';'.join(stack)} {count}" for stack, count in self.samples.most_common())
+
+class ProfileStore:
+    """Bounded ring buffer of finished request profiles; the oldest are dropped first"""
+
+    def __init__(self, maxlen: int = 50):
+        self._profiles: Deque[Dict[str, Any]] = deque(maxlen=maxlen)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def add(self, method: str, path: str, status: Optional[int], duration: float, profiler: SamplingProfiler) -> None:
+        with self._lock:
+            self._profiles.append({
+                "id": next(self._ids),
+                "method": method,
+                "path": path,
+                "status": status,
+                "duration_ms": round(duration * 1000, 2),
+                "recorded_at": datetime.now().isoformat(),
+                "samples": sum(profiler.samples.values()),
+                "interval_ms": profiler.interval * 1000,
+                "folded": profiler.folded()
+            })
+
+    def list(self) -> List[Dict[str, Any]]:
+        """Profile summaries, newest first, without the stack data"""
+        with self._lock:
+            return [{key: value for key, value in profile.items() if key != "folded"}
+                    for profile in reversed(self._profiles)]
+
+    def get(self, profile_id: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return next((profile for profile in self._profiles if profile["id"] == profile_id), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._profiles.clear()
+
+# Finished profiles, served by the admin endpoints
+profile_store = ProfileStore(maxlen=settings.PROFILING_BUFFER_SIZE)
@@ -0,0 +1,195 @@
+"""Typed binary storage for array-valued model and scenario results.
+
+A blob is a small self-describing container::
+
+    b"EDSA" | version u8 | flags u8 | reserved u16 | header length u32
+    JSON header (array names, dtypes, shapes, offsets + non-array attrs)
+    padding to 64 bytes
+    payload: raw array buffers, each 64-byte aligned (zlib-compressed as a whole when flagged)
+
+Uncompressed blobs decode without copying: every array is an ``np.frombuffer``
+view into the blob, or into a memory map when read with ``open_array_file``.
+Compressed blobs cost one decompression, after which arrays are views into the
+decompressed payload.
+"""
+import datetime
+import json
+import mmap
+import struct
+import zlib
+from numbers import Real
+from typing import Any, Dict, Mapping, Optional, Tuple, Union
+
+import numpy as np
+from sqlalchemy import LargeBinary, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.types import TypeDecorator
+
+MAGIC = b"EDSA"
+VERSION = 1
+FLAG_ZLIB = 0x01
+ALIGN = 64
+_PREAMBLE = struct.Struct("<4sBBHI")
+
+Buffer = Union[bytes, bytearray, memoryview, mmap.mmap]
+
+def _aligned(offset: int) -> int:
+    return -(-offset // ALIGN) * ALIGN
+
+def _split(results: Mapping[str, Any]) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+    arrays, attrs = {}, {}
+    for key, value in results.items():
+        if isinstance(value, np.ndarray):
+            if value.dtype.kind not in "biufcmM":
+                raise TypeError(f"Cannot store array '{key}' with dtype {value.dtype}")
+            arrays[key] = value
+        else:
+            attrs[key] = value
+    return arrays, attrs
+
+def _json_default(value: Any) -> Any:
+    """JSON form of attr values the json module does not handle: NumPy scalars and timestamps"""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    raise TypeError(f"Cannot store attr of type {type(value).__name__}")
+
+def encode_arrays(results: Mapping[str, Any], compress: bool = True, level: int = 1) -> bytes:
+    """Pack a results dict into a blob; ndarray values become typed arrays, the rest JSON attrs"""
+    arrays, attrs = _split(results)
+    entries = {}
+    offset = 0
+    for name, array in arrays.items():
+        offset = _aligned(offset)
+        entries[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+        offset += array.nbytes
+    payload = bytearray(offset)
+    for name, array in arrays.items():
+        start = entries[name]["offset"]
+        payload[start:start + array.nbytes] = np.ascontiguousarray(array).tobytes()
+
+    flags = 0
+    if compress:
+        payload = zlib.compress(payload, level)
+        flags |= FLAG_ZLIB
+    header = json.dumps({"arrays": entries, "attrs": attrs}, separators=(",", ":"), default=_json_default).encode()
+    head = _PREAMBLE.pack(MAGIC, VERSION, flags, 0, len(header)) + header
+    return head + b"\0" * (_aligned(len(head)) - len(head)) + bytes(payload)
+
+def decode_arrays(blob: Buffer) -> Dict[str, Any]:
+    """Unpack a blob into a results dict of read-only ndarray views plus attrs"""
+    view = memoryview(blob)
+    magic, version, flags, _, header_len = _PREAMBLE.unpack_from(view, 0)
+    if magic != MAGIC:
+        raise ValueError("Not an array storage blob")
+    if version > VERSION:
+        raise ValueError(f"Unsupported array storage version {version}")
+    header_end = _PREAMBLE.size + header_len
+    header = json.loads(bytes(view[_PREAMBLE.size:header_end]))
+    payload = view[_aligned(header_end):]
+    if flags & FLAG_ZLIB:
+        payload = memoryview(zlib.decompress(payload))
+
+    results: Dict[str, Any] = dict(header["attrs"])
+    for name, entry in header["arrays"].items():
+        dtype = np.dtype(entry["dtype"])
+        count = int(np.prod(entry["shape"], dtype=np.int64))
+        array = np.frombuffer(payload, dtype=dtype, count=count, offset=entry["offset"])
+        results[name] = array.reshape(entry["shape"])
+    return results
+
+def write_array_file(path: str, results: Mapping[str, Any]) -> int:
+    """Write an uncompressed blob to disk so it can be memory-mapped; returns its size"""
+    blob = encode_arrays(results, compress=False)
+    with open(path, "wb") as handle:
+        handle.write(blob)
+    return len(blob)
+
+def open_array_file(path: str) -> Dict[str, Any]:
+    """Memory-map a blob written by write_array_file; arrays page in lazily on access"""
+    with open(path, "rb") as handle:
+        mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+    # The arrays keep the mapping alive through their buffer references
+    return decode_arrays(mapped)
+
+class ArrayBundle(TypeDecorator):
+    """Column type storing a results dict (ndarray values + JSON attrs) as a typed binary blob"""
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def __init__(self, compress: bool = True, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.compress = compress
+
+    def process_bind_param(self, value: Optional[Mapping[str, Any]], dialect: Any) -> Optional[bytes]:
+        if value is None:
+            return None
+        return encode_arrays(value, compress=self.compress)
+
+    def process_result_value(self, value: Optional[Buffer], dialect: Any) -> Optional[Dict[str, Any]]:
+        if value is None:
+            return None
+        return decode_arrays(value)
+
+def _numeric_shape(value: Any) -> Optional[Tuple[int, ...]]:
+    """Shape of a non-empty rectangular (nested) list of real numbers, or None if it is anything else"""
+    if not isinstance(value, list) or not value:
+        return None
+    if all(isinstance(item, Real) and not isinstance(item, bool) for item in value):
+        return (len(value),)
+    shapes = {_numeric_shape(item) for item in value}
+    if len(shapes) != 1 or None in shapes:
+        return None
+    return (len(value), *shapes.pop())
+
+def json_results_to_arrays(results: Mapping[str, Any]) -> Dict[str, Any]:
+    """Convert JSON results to the array form: numeric (nested) lists become float64 arrays
+
+    Only rectangular lists whose elements are all ints or floats (not bools,
+    strings or None) are converted, so the conversion is lossless. Dicts of
+    equal-length numeric lists (e.g. ``{"GDP": [...], "CPI": [...]}``) become
+    one 2-D array keyed by the dict name plus a ``<name>__columns`` attr.
+    Everything else is kept as an attr unchanged.
+    """
+    converted: Dict[str, Any] = {}
+    for key, value in results.items():
+        if isinstance(value, dict) and value:
+            shapes = {_numeric_shape(v) for v in value.values()}
+            if len(shapes) == 1 and None not in shapes and len(shapes.pop()) == 1:
+                converted[key] = np.array(list(value.values()), dtype=np.float64).T
+                converted[f"{key}__columns"] = list(value.keys())
+                continue
+        if _numeric_shape(value) is not None:
+            converted[key] = np.array(value, dtype=np.float64)
+            continue
+        converted[key] = value
+    return converted
+
+async def migrate_json_results(session: AsyncSession,
+                               model: Any,
+                               batch_size: int = 500) -> int:
+    """Copy ``results`` JSON into ``results_blob`` for rows not migrated yet; returns rows migrated
+
+    Works on ModelResult and Scenario. The JSON column is left in place so
+    the migration can be verified before it is dropped.
+    """
+    migrated = 0
+    while True:
+        rows = (await session.execute(
+            select(model.id, model.results)
+            .where(model.results_blob.is_(None), model.results.is_not(None))
+            .limit(batch_size)
+        )).all()
+        if not rows:
+            break
+        for row_id, results in rows:
+            # JSON null or scalars are kept as an attr so the row still counts as migrated
+            converted = json_results_to_arrays(results) if isinstance(results, Mapping) else {"results": results}
+            await session.execute(
+                update(model).where(model.id == row_id).values(results_blob=converted)
+            )
+        await session.commit()
+        migrated += len(rows)
+    return migrated
@@ -0,0 +1,4 @@
+# Import all models so Base.metadata knows every table (used by create_all and Alembic)
+from app.db.base_class import Base  # noqa
+from app.models.user import User  # noqa
+from app.models.economic import EconomicIndicator, ModelResult, Scenario, RiskAssessment  # noqa
@@ -0,0 +1,43 @@
+from typing import Any, Iterable, Mapping, Sequence, Type
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# app.db.base registers every model so relationships resolve before the first insert
+from app.db.base import Base, EconomicIndicator, ModelResult, Scenario, RiskAssessment
+
+# Rows per INSERT statement; keeps parameter counts under driver limits
+DEFAULT_CHUNK_SIZE = 1000
+
+def _chunks(rows: Sequence[Mapping[str, Any]], size: int) -> Iterable[Sequence[Mapping[str, Any]]]:
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+async def bulk_insert(session: AsyncSession,
+                      model: Type[Base],
+                      rows: Sequence[Mapping[str, Any]],
+                      chunk_size: int = DEFAULT_CHUNK_SIZE,
+                      commit: bool = True) -> int:
+    """Insert plain dict rows in chunked multi-row INSERTs without building ORM objects
+
+    Keys are mapped attribute names (e.g. ``metadata_`` for EconomicIndicator).
+    Returns the number of rows written.
+    """
+    rows = list(rows)
+    for chunk in _chunks(rows, chunk_size):
+        await session.execute(insert(model), chunk)
+    if commit:
+        await session.commit()
+    return len(rows)
+
+async def bulk_insert_indicators(session: AsyncSession, rows: Sequence[Mapping[str, Any]], **kwargs: Any) -> int:
+    return await bulk_insert(session, EconomicIndicator, rows, **kwargs)
+
+async def bulk_insert_model_results(session: AsyncSession, rows: Sequence[Mapping[str, Any]], **kwargs: Any) -> int:
+    return await bulk_insert(session, ModelResult, rows, **kwargs)
+
+async def bulk_insert_scenarios(session: AsyncSession, rows: Sequence[Mapping[str, Any]], **kwargs: Any) -> int:
+    return await bulk_insert(session, Scenario, rows, **kwargs)
+
+async def bulk_insert_risk_assessments(session: AsyncSession, rows: Sequence[Mapping[str, Any]], **kwargs: Any) -> int:
+    return await bulk_insert(session, RiskAssessment, rows, **kwargs)
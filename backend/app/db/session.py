@@ -1,14 +1,47 @@
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
 
-engine = create_engine(settings.SQLALCHEMY_DATABASE_URI, pool_pre_ping=True)
+def pool_options(url: str) -> Dict[str, Any]:
+    """Pool sizing from settings; SQLite uses SQLAlchemy's default pool and takes none of these"""
+    if url.startswith("sqlite"):
+        return {}
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+
+def make_async_engine(url: str, **kwargs: Any) -> AsyncEngine:
+    """Async engine (asyncpg for PostgreSQL, aiosqlite for tests) with pooled connections"""
+    options = {"pool_pre_ping": True, **pool_options(url), **kwargs}
+    return create_async_engine(url, **options)
+
+engine = create_engine(settings.SQLALCHEMY_DATABASE_URI, pool_pre_ping=True, **pool_options(settings.SQLALCHEMY_DATABASE_URI))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Built on first use, so a misconfigured async URL cannot break imports or the sync engine above
+@lru_cache(maxsize=None)
+def get_async_engine() -> AsyncEngine:
+    return make_async_engine(settings.async_database_uri)
+
+@lru_cache(maxsize=None)
+def get_async_sessionmaker() -> async_sessionmaker:
+    return async_sessionmaker(get_async_engine(), expire_on_commit=False, autoflush=False)
+
 # Dependency
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
+
+# Async dependency for async def handlers; never blocks the event loop on I/O
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    async with get_async_sessionmaker()() as db:
+        yield db
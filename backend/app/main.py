@@ -1,8 +1,71 @@
+import hmac
+import logging
+import random
+import threading
+import time
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
+from app.core.profiling import SamplingProfiler, profile_store
 from app.api.api_v1.api import api_router
 
+logger = logging.getLogger(__name__)
+
+# Never profiled: the profile endpoints themselves and long-lived live-update streams
+UNPROFILED_PREFIXES = (f"{settings.API_V1_STR}/admin", f"{settings.API_V1_STR}/economic/live")
+
+class ProfilingMiddleware:
+    """Run the sampling profiler for opted-in requests and keep the result in profile_store
+
+    A request is profiled when its X-Profile header matches PROFILING_TOKEN,
+    or with probability PROFILING_SAMPLE_RATE (one sampled request at a
+    time). Sampling needs the token too, since profiles are only readable
+    through the token-protected admin endpoints. Without a token every
+    request goes straight through.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.token = settings.PROFILING_TOKEN.encode()
+        self.sample_rate = settings.PROFILING_SAMPLE_RATE if self.token else 0.0
+        if settings.PROFILING_SAMPLE_RATE > 0 and not self.token:
+            logger.warning("PROFILING_SAMPLE_RATE is set without PROFILING_TOKEN; sampling is disabled "
+                           "because the profiles could not be retrieved")
+        self.interval = settings.PROFILING_INTERVAL_MS / 1000
+        self.enabled = bool(self.token)
+        self._sampling = False
+
+    async def __call__(self, scope, receive, send):
+        if not self.enabled or scope["type"] != "http" or scope["path"].startswith(UNPROFILED_PREFIXES):
+            return await self.app(scope, receive, send)
+        
+        header = dict(scope["headers"]).get(b"x-profile")
+        requested = bool(self.token) and header is not None and hmac.compare_digest(header, self.token)
+        sampled = not requested and not self._sampling and random.random() < self.sample_rate
+        if not (requested or sampled):
+            return await self.app(scope, receive, send)
+        
+        status = None
+        
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+        
+        self._sampling = self._sampling or sampled
+        profiler = SamplingProfiler(threading.get_ident(), self.interval)
+        started = time.perf_counter()
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            profiler.stop()
+            if sampled:
+                self._sampling = False
+            profile_store.add(scope["method"], scope["path"], status, time.perf_counter() - started, profiler)
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     openapi_url=f"{settings.API_V1_STR}/openapi.json"
@@ -17,9 +80,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Opt-in request profiling (see PROFILING_* settings)
+app.add_middleware(ProfilingMiddleware)
+
 # Include API router
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
 @app.get("/")
 async def root():
-    return {"message": "Welcome to Executive Decision Support System API"} 
\ No newline at end of file
+    return {"message": "Welcome to Executive Decision Support System API"} 
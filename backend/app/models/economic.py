@@ -2,6 +2,7 @@ from sqlalchemy import Column, Integer, String, Float, DateTime, JSON, ForeignKe
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
+from app.db.array_storage import ArrayBundle
 
 class EconomicIndicator(Base):
     __tablename__ = "economic_indicators"
@@ -12,7 +13,8 @@ class EconomicIndicator(Base):
     timestamp = Column(DateTime(timezone=True), server_default=func.now())
     source = Column(String(100))
     confidence_interval = Column(Float)
-    metadata = Column(JSON)
+    # "metadata" is reserved on declarative classes; keep the column name, rename the attribute
+    metadata_ = Column("metadata", JSON)
 
 class ModelResult(Base):
     __tablename__ = "model_results"
@@ -20,7 +22,9 @@ class ModelResult(Base):
     id = Column(Integer, primary_key=True, index=True)
     model_type = Column(String(50), index=True)
     parameters = Column(JSON)
+    # Legacy JSON results; new array payloads go to results_blob (see db.array_storage.migrate_json_results)
     results = Column(JSON)
+    results_blob = Column(ArrayBundle())
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     user_id = Column(Integer, ForeignKey("users.id"))
     
@@ -34,12 +38,15 @@ class Scenario(Base):
     name = Column(String(100))
     description = Column(String(500))
     parameters = Column(JSON)
+    # Legacy JSON results; new array payloads go to results_blob (see db.array_storage.migrate_json_results)
     results = Column(JSON)
+    results_blob = Column(ArrayBundle())
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     user_id = Column(Integer, ForeignKey("users.id"))
     
     # Relationships
     user = relationship("User", back_populates="scenarios")
+    risk_assessments = relationship("RiskAssessment", back_populates="scenario")
 
 class RiskAssessment(Base):
     __tablename__ = "risk_assessments"
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import AliasChoices, BaseModel, Field
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 
@@ -7,7 +7,8 @@ class EconomicIndicatorBase(BaseModel):
     value: float
     source: str
     confidence_interval: float
-    metadata: Optional[Dict[str, Any]] = None
+    # ORM objects expose the column as metadata_ (see models.economic.EconomicIndicator)
+    metadata: Optional[Dict[str, Any]] = Field(default=None, validation_alias=AliasChoices("metadata_", "metadata"))
 
 class EconomicIndicatorCreate(EconomicIndicatorBase):
     pass
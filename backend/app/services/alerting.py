@@ -0,0 +1,298 @@
+import bisect
+import itertools
+import logging
+import math
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+ALERT_TRANSFORMS = ("level", "change", "pct_change", "volatility")
+ALERT_OPERATORS = (">", ">=", "<", "<=")
+
+AlertSink = Callable[[Dict[str, Any]], None]
+
+class _Feature:
+    """Rolling transform of one series, updated in O(1) per observation
+
+    ``level`` is the raw value, ``change``/``pct_change`` compare with the value
+    ``window`` observations back, and ``volatility`` is the sample standard
+    deviation of period-on-period % changes over the last ``window``
+    observations. With ``over`` > 0 the feature is the change of that
+    transform over ``over`` observations.
+    """
+
+    def __init__(self, transform: str, window: int, over: int):
+        self.transform = transform
+        self.window = window
+        self.over = over
+        self.value: Optional[float] = None
+        self._values: Deque[float] = deque(maxlen=window + 1)
+        self._returns: Deque[float] = deque(maxlen=window)
+        self._sum = 0.0
+        self._sumsq = 0.0
+        self._outputs: Deque[float] = deque(maxlen=over + 1)
+
+    @property
+    def required_history(self) -> int:
+        """Observations needed before the feature produces a value"""
+        return self.window + self.over + 1
+
+    def _base(self, x: float) -> Optional[float]:
+        previous = self._values[-1] if self._values else None
+        self._values.append(x)
+        if self.transform == "level":
+            return x
+        if self.transform == "volatility":
+            if previous is None or previous == 0:
+                return None
+            if len(self._returns) == self.window:
+                dropped = self._returns[0]
+                self._sum -= dropped
+                self._sumsq -= dropped * dropped
+            change = (x / previous - 1) * 100
+            self._returns.append(change)
+            self._sum += change
+            self._sumsq += change * change
+            n = len(self._returns)
+            if n < max(self.window, 2):
+                return None
+            return math.sqrt(max(self._sumsq - self._sum * self._sum / n, 0.0) / (n - 1))
+        if len(self._values) <= self.window:
+            return None
+        reference = self._values[0]
+        if self.transform == "change":
+            return x - reference
+        return (x / reference - 1) * 100 if reference != 0 else None
+
+    def update(self, x: float) -> Optional[float]:
+        """Feed one observation; returns the new feature value (None while warming up)"""
+        value = self._base(x)
+        if value is not None and self.over:
+            self._outputs.append(value)
+            value = value - self._outputs[0] if len(self._outputs) > self.over else None
+        return value
+
+class _ThresholdIndex:
+    """Rules on one feature and operator, kept sorted by threshold
+
+    Rules are edge-triggered: they fire when their condition goes from false
+    to true. The rules that cross between two consecutive feature values form
+    a contiguous slice of the sorted thresholds, found with two binary
+    searches, so an update costs O(log n + fired) however many rules exist.
+    """
+
+    def __init__(self, operator: str):
+        self.operator = operator
+        self.thresholds: List[float] = []
+        self.rule_ids: List[int] = []
+
+    def add(self, threshold: float, rule_id: int) -> None:
+        position = bisect.bisect_right(self.thresholds, threshold)
+        self.thresholds.insert(position, threshold)
+        self.rule_ids.insert(position, rule_id)
+
+    def remove(self, threshold: float, rule_id: int) -> None:
+        lo = bisect.bisect_left(self.thresholds, threshold)
+        hi = bisect.bisect_right(self.thresholds, threshold)
+        position = lo + self.rule_ids[lo:hi].index(rule_id)
+        del self.thresholds[position]
+        del self.rule_ids[position]
+
+    def crossed(self, previous: Optional[float], value: float) -> List[int]:
+        left, right, t = bisect.bisect_left, bisect.bisect_right, self.thresholds
+        if self.operator == ">":      # previous <= t < value
+            lo, hi = (0 if previous is None else left(t, previous)), left(t, value)
+        elif self.operator == ">=":   # previous < t <= value
+            lo, hi = (0 if previous is None else right(t, previous)), right(t, value)
+        elif self.operator == "<":    # value < t <= previous
+            lo, hi = right(t, value), (len(t) if previous is None else right(t, previous))
+        else:                         # value <= t < previous
+            lo, hi = left(t, value), (len(t) if previous is None else left(t, previous))
+        return self.rule_ids[lo:hi] if lo < hi else []
+
+def _holds(operator: str, value: float, threshold: float) -> bool:
+    if operator == ">":
+        return value > threshold
+    if operator == ">=":
+        return value >= threshold
+    if operator == "<":
+        return value < threshold
+    return value <= threshold
+
+class LogAlertSink:
+    """Write alert events to the application log"""
+
+    def __call__(self, event: Dict[str, Any]) -> None:
+        logger.warning(f"Alert '{event['name']}': {event['series_id']} {event['transform']} "
+                       f"= {event['value']:.3f} {event['operator']} {event['threshold']}")
+
+class MemoryAlertSink:
+    """Keep the most recent alert events in a bounded buffer"""
+
+    def __init__(self, maxlen: int = 500):
+        self.events: Deque[Dict[str, Any]] = deque(maxlen=maxlen)
+
+    def __call__(self, event: Dict[str, Any]) -> None:
+        self.events.append(event)
+
+    def recent(self, limit: int = 50) -> List[Dict[str, Any]]:
+        return list(itertools.islice(reversed(self.events), limit))
+
+class AlertEngine:
+    """Threshold and change rules evaluated incrementally as observations arrive
+
+    Rules are compiled into an index by series: each series maps to the
+    rolling features its rules need, and each feature to sorted threshold
+    indexes. Rules sharing a series, transform and window share one feature,
+    so a new observation updates each distinct feature once and only touches
+    the rules whose threshold it crosses. Events go to every registered sink.
+    """
+
+    def __init__(self, sinks: Optional[Sequence[AlertSink]] = None):
+        self.sinks: List[AlertSink] = list(sinks or [])
+        self._rules: Dict[int, Dict[str, Any]] = {}
+        self._ids = itertools.count(1)
+        # series_id -> {(transform, window, over): feature}
+        self._features: Dict[str, Dict[Tuple[str, int, int], _Feature]] = {}
+        # (series_id, feature key) -> {operator: index}
+        self._indexes: Dict[Tuple[str, Tuple[str, int, int]], Dict[str, _ThresholdIndex]] = {}
+        # Latest ingested timestamp (ns) per series, so replays of stored history are skipped
+        self._last_seen: Dict[str, int] = {}
+
+    def add_sink(self, sink: AlertSink) -> None:
+        self.sinks.append(sink)
+
+    def add_rule(self,
+                 series_id: str,
+                 operator: str,
+                 threshold: float,
+                 transform: str = "level",
+                 window: int = 1,
+                 over: int = 0,
+                 name: Optional[str] = None) -> Dict[str, Any]:
+        """Register a rule, e.g. CPIAUCSL pct_change over 12 observations > 4"""
+        if transform not in ALERT_TRANSFORMS:
+            raise ValueError(f"Unknown transform '{transform}', expected one of {ALERT_TRANSFORMS}")
+        if operator not in ALERT_OPERATORS:
+            raise ValueError(f"Unknown operator '{operator}', expected one of {ALERT_OPERATORS}")
+        if window < 1 or over < 0:
+            raise ValueError("window must be >= 1 and over >= 0")
+        if transform == "level":
+            window = 1
+
+        rule_id = next(self._ids)
+        key = (transform, int(window), int(over))
+        rule = {
+            "rule_id": rule_id,
+            "name": name or f"{series_id} {transform} {operator} {threshold}",
+            "series_id": series_id,
+            "transform": transform,
+            "window": key[1],
+            "over": key[2],
+            "operator": operator,
+            "threshold": float(threshold)
+        }
+        self._features.setdefault(series_id, {}).setdefault(key, _Feature(*key))
+        indexes = self._indexes.setdefault((series_id, key), {})
+        indexes.setdefault(operator, _ThresholdIndex(operator)).add(rule["threshold"], rule_id)
+        self._rules[rule_id] = rule
+        return dict(rule)
+
+    def remove_rule(self, rule_id: int) -> bool:
+        rule = self._rules.pop(rule_id, None)
+        if rule is None:
+            return False
+        key = (rule["transform"], rule["window"], rule["over"])
+        indexes = self._indexes[(rule["series_id"], key)]
+        indexes[rule["operator"]].remove(rule["threshold"], rule_id)
+        if not indexes[rule["operator"]].thresholds:
+            del indexes[rule["operator"]]
+        if not indexes:
+            # Last rule on this feature: drop its rolling state too
+            del self._indexes[(rule["series_id"], key)]
+            del self._features[rule["series_id"]][key]
+            if not self._features[rule["series_id"]]:
+                del self._features[rule["series_id"]]
+                self._last_seen.pop(rule["series_id"], None)
+        return True
+
+    def rules(self, series_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Registered rules with the current feature value and whether the condition holds"""
+        listed = []
+        for rule in self._rules.values():
+            if series_id is not None and rule["series_id"] != series_id:
+                continue
+            feature = self._features[rule["series_id"]][(rule["transform"], rule["window"], rule["over"])]
+            active = feature.value is not None and _holds(rule["operator"], feature.value, rule["threshold"])
+            listed.append({**rule, "value": feature.value, "active": active})
+        return listed
+
+    @property
+    def series(self) -> List[str]:
+        """Series that at least one rule depends on"""
+        return list(self._features)
+
+    def prime(self, series_id: str, values: Sequence[float]) -> None:
+        """Warm up features that have not seen data yet from recent history, without firing rules"""
+        for feature in self._features.get(series_id, {}).values():
+            if feature.value is None:
+                for x in values[-feature.required_history:]:
+                    feature.value = feature.update(float(x))
+
+    def ingest(self, series_id: str, dates: Any, values: Any) -> List[Dict[str, Any]]:
+        """Feed observations for one series (oldest first) and return the events fired
+
+        Only observations newer than the last one ingested for the series are
+        evaluated, so a full stored history can be passed on every refresh.
+        Series without rules are ignored.
+        """
+        features = self._features.get(series_id)
+        if not features:
+            return []
+        dates = pd.DatetimeIndex(dates).as_unit("ns")
+        stamps = dates.asi8
+        values = np.asarray(values, dtype=np.float64)
+        last = self._last_seen.get(series_id)
+        start = 0 if last is None else int(np.searchsorted(stamps, last, side="right"))
+        if start >= len(stamps):
+            return []
+        if last is None:
+            # First sight of this series: use history to warm up, only the latest point can fire
+            self.prime(series_id, values[:-1])
+            start = len(stamps) - 1
+
+        events: List[Dict[str, Any]] = []
+        for position in range(start, len(stamps)):
+            events.extend(self._update(series_id, features, dates[position], float(values[position])))
+        self._last_seen[series_id] = int(stamps[-1])
+        return events
+
+    def _update(self,
+                series_id: str,
+                features: Dict[Tuple[str, int, int], _Feature],
+                date: pd.Timestamp,
+                x: float) -> List[Dict[str, Any]]:
+        events = []
+        for key, feature in features.items():
+            previous = feature.value
+            value = feature.update(x)
+            feature.value = value
+            if value is None:
+                continue
+            for index in self._indexes[(series_id, key)].values():
+                for rule_id in index.crossed(previous, value):
+                    event = {**self._rules[rule_id], "value": value, "date": date.isoformat()}
+                    events.append(event)
+                    self._emit(event)
+        return events
+
+    def _emit(self, event: Dict[str, Any]) -> None:
+        for sink in self.sinks:
+            try:
+                sink(event)
+            except Exception as e:
+                logger.error(f"Alert sink {sink!r} failed: {e}")
@@ -0,0 +1,177 @@
+import os
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from app.services.economic_model import lag_design_matrix, var_forecast_path
+
+FORECASTERS = ("var", "trend")
+WINDOWS = ("expanding", "rolling")
+
+def trend_forecast(history: np.ndarray, steps: int, recent: int = 4, trend_window: int = 8) -> np.ndarray:
+    """Recent average plus linear trend, the extrapolation used by RealDataService.get_forecast_data"""
+    level = history[-recent:].mean(axis=0)
+    window = history[-trend_window:]
+    x = np.arange(len(window), dtype=np.float64)
+    x -= x.mean()
+    slope = (x @ (window - window.mean(axis=0))) / (x @ x) if len(window) > 1 else np.zeros(history.shape[1])
+    return level + np.arange(steps, dtype=np.float64)[:, None] * slope
+
+def _solve_normal_equations(xtx: np.ndarray, xty: np.ndarray) -> np.ndarray:
+    try:
+        return np.linalg.solve(xtx, xty)
+    except np.linalg.LinAlgError:
+        return np.linalg.lstsq(xtx, xty, rcond=None)[0]
+
+def _backtest_block(args: Tuple) -> np.ndarray:
+    """Forecast errors (origins, horizon, variables) for a contiguous block of origins
+
+    The VAR forecaster keeps the normal equations X'X and X'y between
+    consecutive origins and only adds (and, for a rolling window, removes)
+    the rows that changed, so a block costs one full fit plus cheap updates.
+    """
+    y, origins, horizon, forecaster, window, window_size, lags = args
+    errors = np.empty((len(origins), horizon, y.shape[1]), dtype=np.float64)
+
+    if forecaster == "trend":
+        for i, origin in enumerate(origins):
+            start = 0 if window == "expanding" else max(0, origin - window_size)
+            errors[i] = trend_forecast(y[start:origin], horizon) - y[origin:origin + horizon]
+        return errors
+
+    design = lag_design_matrix(y, lags)
+    target = y[lags:]
+    xtx = np.zeros((design.shape[1], design.shape[1]))
+    xty = np.zeros((design.shape[1], y.shape[1]))
+    lo = hi = 0  # design rows currently in the normal equations
+    for i, origin in enumerate(origins):
+        new_hi = origin - lags
+        # Design row j predicts y[lags + j], so a rolling window of window_size targets starts lags earlier
+        new_lo = 0 if window == "expanding" else max(0, origin - lags - window_size)
+        if new_hi > hi:
+            rows = slice(max(hi, new_lo), new_hi)
+            xtx += design[rows].T @ design[rows]
+            xty += design[rows].T @ target[rows]
+        if new_lo > lo and hi > lo:
+            rows = slice(lo, min(new_lo, hi))
+            xtx -= design[rows].T @ design[rows]
+            xty -= design[rows].T @ target[rows]
+        lo, hi = new_lo, new_hi
+        coefs = _solve_normal_equations(xtx, xty)
+        errors[i] = var_forecast_path(coefs, y[:origin], horizon) - y[origin:origin + horizon]
+    return errors
+
+class BacktestService:
+    """Walk-forward (rolling-origin) evaluation of forecasters over history"""
+
+    def __init__(self):
+        # (cache_key, forecaster, window, window_size, horizon, lags) -> {origin timestamp: errors}
+        self._cache: Dict[Tuple, Dict[pd.Timestamp, np.ndarray]] = {}
+
+    def clear_cache(self, cache_key: Optional[str] = None) -> None:
+        """Drop cached origins, e.g. after historical data has been revised"""
+        if cache_key is None:
+            self._cache.clear()
+        else:
+            self._cache = {key: value for key, value in self._cache.items() if key[0] != cache_key}
+
+    def run(self,
+            data: pd.DataFrame,
+            forecaster: str = "var",
+            horizon: int = 4,
+            window: str = "expanding",
+            window_size: int = 40,
+            min_train: int = 20,
+            step: int = 1,
+            lags: int = 2,
+            n_jobs: Optional[int] = 1,
+            cache_key: Optional[str] = None) -> Dict:
+        """Backtest one forecaster and report RMSE/MAE by horizon
+
+        Origins run from ``min_train`` observations to the last point with a
+        full ``horizon`` of actuals, every ``step`` rows. The training sample
+        is all data before the origin (``expanding``) or the last
+        ``window_size`` rows (``rolling``; the VAR takes its presample lags
+        from the rows just before them). Blocks of origins are spread over
+        ``n_jobs`` processes (``None`` for all cores). With a ``cache_key``,
+        per-origin errors are kept so a later call on extended data only
+        evaluates the new origins.
+        """
+        if forecaster not in FORECASTERS:
+            raise ValueError(f"Unknown forecaster '{forecaster}', expected one of {FORECASTERS}")
+        if window not in WINDOWS:
+            raise ValueError(f"Unknown window '{window}', expected one of {WINDOWS}")
+
+        y = data.to_numpy(dtype=np.float64)
+        first_origin = self._first_origin(forecaster, min_train, lags, y.shape[1])
+        origins = list(range(first_origin, len(y) - horizon + 1, step))
+        if not origins:
+            raise ValueError(f"{len(y)} observations are too few to backtest a {horizon}-step horizon")
+
+        key = (cache_key, forecaster, window, window_size, horizon, lags)
+        cached = self._cache.get(key, {}) if cache_key is not None else {}
+        todo = [origin for origin in origins if data.index[origin] not in cached]
+
+        if todo:
+            computed = self._evaluate(y, todo, horizon, forecaster, window, window_size, lags, n_jobs)
+            if cache_key is not None:
+                cache = self._cache.setdefault(key, {})
+                for origin, errors in zip(todo, computed):
+                    cache[data.index[origin]] = errors
+                cached = cache
+            else:
+                cached = dict(zip((data.index[origin] for origin in todo), computed))
+
+        errors = np.stack([cached[data.index[origin]] for origin in origins])
+        steps = pd.Index(range(1, horizon + 1), name="horizon")
+        columns = list(data.columns)
+        return {
+            "forecaster": forecaster,
+            "origins": [data.index[origin] for origin in origins],
+            "n_origins": len(origins),
+            "n_evaluated": len(todo),
+            "rmse": pd.DataFrame(np.sqrt(np.mean(errors ** 2, axis=0)), index=steps, columns=columns),
+            "mae": pd.DataFrame(np.mean(np.abs(errors), axis=0), index=steps, columns=columns),
+            "errors": errors
+        }
+
+    def compare(self,
+                data: pd.DataFrame,
+                forecasters: Sequence[str] = FORECASTERS,
+                metric: str = "rmse",
+                **kwargs) -> pd.DataFrame:
+        """Backtest several forecasters on the same origins; one column per (forecaster, variable)"""
+        # Start every forecaster at the latest first origin so errors are computed on identical origins
+        kwargs["min_train"] = max(
+            self._first_origin(name, kwargs.get("min_train", 20), kwargs.get("lags", 2), data.shape[1])
+            for name in forecasters
+        )
+        tables = {name: self.run(data, forecaster=name, **kwargs)[metric] for name in forecasters}
+        return pd.concat(tables, axis=1)
+
+    @staticmethod
+    def _first_origin(forecaster: str, min_train: int, lags: int, n_variables: int) -> int:
+        if forecaster == "var":
+            # Need more design rows than VAR parameters per equation
+            return max(min_train, lags + 2 + n_variables * lags)
+        return max(min_train, 2)
+
+    def _evaluate(self,
+                  y: np.ndarray,
+                  origins: List[int],
+                  horizon: int,
+                  forecaster: str,
+                  window: str,
+                  window_size: int,
+                  lags: int,
+                  n_jobs: Optional[int]) -> np.ndarray:
+        n_jobs = n_jobs or os.cpu_count() or 1
+        n_blocks = max(1, min(n_jobs, len(origins)))
+        blocks = [list(block) for block in np.array_split(origins, n_blocks) if len(block)]
+        tasks = [(y, block, horizon, forecaster, window, window_size, lags) for block in blocks]
+
+        if len(tasks) == 1:
+            return _backtest_block(tasks[0])
+        with ProcessPoolExecutor(max_workers=len(tasks)) as executor:
+            return np.concatenate(list(executor.map(_backtest_block, tasks)))
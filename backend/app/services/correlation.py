@@ -0,0 +1,224 @@
+import logging
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.services.real_data_service import RealDataService
+
+logger = logging.getLogger(__name__)
+
+COVARIANCE_METHODS = ("ew", "rolling")
+# How each observation is turned into the quantity whose co-movement is tracked
+COVARIANCE_TRANSFORMS = ("pct_change", "diff", "level")
+
+def covariance_to_correlation(cov: np.ndarray) -> np.ndarray:
+    std = np.sqrt(np.clip(np.diag(cov), 0, None))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        corr = cov / np.outer(std, std)
+    corr[~np.isfinite(corr)] = 0.0
+    np.fill_diagonal(corr, np.where(std > 0, 1.0, 0.0))
+    return corr
+
+class EWCovariance:
+    """Exponentially weighted mean and covariance updated in O(k^2) per observation
+
+    Uses the incremental form mean += a*d, cov = (1-a)*(cov + a*d d') with
+    d = x - mean and a = 1 - 0.5**(1/halflife), so history never has to be
+    revisited. Like RollingCovariance the result is unbiased: the weighted
+    estimate is divided by 1 - sum(w_i^2) of the normalised weights, the
+    exponentially weighted analogue of ddof=1 (pandas ``ewm(adjust=False).cov()``).
+    """
+
+    def __init__(self, n_variables: int, halflife: float = 12):
+        self.alpha = 1 - 0.5 ** (1 / halflife)
+        self.mean = np.zeros(n_variables)
+        self.cov = np.zeros((n_variables, n_variables))
+        self.count = 0
+        # Sum of squared observation weights (the weights themselves always sum to one)
+        self._weight_sq = 0.0
+
+    def update(self, rows: np.ndarray) -> None:
+        for x in np.atleast_2d(rows):
+            if self.count == 0:
+                self.mean[:] = x
+                self._weight_sq = 1.0
+            else:
+                d = x - self.mean
+                self.mean += self.alpha * d
+                self.cov = (1 - self.alpha) * (self.cov + self.alpha * np.outer(d, d))
+                self._weight_sq = (1 - self.alpha) ** 2 * self._weight_sq + self.alpha ** 2
+            self.count += 1
+
+    @property
+    def covariance(self) -> np.ndarray:
+        if self.count < 2:
+            return np.zeros_like(self.cov)
+        return self.cov / (1 - self._weight_sq)
+
+class RollingCovariance:
+    """Unbiased (ddof=1) sample covariance of the last ``window`` observations from running sums
+
+    Keeps the window in a ring buffer together with the sum and the sum of
+    outer products; a batch of new rows adds its cross-products and removes
+    those of the rows it pushes out. The sums are rebuilt from the buffer
+    once per ``window`` rows so floating-point drift cannot build up.
+    """
+
+    def __init__(self, n_variables: int, window: int = 60):
+        self.window = window
+        self.buffer = np.zeros((window, n_variables))
+        self.sum = np.zeros(n_variables)
+        self.sumsq = np.zeros((n_variables, n_variables))
+        self.count = 0
+        self._since_rebuild = 0
+
+    def update(self, rows: np.ndarray) -> None:
+        rows = np.atleast_2d(rows)
+        positions = self.count + np.arange(len(rows))
+        if len(rows) >= self.window:
+            # The batch replaces the whole window
+            self.buffer[positions[-self.window:] % self.window] = rows[-self.window:]
+            self.count += len(rows)
+            self._rebuild()
+            return
+        slots = positions % self.window
+        leaving = self.buffer[slots[positions >= self.window]]
+        self.sum += rows.sum(axis=0) - leaving.sum(axis=0)
+        self.sumsq += rows.T @ rows - leaving.T @ leaving
+        self.buffer[slots] = rows
+        self.count += len(rows)
+        self._since_rebuild += len(rows)
+        if self._since_rebuild >= self.window:
+            self._rebuild()
+
+    def _rebuild(self) -> None:
+        filled = self.buffer[:min(self.count, self.window)]
+        self.sum = filled.sum(axis=0)
+        self.sumsq = filled.T @ filled
+        self._since_rebuild = 0
+
+    @property
+    def covariance(self) -> np.ndarray:
+        n = min(self.count, self.window)
+        if n < 2:
+            return np.zeros_like(self.sumsq)
+        return (self.sumsq - np.outer(self.sum, self.sum) / n) / (n - 1)
+
+class _Tracker:
+    """Both estimators for one panel, plus the last observation they have absorbed"""
+
+    def __init__(self, columns: List[str], halflife: float, window: int):
+        self.columns = columns
+        self.ew = EWCovariance(len(columns), halflife)
+        self.rolling = RollingCovariance(len(columns), window)
+        self.last_date: Optional[pd.Timestamp] = None
+        self.refreshed = 0.0
+
+class CorrelationService:
+    """Cross-indicator covariance and correlation maintained as observations arrive
+
+    Each requested set of series gets an aligned panel from
+    ``RealDataService.get_panel_data``; on refresh only the periods after the
+    last absorbed one are fed to the exponentially weighted and rolling-window
+    estimators, so serving a matrix costs O(k^2) however long the history is.
+    The same covariance can be passed to ``EconomicModelService.run_monte_carlo``
+    and ``generate_risk_assessment`` as the shock covariance.
+    """
+
+    REFRESH_SECONDS = 900
+    # Series sets tracked at once; the least recently used is dropped beyond this
+    MAX_TRACKERS = 64
+
+    def __init__(self,
+                 data_service: RealDataService,
+                 halflife: float = 12,
+                 window: int = 60,
+                 years: int = 20):
+        self.data_service = data_service
+        self.halflife = halflife
+        self.window = window
+        self.years = years
+        self._trackers: "OrderedDict[Tuple[Tuple[str, ...], str, str], _Tracker]" = OrderedDict()
+
+    @staticmethod
+    def _transform(panel: pd.DataFrame, transform: str) -> pd.DataFrame:
+        if transform == "pct_change":
+            return panel.pct_change().mul(100).iloc[1:]
+        if transform == "diff":
+            return panel.diff().iloc[1:]
+        return panel
+
+    async def _tracker(self, series_ids: Sequence[str], freq: str, transform: str) -> _Tracker:
+        if transform not in COVARIANCE_TRANSFORMS:
+            raise ValueError(f"Unknown transform '{transform}', expected one of {COVARIANCE_TRANSFORMS}")
+        key = (tuple(dict.fromkeys(series_ids)), freq, transform)
+        if len(key[0]) < 2:
+            raise ValueError("At least two series are needed for a covariance matrix")
+
+        tracker = self._trackers.get(key)
+        if tracker is not None:
+            self._trackers.move_to_end(key)
+            if time.monotonic() - tracker.refreshed < self.REFRESH_SECONDS:
+                return tracker
+
+        panel = await self.data_service.get_panel_data(list(key[0]), freq=freq, years=self.years)
+        if panel is None:
+            if tracker is not None:
+                logger.warning(f"Refresh of {key[0]} failed, serving previous covariance")
+                return tracker
+            raise ValueError(f"No overlapping history for {', '.join(key[0])}")
+        if list(panel.columns) != list(key[0]):
+            raise ValueError(f"Panel for {', '.join(key[0])} only has {', '.join(panel.columns)}")
+
+        observations = self._transform(panel, transform).replace([np.inf, -np.inf], np.nan).dropna()
+        if tracker is None or tracker.columns != list(observations.columns):
+            tracker = _Tracker(list(observations.columns), self.halflife, self.window)
+            self._trackers[key] = tracker
+            self._trackers.move_to_end(key)
+            while len(self._trackers) > self.MAX_TRACKERS:
+                self._trackers.popitem(last=False)
+        new = observations if tracker.last_date is None else observations[observations.index > tracker.last_date]
+        if len(new):
+            values = new.to_numpy(dtype=np.float64)
+            tracker.ew.update(values)
+            tracker.rolling.update(values)
+            tracker.last_date = new.index[-1]
+        tracker.refreshed = time.monotonic()
+        return tracker
+
+    async def covariance(self,
+                         series_ids: Sequence[str],
+                         method: str = "ew",
+                         freq: str = "M",
+                         transform: str = "diff") -> pd.DataFrame:
+        """Current covariance matrix of the transformed series, labelled by series id"""
+        if method not in COVARIANCE_METHODS:
+            raise ValueError(f"Unknown method '{method}', expected one of {COVARIANCE_METHODS}")
+        tracker = await self._tracker(series_ids, freq, transform)
+        estimator = tracker.ew if method == "ew" else tracker.rolling
+        return pd.DataFrame(estimator.covariance, index=tracker.columns, columns=tracker.columns)
+
+    async def get_matrix(self,
+                         series_ids: Sequence[str],
+                         method: str = "ew",
+                         freq: str = "M",
+                         transform: str = "diff") -> Dict:
+        """Covariance and correlation matrices in a JSON-friendly layout"""
+        cov = await self.covariance(series_ids, method, freq, transform)
+        tracker = await self._tracker(series_ids, freq, transform)
+        estimator = tracker.ew if method == "ew" else tracker.rolling
+        return {
+            "labels": list(cov.columns),
+            "method": method,
+            "transform": transform,
+            "freq": freq,
+            "halflife": self.halflife if method == "ew" else None,
+            "window": self.window if method == "rolling" else None,
+            "n_observations": estimator.count if method == "ew" else min(estimator.count, self.window),
+            "as_of": tracker.last_date.isoformat() if tracker.last_date is not None else None,
+            "covariance": cov.round(6).to_numpy().tolist(),
+            "correlation": covariance_to_correlation(cov.to_numpy()).round(4).tolist()
+        }
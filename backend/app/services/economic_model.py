@@ -1,51 +1,414 @@
+import os
+import logging
 import numpy as np
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
 from statsmodels.tsa.vector_ar.var_model import VAR
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 from datetime import datetime, timedelta
 
+from app.services.risk_metrics import TailRiskAccumulator, tail_risk_metrics
+
+logger = logging.getLogger(__name__)
+
+OUTLIER_METHODS = ("winsorize", "mask", "drop", "none")
+INFORMATION_CRITERIA = ("aic", "bic", "hqic")
+
+def _ffill_inplace(values: np.ndarray) -> None:
+    """Forward fill NaNs down each column of a 2-D float array in place"""
+    mask = np.isnan(values)
+    if not mask.any():
+        return
+    rows = np.where(mask, 0, np.arange(values.shape[0])[:, None])
+    np.maximum.accumulate(rows, axis=0, out=rows)
+    values[...] = np.take_along_axis(values, rows, axis=0)
+
+def _bfill_leading_inplace(values: np.ndarray) -> None:
+    """Back fill the leading NaNs of each column (the only gaps left after a forward fill)"""
+    valid = ~np.isnan(values)
+    has_valid = valid.any(axis=0)
+    first_valid = valid.argmax(axis=0)
+    for col in np.flatnonzero(has_valid & (first_valid > 0)):
+        values[:first_valid[col], col] = values[first_valid[col], col]
+
+def lag_design_matrix(y: np.ndarray, maxlags: int) -> np.ndarray:
+    """VAR regressors [1, y_{t-1}, ..., y_{t-maxlags}] for t = maxlags..T-1; order p uses the first 1 + k*p columns"""
+    nobs, k = y.shape
+    rows = nobs - maxlags
+    design = np.empty((rows, 1 + k * maxlags), dtype=np.float64)
+    design[:, 0] = 1.0
+    for lag in range(1, maxlags + 1):
+        design[:, 1 + k * (lag - 1):1 + k * lag] = y[maxlags - lag:nobs - lag]
+    return design
+
+def var_forecast_path(coefs: np.ndarray, history: np.ndarray, steps: int) -> np.ndarray:
+    """Iterate OLS VAR coefficients (constant row first) forward from the last rows of history"""
+    k = coefs.shape[1]
+    lags = (coefs.shape[0] - 1) // k
+    window = np.array(history[len(history) - lags:][::-1], dtype=np.float64)
+    path = np.empty((steps, k), dtype=np.float64)
+    for step in range(steps):
+        path[step] = coefs[0] + window.reshape(-1) @ coefs[1:]
+        if lags:
+            window[1:] = window[:-1]
+            window[0] = path[step]
+    return path
+
+def var_impulse_matrix(coefs: np.ndarray, steps: int) -> np.ndarray:
+    """(steps*k, steps*k) map from step-major flattened shocks to the path's deviation from var_forecast_path"""
+    k = coefs.shape[1]
+    lags = (coefs.shape[0] - 1) // k
+    responses = [np.eye(k)]
+    for horizon in range(1, steps):
+        response = np.zeros((k, k))
+        for lag in range(1, min(horizon, lags) + 1):
+            response += responses[horizon - lag] @ coefs[1 + k * (lag - 1):1 + k * lag]
+        responses.append(response)
+    matrix = np.zeros((steps * k, steps * k))
+    for shock_step in range(steps):
+        for step in range(shock_step, steps):
+            matrix[k * shock_step:k * (shock_step + 1), k * step:k * (step + 1)] = responses[step - shock_step]
+    return matrix
+
+# Design shared with lag-selection worker processes, set once per worker by the pool initializer
+_SELECTION_STATE: Dict[str, np.ndarray] = {}
+
+def _init_lag_selection(y: np.ndarray, design: np.ndarray) -> None:
+    _SELECTION_STATE["y"] = y
+    _SELECTION_STATE["design"] = design
+
+def _evaluate_lag_order(args: Tuple[int, int, Sequence[int], int]) -> Dict[str, float]:
+    """Information criteria and rolling-origin error for a single candidate lag order"""
+    lags, maxlags, origins, horizon = args
+    y = _SELECTION_STATE["y"]
+    design = _SELECTION_STATE["design"]
+    k = y.shape[1]
+    n_params = 1 + k * lags
+    target = y[maxlags:]
+    regressors = design[:, :n_params]
+    nobs = len(target)
+    
+    coefs, _, _, _ = np.linalg.lstsq(regressors, target, rcond=None)
+    resid = target - regressors @ coefs
+    sign, logdet = np.linalg.slogdet(resid.T @ resid / nobs)
+    logdet = logdet if sign > 0 else np.inf
+    free_params = lags * k * k + k
+    row = {
+        "lags": lags,
+        "aic": logdet + 2.0 * free_params / nobs,
+        "bic": logdet + np.log(nobs) * free_params / nobs,
+        "hqic": logdet + 2.0 * np.log(np.log(nobs)) * free_params / nobs,
+    }
+    
+    # Rolling-origin evaluation on the same design: refit on rows before each origin
+    scale = y.std(axis=0)
+    scale[scale == 0] = 1.0
+    errors = []
+    for origin in origins:
+        train_rows = origin - maxlags
+        if train_rows <= n_params:
+            continue
+        fold_coefs, _, _, _ = np.linalg.lstsq(regressors[:train_rows], target[:train_rows], rcond=None)
+        path = var_forecast_path(fold_coefs, y[:origin], horizon)
+        errors.append((path - y[origin:origin + horizon]) / scale)
+    
+    if errors:
+        errors = np.asarray(errors)
+        row["oos_rmse"] = float(np.sqrt(np.mean(errors ** 2)))
+        row["oos_mae"] = float(np.mean(np.abs(errors)))
+    else:
+        row["oos_rmse"] = row["oos_mae"] = np.nan
+    row["n_origins"] = len(errors)
+    return row
+
+def stacked_var_coefs(results: VAR) -> np.ndarray:
+    """Fitted statsmodels VAR coefficients as [intercept; A_1'; ...; A_p'], the layout of lag_design_matrix"""
+    k = results.neqs
+    blocks = [np.asarray(results.intercept, dtype=np.float64).reshape(1, k)]
+    blocks.extend(results.coefs[lag].T for lag in range(results.k_ar))
+    return np.vstack(blocks)
+
+def simulate_var_paths(coefs: np.ndarray, history: np.ndarray, shocks: np.ndarray) -> np.ndarray:
+    """Paths (paths, steps, k) of shared or per-path VAR coefs from shared or per-path history under shocks"""
+    n_paths, steps, k = shocks.shape
+    shared = coefs.ndim == 2
+    lags = (coefs.shape[-2] - 1) // k
+    if history.ndim == 2:
+        window = np.tile(history[len(history) - lags:][::-1].reshape(1, -1), (n_paths, 1))
+    else:
+        window = history[:, history.shape[1] - lags:][:, ::-1].reshape(n_paths, -1).copy()
+    paths = np.empty((n_paths, steps, k), dtype=np.float64)
+    if shared:
+        # One coefficient set: a matrix product per lag, rotating the lagged values instead of shifting a window
+        blocks = [coefs[1 + j * k:1 + (j + 1) * k] for j in range(lags)]
+        recent = [window[:, j * k:(j + 1) * k] for j in range(lags)]
+        for step in range(steps):
+            value = coefs[0] + shocks[:, step]
+            for block, lagged in zip(blocks, recent):
+                value += lagged @ block
+            paths[:, step] = value
+            recent = [value] + recent[:-1]
+        return paths
+    for step in range(steps):
+        paths[:, step] = coefs[:, 0] + np.einsum("bi,bij->bj", window, coefs[:, 1:]) + shocks[:, step]
+        if lags:
+            window[:, k:] = window[:, :-k].copy()
+            window[:, :k] = paths[:, step]
+    return paths
+
+def covariance_root(cov: np.ndarray) -> np.ndarray:
+    """Matrix R with R R' = cov; eigen-based so singular covariances from short windows still work"""
+    eigenvalues, eigenvectors = np.linalg.eigh(cov)
+    return eigenvectors * np.sqrt(np.clip(eigenvalues, 0, None))
+
+def _bootstrap_chunk(args: Tuple[np.ndarray, np.ndarray, np.ndarray, int, int, bool, np.random.SeedSequence]) -> np.ndarray:
+    """Residual-bootstrap forecast paths for one chunk of replicates"""
+    coefs, y, resid, steps, n_boot, reestimate, seed = args
+    rng = np.random.default_rng(seed)
+    nobs, k = y.shape
+    lags = (coefs.shape[0] - 1) // k
+    
+    if reestimate:
+        # Pseudo-histories from resampled residuals, then one batched OLS solve for all replicates
+        draws = resid[rng.integers(0, len(resid), size=(n_boot, nobs - lags))]
+        pseudo = np.concatenate([np.broadcast_to(y[:lags], (n_boot, lags, k)),
+                                 simulate_var_paths(coefs, y[:lags], draws)], axis=1)
+        design = np.empty((n_boot, nobs - lags, 1 + k * lags))
+        design[:, :, 0] = 1.0
+        for lag in range(1, lags + 1):
+            design[:, :, 1 + k * (lag - 1):1 + k * lag] = pseudo[:, lags - lag:nobs - lag]
+        design_t = design.transpose(0, 2, 1)
+        coefs = np.linalg.solve(design_t @ design, design_t @ pseudo[:, lags:])
+    
+    shocks = resid[rng.integers(0, len(resid), size=(n_boot, steps))]
+    return simulate_var_paths(coefs, y, shocks)
+
 class EconomicModelService:
     def __init__(self):
         self.models = {}
         
-    def prepare_data(self, data: pd.DataFrame) -> pd.DataFrame:
-        """Prepare data for modeling by handling missing values and outliers"""
-        # Remove outliers using IQR method
-        Q1 = data.quantile(0.25)
-        Q3 = data.quantile(0.75)
-        IQR = Q3 - Q1
-        data = data[~((data < (Q1 - 1.5 * IQR)) | (data > (Q3 + 1.5 * IQR))).any(axis=1)]
+    def outlier_bounds(self,
+                       data: pd.DataFrame,
+                       iqr_multiplier: float = 1.5) -> Tuple[np.ndarray, np.ndarray]:
+        """Per-column IQR fences (lower, upper) used by prepare_data"""
+        values = data.to_numpy(dtype=np.float64)
+        q1, q3 = np.nanquantile(values, [0.25, 0.75], axis=0)
+        iqr = q3 - q1
+        return q1 - iqr_multiplier * iqr, q3 + iqr_multiplier * iqr
+
+    def prepare_data(self,
+                     data: pd.DataFrame,
+                     outliers: str = "winsorize",
+                     iqr_multiplier: float = 1.5,
+                     bounds: Optional[Tuple[np.ndarray, np.ndarray]] = None) -> pd.DataFrame:
+        """Prepare data for modeling by handling missing values and outliers
+
+        ``outliers``: winsorize (clip to the IQR fence), mask (fill like a gap),
+        drop (remove the row) or none.
+        """
+        values, index = self._treat_outliers(data, outliers, iqr_multiplier, bounds)
         
         # Fill missing values with forward fill then backward fill
-        data = data.fillna(method='ffill').fillna(method='bfill')
+        _ffill_inplace(values)
+        _bfill_leading_inplace(values)
+        
+        return pd.DataFrame(values, index=index, columns=data.columns)
+
+    def _treat_outliers(self,
+                        data: pd.DataFrame,
+                        outliers: str,
+                        iqr_multiplier: float,
+                        bounds: Optional[Tuple[np.ndarray, np.ndarray]]) -> Tuple[np.ndarray, pd.Index]:
+        """Float64 copy of ``data`` with the outlier treatment applied, and its (possibly reduced) index"""
+        if outliers not in OUTLIER_METHODS:
+            raise ValueError(f"Unknown outlier method '{outliers}', expected one of {OUTLIER_METHODS}")
+        
+        values = data.to_numpy(dtype=np.float64, copy=True)
+        index = data.index
         
-        return data
+        if outliers != "none":
+            lower, upper = bounds if bounds is not None else self.outlier_bounds(data, iqr_multiplier)
+            if outliers == "winsorize":
+                np.clip(values, lower, upper, out=values)
+            else:
+                out_of_range = (values < lower) | (values > upper)
+                if outliers == "mask":
+                    values[out_of_range] = np.nan
+                else:
+                    keep = ~out_of_range.any(axis=1)
+                    values = values[keep]
+                    index = index[keep]
+        return values, index
+
+    def prepare_data_stream(self,
+                            chunks: Iterable[pd.DataFrame],
+                            outliers: str = "winsorize",
+                            iqr_multiplier: float = 1.5,
+                            bounds: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+                            max_pending_rows: int = 100_000) -> Iterator[pd.DataFrame]:
+        """prepare_data for a panel that does not fit in memory, one time-ordered chunk at a time
+
+        Fences come from ``bounds`` or the first chunk. Up to ``max_pending_rows``
+        leading rows are held back for the initial back fill; past that a column
+        with no observation yet stays NaN until its first one.
+        """
+        if outliers not in OUTLIER_METHODS:
+            raise ValueError(f"Unknown outlier method '{outliers}', expected one of {OUTLIER_METHODS}")
+        
+        last_row: Optional[np.ndarray] = None
+        seen: Optional[np.ndarray] = None
+        pending: List[pd.DataFrame] = []
+        pending_rows = 0
+        
+        for chunk in chunks:
+            if chunk.empty:
+                continue
+            if bounds is None and outliers != "none":
+                bounds = self.outlier_bounds(chunk, iqr_multiplier)
+            # Only the outlier step and the in-chunk forward fill; a back fill here would pull later values backwards
+            values, index = self._treat_outliers(chunk, outliers, iqr_multiplier, bounds)
+            if len(values) == 0:
+                continue
+            _ffill_inplace(values)
+            
+            if last_row is not None:
+                # Rows still NaN after the in-chunk fill lead the chunk; carry the previous chunk forward
+                leading = np.isnan(values)
+                values[leading] = np.broadcast_to(last_row, values.shape)[leading]
+                last_row = values[-1].copy()
+                yield pd.DataFrame(values, index=index, columns=chunk.columns)
+                continue
+            
+            pending.append(pd.DataFrame(values, index=index, columns=chunk.columns))
+            pending_rows += len(values)
+            observed = ~np.isnan(values).all(axis=0)
+            seen = observed if seen is None else seen | observed
+            if not seen.all():
+                if pending_rows < max_pending_rows:
+                    # Some column has not been observed yet; wait for the value to back fill from
+                    continue
+                logger.warning(f"No observations of {', '.join(map(str, chunk.columns[~seen]))} "
+                               f"in the first {pending_rows} rows; emitting them unfilled")
+            
+            combined = self._fill_panel_start(pending)
+            pending = []
+            last_row = combined.to_numpy()[-1].copy()
+            yield combined
+        
+        if pending:
+            yield self._fill_panel_start(pending)
+    
+    @staticmethod
+    def _fill_panel_start(pending: List[pd.DataFrame]) -> pd.DataFrame:
+        """Join the chunks held back at the start of a stream and fill them as prepare_data would"""
+        combined = pd.concat(pending) if len(pending) > 1 else pending[0]
+        values = combined.to_numpy(dtype=np.float64, copy=True)
+        _ffill_inplace(values)
+        _bfill_leading_inplace(values)
+        return pd.DataFrame(values, index=combined.index, columns=combined.columns)
     
-    def train_var_model(self, data: pd.DataFrame, maxlags: int = 5) -> VAR:
-        """Train a Vector Autoregression model"""
+    def train_var_model(self, data: pd.DataFrame, maxlags: int = 5, lags: Optional[int] = None) -> VAR:
+        """Train a Vector Autoregression model, by AIC up to ``maxlags`` unless ``lags`` is given"""
         model = VAR(data)
+        if lags is not None:
+            return model.fit(lags)
         results = model.fit(maxlags=maxlags, ic='aic')
         return results
     
+    def select_var_order(self,
+                         data: pd.DataFrame,
+                         maxlags: int = 12,
+                         rank_by: str = "aic",
+                         n_origins: int = 8,
+                         horizon: int = 4,
+                         n_jobs: Optional[int] = None) -> pd.DataFrame:
+        """Rank VAR lag orders 1..maxlags by information criteria and rolling-origin forecast error
+
+        All orders share one sample and design matrix, as in ``VAR.select_order``.
+        """
+        if rank_by not in INFORMATION_CRITERIA + ("oos_rmse", "oos_mae"):
+            raise ValueError(f"Cannot rank by '{rank_by}'")
+        
+        y = data.to_numpy(dtype=np.float64)
+        nobs, k = y.shape
+        if nobs - maxlags <= 1 + k * maxlags:
+            raise ValueError(f"{nobs} observations are too few for {k} variables at maxlags={maxlags}")
+        
+        design = lag_design_matrix(y, maxlags)
+        last_origin = nobs - horizon
+        origins = [origin for origin in range(last_origin - n_origins + 1, last_origin + 1) if origin > maxlags]
+        tasks = [(lags, maxlags, origins, horizon) for lags in range(1, maxlags + 1)]
+        
+        n_jobs = n_jobs or os.cpu_count() or 1
+        if n_jobs == 1:
+            _init_lag_selection(y, design)
+            rows = [_evaluate_lag_order(task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=min(n_jobs, len(tasks)),
+                                     initializer=_init_lag_selection,
+                                     initargs=(y, design)) as executor:
+                rows = list(executor.map(_evaluate_lag_order, tasks))
+        
+        table = pd.DataFrame(rows).set_index("lags")
+        for column in INFORMATION_CRITERIA + ("oos_rmse", "oos_mae"):
+            table[f"{column}_rank"] = table[column].rank(method="min")
+        return table.sort_values([rank_by, "lags"])
+    
     def forecast(self, model: VAR, steps: int = 12) -> pd.DataFrame:
         """Generate forecasts using the trained model"""
         forecast = model.forecast(model.y, steps=steps)
         return pd.DataFrame(forecast, columns=model.names)
     
+    def bootstrap_forecast(self,
+                           model: VAR,
+                           steps: int = 12,
+                           n_boot: int = 2000,
+                           alpha: float = 0.05,
+                           reestimate: bool = True,
+                           seed: Optional[int] = 0,
+                           n_jobs: int = 1) -> Dict[str, np.ndarray]:
+        """Forecast bands from a residual bootstrap, refitting each replicate when ``reestimate``"""
+        if model.k_ar == 0:
+            raise ValueError("Bootstrap bands need a VAR with at least one lag")
+        coefs = stacked_var_coefs(model)
+        y = np.asarray(model.endog, dtype=np.float64)
+        resid = np.asarray(model.resid, dtype=np.float64)
+        resid = resid - resid.mean(axis=0)
+        
+        n_chunks = max(1, min(n_jobs, n_boot))
+        sizes = [len(chunk) for chunk in np.array_split(np.arange(n_boot), n_chunks)]
+        seeds = np.random.SeedSequence(seed).spawn(n_chunks)
+        tasks = [(coefs, y, resid, steps, size, reestimate, chunk_seed) for size, chunk_seed in zip(sizes, seeds)]
+        if n_chunks == 1:
+            paths = _bootstrap_chunk(tasks[0])
+        else:
+            with ProcessPoolExecutor(max_workers=n_chunks) as executor:
+                paths = np.concatenate(list(executor.map(_bootstrap_chunk, tasks)))
+        
+        lower, median, upper = np.percentile(paths, [100 * alpha / 2, 50, 100 * (1 - alpha / 2)], axis=0)
+        return {
+            "point": var_forecast_path(coefs, y, steps),
+            "median": median,
+            "lower_ci": lower,
+            "upper_ci": upper
+        }
+    
     def run_monte_carlo(self, 
                        base_model: VAR,
                        n_simulations: int = 1000,
-                       forecast_steps: int = 12) -> Dict[str, np.ndarray]:
-        """Run Monte Carlo simulations for uncertainty quantification"""
-        simulations = []
-        for _ in range(n_simulations):
-            # Add random noise to the forecast
-            forecast = base_model.forecast(base_model.y, steps=forecast_steps)
-            noise = np.random.normal(0, base_model.sigma_u, size=forecast.shape)
-            simulation = forecast + noise
-            simulations.append(simulation)
-        
-        simulations = np.array(simulations)
+                       forecast_steps: int = 12,
+                       shock_cov: Optional[np.ndarray] = None,
+                       seed: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """Run Monte Carlo simulations with shocks from ``shock_cov`` or the residual covariance"""
+        k = base_model.neqs
+        cov = np.asarray(base_model.sigma_u if shock_cov is None else shock_cov, dtype=np.float64)
+        if cov.shape != (k, k):
+            raise ValueError(f"Shock covariance must be {k}x{k}, got {cov.shape}")
+        root = covariance_root(cov)
+        
+        rng = np.random.default_rng(seed)
+        shocks = rng.standard_normal((n_simulations, forecast_steps, k)) @ root.T
+        simulations = simulate_var_paths(stacked_var_coefs(base_model), np.asarray(base_model.endog), shocks)
         
         # Calculate confidence intervals
         lower_ci = np.percentile(simulations, 2.5, axis=0)
@@ -59,6 +422,31 @@ class EconomicModelService:
             "simulations": simulations
         }
     
+    def simulate_tail_risk(self,
+                           base_model: VAR,
+                           n_paths: int = 1_000_000,
+                           forecast_steps: int = 4,
+                           levels: Sequence[float] = (0.95, 0.99),
+                           thresholds: Optional[Dict[str, Sequence[Tuple[str, float]]]] = None,
+                           shock_cov: Optional[np.ndarray] = None,
+                           chunk_size: int = 100_000,
+                           seed: Optional[int] = 0) -> Dict[str, Dict]:
+        """VaR, Expected Shortfall and exceedance probabilities over ``n_paths`` paths, simulated in chunks"""
+        k = base_model.neqs
+        root = covariance_root(np.asarray(base_model.sigma_u if shock_cov is None else shock_cov, dtype=np.float64))
+        coefs = stacked_var_coefs(base_model)
+        point = var_forecast_path(coefs, np.asarray(base_model.endog), forecast_steps).reshape(-1, 1)
+        loading = (np.kron(np.eye(forecast_steps), root.T) @ var_impulse_matrix(coefs, forecast_steps)).T
+        accumulator = TailRiskAccumulator(base_model.names, forecast_steps, n_paths, levels, thresholds)
+        
+        rng = np.random.default_rng(seed)
+        for start in range(0, n_paths, chunk_size):
+            size = min(chunk_size, n_paths - start)
+            columns = loading @ rng.standard_normal((forecast_steps * k, size))
+            columns += point
+            accumulator.update_columns(columns)
+        return accumulator.result()
+    
     def calculate_elasticity(self, 
                            model: VAR,
                            variable: str,
@@ -80,12 +468,19 @@ class EconomicModelService:
     def generate_risk_assessment(self,
                                forecast: pd.DataFrame,
                                historical_data: pd.DataFrame,
-                               confidence_intervals: Dict[str, np.ndarray]) -> Dict:
-        """Generate risk assessment based on forecast results"""
+                               confidence_intervals: Dict[str, np.ndarray],
+                               covariance: Optional[pd.DataFrame] = None) -> Dict:
+        """Generate risk assessment based on forecast results, with tail risk when simulations are given"""
         # Calculate volatility
-        historical_volatility = historical_data.std()
+        if covariance is not None:
+            historical_volatility = pd.Series(np.sqrt(np.diag(covariance.to_numpy())), index=covariance.columns)
+        else:
+            historical_volatility = historical_data.std()
         forecast_volatility = forecast.std()
         
+        simulations = confidence_intervals.get("simulations")
+        tail_risk = tail_risk_metrics(simulations, list(forecast.columns), levels=(0.95,)) if simulations is not None else {}
+        
         # Assess risk levels
         risk_levels = {}
         for variable in forecast.columns:
@@ -110,5 +505,7 @@ class EconomicModelService:
                 "volatility_ratio": vol_ratio,
                 "confidence_interval_width": avg_ci_width
             }
+            if variable in tail_risk:
+                risk_levels[variable]["tail_risk"] = tail_risk[variable]
             
         return risk_levels 
\ No newline at end of file
@@ -0,0 +1,139 @@
+import asyncio
+import copy
+import logging
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Set
+
+from app.services.real_data_service import RealDataService
+
+logger = logging.getLogger(__name__)
+
+# Dashboard panels pushed to live subscribers
+LIVE_FIELDS = ["indicators", "market_data"]
+
+def diff_snapshots(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """Nested dict holding only the leaves of ``new`` that differ from ``old``; removed keys map to None"""
+    changes: Dict[str, Any] = {}
+    for key, value in new.items():
+        previous = old.get(key)
+        if isinstance(value, dict) and isinstance(previous, dict):
+            nested = diff_snapshots(previous, value)
+            if nested:
+                changes[key] = nested
+        elif key not in old or previous != value:
+            changes[key] = value
+    for key in old.keys() - new.keys():
+        changes[key] = None
+    return changes
+
+class Subscriber:
+    """One connected client: a bounded queue of state messages and a separate queue of alerts"""
+
+    def __init__(self, queue_size: int, alert_queue_size: int = 256):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        # Alerts are never collapsed into a snapshot, so a resync must not discard them
+        self.alerts: Deque[Dict[str, Any]] = deque(maxlen=alert_queue_size)
+        self._ready = asyncio.Event()
+        self.resyncs = 0
+        self.dropped_alerts = 0
+
+    def put(self, message: Dict[str, Any]) -> None:
+        """Queue a snapshot or update; raises asyncio.QueueFull when the client has fallen behind"""
+        self.queue.put_nowait(message)
+        self._ready.set()
+
+    def put_alert(self, message: Dict[str, Any]) -> None:
+        if len(self.alerts) == self.alerts.maxlen:
+            self.dropped_alerts += 1
+        self.alerts.append(message)
+        self._ready.set()
+
+    async def next_message(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Wait for the next message, alerts first; None when ``timeout`` expires first"""
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        message = self.alerts.popleft() if self.alerts else self.queue.get_nowait()
+        if not self.alerts and self.queue.empty():
+            self._ready.clear()
+        return message
+
+class LiveUpdateBroadcaster:
+    """Single upstream poller whose changes are fanned out to every subscriber
+
+    The poller runs only while at least one client is subscribed, and its cost
+    does not depend on how many are connected. A subscriber whose queue is
+    full is not allowed to hold up the others: its backlog is discarded and
+    replaced by one full snapshot, so a slow client skips intermediate diffs
+    and catches up on the latest state. Alerts travel in their own queue and
+    survive a resync.
+    """
+
+    def __init__(self, data_service: RealDataService, interval: float = 60, queue_size: int = 16):
+        self.data_service = data_service
+        self.interval = interval
+        self.queue_size = queue_size
+        self.snapshot: Dict[str, Any] = {}
+        self._subscribers: Set[Subscriber] = set()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    async def subscribe(self) -> Subscriber:
+        subscriber = Subscriber(self.queue_size)
+        self._subscribers.add(subscriber)
+        if self.snapshot:
+            subscriber.put({"type": "snapshot", "data": copy.deepcopy(self.snapshot)})
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._poll_loop())
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        self._subscribers.discard(subscriber)
+        if not self._subscribers and self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def publish(self, message: Dict[str, Any]) -> None:
+        """Queue a message for every subscriber without waiting on any of them"""
+        for subscriber in list(self._subscribers):
+            try:
+                subscriber.put(message)
+            except asyncio.QueueFull:
+                self._resync(subscriber)
+
+    def publish_alert(self, event: Dict[str, Any]) -> None:
+        """Queue an alert event for every subscriber; alerts are never dropped by a resync"""
+        for subscriber in list(self._subscribers):
+            subscriber.put_alert({"type": "alert", "data": event})
+
+    def _resync(self, subscriber: Subscriber) -> None:
+        while not subscriber.queue.empty():
+            subscriber.queue.get_nowait()
+        subscriber.resyncs += 1
+        subscriber.put({"type": "snapshot", "data": copy.deepcopy(self.snapshot)})
+
+    async def poll_once(self) -> Dict[str, Any]:
+        """Fetch the live panels once and broadcast what changed since the last poll"""
+        latest = await self.data_service.get_dashboard(fields=LIVE_FIELDS)
+        changes = diff_snapshots(self.snapshot, latest)
+        first_poll = not self.snapshot
+        self.snapshot = latest
+        if first_poll:
+            self.publish({"type": "snapshot", "data": latest})
+        elif changes:
+            self.publish({"type": "update", "data": changes})
+        return changes
+
+    async def _poll_loop(self) -> None:
+        while True:
+            try:
+                await self.poll_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Live update poll failed: {e}")
+            await asyncio.sleep(self.interval)
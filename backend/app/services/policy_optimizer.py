@@ -0,0 +1,182 @@
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from scipy.optimize import lsq_linear
+from statsmodels.tsa.vector_ar.var_model import VARResults
+from typing import Dict, Optional, Sequence, Tuple
+
+from app.services.economic_model import covariance_root, stacked_var_coefs
+
+OPTIMIZER_METHODS = ("analytic", "cem")
+
+def _cem_restart(args: Tuple["PolicyOptimizer", np.ndarray, float, int, int, float, int]) -> Tuple[np.ndarray, float]:
+    """One cross-entropy search from ``start``; module level so it can run in a worker process"""
+    optimizer, start, spread, n_candidates, n_iter, elite_frac, seed = args
+    rng = np.random.default_rng(seed)
+    low, high = optimizer.bounds
+    mean = start.astype(np.float64)
+    std = np.full_like(mean, spread)
+    n_elite = max(2, int(n_candidates * elite_frac))
+    best_path, best_loss = mean.copy(), float(optimizer.loss(mean[None])[0])
+    for _ in range(n_iter):
+        candidates = np.clip(mean + std * rng.standard_normal((n_candidates, len(mean))), low, high)
+        losses = optimizer.loss(candidates)
+        elite = candidates[np.argsort(losses)[:n_elite]]
+        if losses.min() < best_loss:
+            best_loss, best_path = float(losses.min()), candidates[np.argmin(losses)].copy()
+        mean, std = elite.mean(axis=0), elite.std(axis=0) + 1e-3
+    return best_path, best_loss
+
+class PolicyOptimizer:
+    """Search policy-rate paths that keep VAR-simulated outcomes close to their targets
+
+    The policy variable is treated as controlled: its simulated value is
+    replaced by the candidate path at every step, and the other variables
+    follow the fitted VAR dynamics. The loss is
+
+        sum_t discount^t * (sum_v weight_v * (x_{t,v} - target_v)^2 + smoothing * (r_t - r_{t-1})^2)
+
+    and is evaluated for a whole batch of candidate paths at once. Holds
+    only NumPy arrays, so instances are cheap to send to worker processes.
+    """
+
+    def __init__(self,
+                 coefs: np.ndarray,
+                 history: np.ndarray,
+                 sigma_u: np.ndarray,
+                 names: Sequence[str],
+                 policy: str,
+                 targets: Dict[str, float],
+                 weights: Optional[Dict[str, float]] = None,
+                 smoothing: float = 0.1,
+                 discount: float = 1.0,
+                 bounds: Tuple[float, float] = (0.0, 10.0)):
+        self.names = list(names)
+        k = len(self.names)
+        self.lags = (coefs.shape[0] - 1) // k
+        if self.lags == 0:
+            raise ValueError("Policy optimisation needs a VAR with at least one lag")
+        if not targets:
+            raise ValueError("At least one target is needed")
+        unknown = [name for name in [policy, *targets] if name not in self.names]
+        if unknown:
+            raise ValueError(f"Unknown model variables: {', '.join(unknown)}")
+        self.coefs = np.asarray(coefs, dtype=np.float64)
+        self.history = np.asarray(history, dtype=np.float64)[-self.lags:]
+        # Eigen-based root: a singular residual covariance is valid input, Cholesky would reject it
+        self.shock_root = covariance_root(np.asarray(sigma_u, dtype=np.float64))
+        self.policy = self.names.index(policy)
+        self.target_index = np.array([self.names.index(name) for name in targets], dtype=int)
+        self.target_values = np.array(list(targets.values()), dtype=np.float64)
+        weights = weights or {}
+        self.target_weights = np.array([weights.get(name, 1.0) for name in targets], dtype=np.float64)
+        self.smoothing = smoothing
+        self.discount = discount
+        self.bounds = bounds
+
+    @classmethod
+    def from_var(cls, model: VARResults, policy: str, targets: Dict[str, float], **kwargs) -> "PolicyOptimizer":
+        return cls(stacked_var_coefs(model), np.asarray(model.endog), np.asarray(model.sigma_u),
+                   model.names, policy, targets, **kwargs)
+
+    def simulate(self, rate_paths: np.ndarray, shocks: Optional[np.ndarray] = None) -> np.ndarray:
+        """Outcomes (paths, horizon, variables) under each rate path, with optional shocks"""
+        rate_paths = np.atleast_2d(rate_paths)
+        n_paths, horizon = rate_paths.shape
+        k = len(self.names)
+        window = np.tile(self.history[::-1].reshape(1, -1), (n_paths, 1))
+        outcomes = np.empty((n_paths, horizon, k))
+        for step in range(horizon):
+            outcomes[:, step] = self.coefs[0] + window @ self.coefs[1:]
+            if shocks is not None:
+                outcomes[:, step] += shocks[:, step]
+            outcomes[:, step, self.policy] = rate_paths[:, step]
+            window[:, k:] = window[:, :-k].copy()
+            window[:, :k] = outcomes[:, step]
+        return outcomes
+
+    def _discounts(self, horizon: int) -> np.ndarray:
+        return self.discount ** np.arange(horizon)
+
+    def loss(self, rate_paths: np.ndarray) -> np.ndarray:
+        """Loss of every candidate path in one vectorised pass"""
+        rate_paths = np.atleast_2d(rate_paths)
+        outcomes = self.simulate(rate_paths)
+        gaps = outcomes[:, :, self.target_index] - self.target_values
+        changes = np.diff(rate_paths, axis=1, prepend=self.history[-1, self.policy])
+        per_step = (gaps ** 2 * self.target_weights).sum(axis=2) + self.smoothing * changes ** 2
+        return per_step @ self._discounts(rate_paths.shape[1])
+
+    def _optimize_analytic(self, horizon: int) -> np.ndarray:
+        """Exact bounded least squares: outcomes are affine in the rate path under a linear VAR"""
+        # Responses to the zero path and to a unit rate in each period give the affine map x = x0 + G r
+        unit_paths = np.vstack([np.zeros(horizon), np.eye(horizon)])
+        outcomes = self.simulate(unit_paths)[:, :, self.target_index]
+        baseline = outcomes[0]
+        response = (outcomes[1:] - baseline).transpose(1, 2, 0)  # (horizon, targets, rate periods)
+
+        scale = np.sqrt(self._discounts(horizon)[:, None] * self.target_weights[None, :])
+        a_targets = (response * scale[:, :, None]).reshape(-1, horizon)
+        b_targets = ((self.target_values - baseline) * scale).reshape(-1)
+
+        # Smoothing rows penalise r_t - r_{t-1}, with r_0 the last observed rate
+        diff = np.eye(horizon) - np.eye(horizon, k=-1)
+        smooth = np.sqrt(self.smoothing * self._discounts(horizon))[:, None]
+        b_smooth = np.zeros(horizon)
+        b_smooth[0] = self.history[-1, self.policy]
+        a = np.vstack([a_targets, diff * smooth])
+        b = np.concatenate([b_targets, b_smooth * smooth[:, 0]])
+        return lsq_linear(a, b, bounds=self.bounds).x
+
+    def optimize(self,
+                 horizon: int = 12,
+                 method: str = "analytic",
+                 n_candidates: int = 512,
+                 n_iter: int = 40,
+                 n_restarts: int = 4,
+                 n_jobs: Optional[int] = 1,
+                 seed: int = 0) -> Dict:
+        """Find the loss-minimising rate path over ``horizon`` periods
+
+        ``analytic`` solves the quadratic problem exactly within ``bounds``.
+        ``cem`` is a gradient-free cross-entropy search that evaluates
+        ``n_candidates`` paths per iteration in one batch; its ``n_restarts``
+        independent runs are spread over ``n_jobs`` processes (``None`` for
+        all cores) and the best result wins.
+        """
+        if method not in OPTIMIZER_METHODS:
+            raise ValueError(f"Unknown method '{method}', expected one of {OPTIMIZER_METHODS}")
+
+        hold = np.full(horizon, self.history[-1, self.policy])
+        if method == "analytic":
+            path = self._optimize_analytic(horizon)
+        else:
+            seeds = np.random.SeedSequence(seed).generate_state(n_restarts)
+            tasks = [(self, hold, 1.0, n_candidates, n_iter, 0.1, int(s)) for s in seeds]
+            n_jobs = min(n_jobs or os.cpu_count() or 1, n_restarts)
+            if n_jobs == 1:
+                results = [_cem_restart(task) for task in tasks]
+            else:
+                with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+                    results = list(executor.map(_cem_restart, tasks))
+            path = min(results, key=lambda result: result[1])[0]
+
+        return {
+            "policy_path": path,
+            "loss": float(self.loss(path[None])[0]),
+            "hold_loss": float(self.loss(hold[None])[0]),
+            "expected": self.simulate(path[None])[0]
+        }
+
+    def fan_chart(self,
+                  rate_path: np.ndarray,
+                  n_sims: int = 2000,
+                  percentiles: Sequence[float] = (5, 25, 50, 75, 95),
+                  seed: int = 0) -> Dict[str, np.ndarray]:
+        """Percentiles of outcomes under ``rate_path`` with Gaussian VAR shocks, per variable"""
+        rng = np.random.default_rng(seed)
+        horizon = len(rate_path)
+        shocks = rng.standard_normal((n_sims, horizon, len(self.names))) @ self.shock_root.T
+        simulations = self.simulate(np.tile(rate_path, (n_sims, 1)), shocks=shocks)
+        bands = np.percentile(simulations, percentiles, axis=0)  # (percentiles, horizon, variables)
+        return {name: bands[:, :, i] for i, name in enumerate(self.names)}
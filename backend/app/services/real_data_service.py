@@ -1,4 +1,6 @@
 import os
+import copy
+import hashlib
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
@@ -6,15 +8,70 @@ from typing import Dict, List, Optional, Tuple
 import requests
 import aiohttp
 import asyncio
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
 from fredapi import Fred
 import yfinance as yf
 from alpha_vantage.timeseries import TimeSeries
 import logging
 
+from app.core.config import settings
+from app.services.backtesting import trend_forecast
+from app.services.economic_model import EconomicModelService
+from app.services.policy_optimizer import PolicyOptimizer
+from statsmodels.tsa.vector_ar.var_model import VARResults
+
 logger = logging.getLogger(__name__)
 
+# Pandas offset aliases accepted by get_panel_data
+PANEL_FREQUENCIES = {"D": "D", "W": "W", "M": "MS", "Q": "QS", "A": "YS"}
+
+DEFAULT_MARKET_SYMBOLS = ["^GSPC", "^DJI", "^IXIC", "^TNX"]  # S&P 500, Dow, NASDAQ, 10-Year Treasury
+
+# Upstream data each dashboard panel reads: FRED series, market symbols and FRED lookback in years
+DASHBOARD_PANELS = {
+    "indicators": {"fred": ["GDPC1", "CPIAUCSL", "UNRATE", "FEDFUNDS"], "market": [], "years": 10},
+    "forecast": {"fred": ["GDP", "CPIAUCSL"], "market": [], "years": 20},
+    "risks": {"fred": ["GDP", "CPIAUCSL", "FEDFUNDS"], "market": ["^GSPC"], "years": 20},
+    "market_data": {"fred": [], "market": DEFAULT_MARKET_SYMBOLS, "years": 0},
+}
+
+# Adverse outcomes whose simulated probability get_tail_risk reports, per forecast variable
+TAIL_RISK_THRESHOLDS = {
+    "GDP Growth": [("<", 0.0)],
+    "Inflation": [(">", 4.0)],
+}
+
+# Confidence levels of the VaR/ES reported by get_tail_risk
+TAIL_RISK_LEVELS = (0.95, 0.99)
+
+# Data fetched once by get_dashboard and shared by the panels it computes concurrently
+_prefetched_fred: ContextVar[Optional[Dict[str, Optional[pd.Series]]]] = ContextVar("prefetched_fred", default=None)
+_prefetched_market: ContextVar[Optional[Dict[str, pd.DataFrame]]] = ContextVar("prefetched_market", default=None)
+
 class RealDataService:
-    def __init__(self):
+    # Seconds an aligned panel stays in the in-process cache
+    PANEL_CACHE_TTL = 900
+    # Panels kept at once; the least recently used is evicted beyond this
+    PANEL_CACHE_SIZE = 64
+    # Longest horizon served by get_forecast_data; one path this long is fitted per vintage
+    MAX_FORECAST_PERIODS = 24
+    # Longest interest-rate path, in months, searched by optimize_policy
+    MAX_POLICY_HORIZON = 60
+
+    def __init__(self, model_service: Optional[EconomicModelService] = None):
+        self.model_service = model_service or EconomicModelService()
+        self._panel_cache: "OrderedDict[Tuple, Tuple[float, pd.DataFrame]]" = OrderedDict()
+        self._forecast_vintage: Optional[str] = None
+        self._forecast_path: Optional[Tuple[np.ndarray, str]] = None
+        self._forecast_model: Optional[VARResults] = None
+        self._forecast_cache: Dict[Tuple[str, int], Dict] = {}
+        self._bands_cache: Dict[Tuple[str, float], Dict[str, np.ndarray]] = {}
+        self._tail_risk: Optional[Tuple[str, Dict]] = None
+        self._tail_risk_lock = asyncio.Lock()
+        self._forecast_lock = asyncio.Lock()
+
         # Initialize APIs - you'll need to set these environment variables
         self.fred_api_key = os.getenv("FRED_API_KEY", "demo_key")
         self.alpha_vantage_key = os.getenv("ALPHA_VANTAGE_API_KEY", "demo_key")
@@ -173,85 +230,270 @@ class RealDataService:
         return indicators
 
     async def get_forecast_data(self, periods: int = 12) -> Dict:
-        """Generate forecast data based on historical trends"""
+        """Forecast GDP growth and inflation from a model fitted once per data vintage
+
+        The vintage is a hash of the quarterly GDP/CPI history. The first
+        request for a vintage fits a VAR on it (falling back to a linear
+        trend extrapolation when the VAR cannot be fitted); later requests are served from
+        a memo keyed by (vintage, periods). Output is deterministic and carries
+        the vintage so the API layer can use it as an ETag.
+        """
+        try:
+            vintage, history = await self._refresh_forecast_model()
+            cache_key = (vintage, periods)
+            forecast_data = self._forecast_cache.get(cache_key)
+            
+            if forecast_data is None:
+                path, model_name = self._forecast_path
+                
+                last_quarter = history.index[-1].to_period("Q")
+                forecast_data = {
+                    "labels": [f"Q{q.quarter} {q.year}" for q in (last_quarter + i for i in range(1, periods + 1))],
+                    "datasets": [
+                        {
+                            "label": "GDP Growth",
+                            "data": [round(float(v), 1) for v in path[:periods, 0]],
+                            "borderColor": "rgb(75, 192, 192)",
+                            "tension": 0.1
+                        },
+                        {
+                            "label": "Inflation",
+                            "data": [round(float(v), 1) for v in path[:periods, 1]],
+                            "borderColor": "rgb(255, 99, 132)",
+                            "tension": 0.1
+                        }
+                    ],
+                    "model": model_name,
+                    "vintage": vintage
+                }
+                self._forecast_cache[cache_key] = forecast_data
+
+        except Exception as e:
+            logger.error(f"Error generating forecast data: {e}")
+            forecast_data = self._get_fallback_forecast(periods)
+
+        # Callers decorate the payload (e.g. confidence bands), so never hand out the memoized dict
+        return copy.deepcopy(forecast_data)
+
+    async def get_forecast_bands(self, periods: int = 12, level: float = 0.95) -> Optional[Dict]:
+        """Bootstrap confidence bands around get_forecast_data's VAR forecast
+
+        Bands are simulated once per data vintage for the longest horizon and
+        sliced per request, so only the first call after new data pays for the
+        bootstrap. Returns None when the current forecaster is not a VAR.
+        """
         try:
-            # Fetch historical data for multiple indicators
-            gdp_data = await self._fetch_fred_data("GDP", limit=40)
-            cpi_data = await self._fetch_fred_data("CPIAUCSL", limit=40)
+            vintage, _ = await self._refresh_forecast_model()
+            model = self._forecast_model
+            if model is None:
+                return None
+            
+            cache_key = (vintage, level)
+            bands = self._bands_cache.get(cache_key)
+            if bands is None:
+                # CPU-bound; keep it off the event loop
+                bands = await asyncio.to_thread(
+                    self.model_service.bootstrap_forecast,
+                    model,
+                    steps=self.MAX_FORECAST_PERIODS,
+                    alpha=1 - level
+                )
+                self._bands_cache[cache_key] = bands
             
-            forecast_data = {
-                "labels": [],
-                "datasets": []
+            names = list(model.names)
+            return {
+                "vintage": vintage,
+                "level": level,
+                "lower": {name: bands["lower_ci"][:periods, i].round(1).tolist() for i, name in enumerate(names)},
+                "upper": {name: bands["upper_ci"][:periods, i].round(1).tolist() for i, name in enumerate(names)}
             }
+        except Exception as e:
+            logger.error(f"Error computing forecast bands: {e}")
+            return None
+
+    async def get_tail_risk(self, horizon: int = 4) -> Optional[Dict]:
+        """VaR, Expected Shortfall and threshold exceedance over ``horizon`` quarters
+
+        ``TAIL_RISK_PATHS`` paths are simulated from the forecast VAR once per
+        data vintage over the longest supported horizon; every shorter
+        horizon is a slice of that one simulation. Returns None when the
+        current forecaster is not a VAR.
+        """
+        if not 1 <= horizon <= self.MAX_FORECAST_PERIODS:
+            raise ValueError(f"horizon must be between 1 and {self.MAX_FORECAST_PERIODS}")
+        try:
+            vintage, _ = await self._refresh_forecast_model()
+            model = self._forecast_model
+            if model is None:
+                return None
             
-            # Generate quarterly labels for the next periods
-            current_date = datetime.now()
-            for i in range(periods):
-                quarter_date = current_date + timedelta(days=90*i)
-                quarter = f"Q{((quarter_date.month-1)//3)+1} {quarter_date.year}"
-                forecast_data["labels"].append(quarter)
+            # Concurrent first requests for a vintage wait for one simulation instead of each running it
+            async with self._tail_risk_lock:
+                if self._tail_risk is None or self._tail_risk[0] != vintage:
+                    thresholds = {name: rules for name, rules in TAIL_RISK_THRESHOLDS.items() if name in model.names}
+                    # CPU-bound; keep it off the event loop
+                    metrics = await asyncio.to_thread(
+                        self.model_service.simulate_tail_risk,
+                        model,
+                        n_paths=settings.TAIL_RISK_PATHS,
+                        forecast_steps=self.MAX_FORECAST_PERIODS,
+                        levels=TAIL_RISK_LEVELS,
+                        thresholds=thresholds
+                    )
+                    self._tail_risk = (vintage, metrics)
+                metrics = self._tail_risk[1]
             
-            # GDP Growth forecast
-            if gdp_data is not None and len(gdp_data) >= 8:
-                gdp_growth_rates = []
-                for i in range(1, len(gdp_data)):
-                    growth = ((gdp_data.iloc[i] / gdp_data.iloc[i-1]) ** 4 - 1) * 100
-                    gdp_growth_rates.append(growth)
-                
-                # Simple trend-based forecast
-                recent_avg = np.mean(gdp_growth_rates[-4:])  # Last 4 quarters
-                trend = np.polyfit(range(len(gdp_growth_rates[-8:])), gdp_growth_rates[-8:], 1)[0]
-                
-                gdp_forecast = []
-                for i in range(periods):
-                    forecast_value = recent_avg + (trend * i)
-                    # Add some realistic variation
-                    forecast_value += np.random.normal(0, 0.3)
-                    gdp_forecast.append(round(forecast_value, 1))
-                
-                forecast_data["datasets"].append({
-                    "label": "GDP Growth",
-                    "data": gdp_forecast,
-                    "borderColor": "rgb(75, 192, 192)",
-                    "tension": 0.1
-                })
+            def rounded(values: np.ndarray) -> List[float]:
+                return np.round(values[:horizon], 2).tolist()
+            
+            return {
+                "vintage": vintage,
+                "model": f"VAR({model.k_ar})",
+                "horizon": horizon,
+                "n_paths": settings.TAIL_RISK_PATHS,
+                "levels": list(TAIL_RISK_LEVELS),
+                "variables": {
+                    name: {
+                        "mean": rounded(m["mean"]),
+                        "lower": {q: {"var": rounded(t["var"]), "es": rounded(t["es"])} for q, t in m["lower"].items()},
+                        "upper": {q: {"var": rounded(t["var"]), "es": rounded(t["es"])} for q, t in m["upper"].items()},
+                        "exceedance": [
+                            {
+                                "operator": e["operator"],
+                                "threshold": e["threshold"],
+                                "by_step": np.round(e["by_step"][:horizon], 4).tolist(),
+                                "within_horizon": round(float(e["within_horizon"][horizon - 1]), 4)
+                            }
+                            for e in m["exceedance"]
+                        ]
+                    }
+                    for name, m in metrics.items()
+                }
+            }
+        except Exception as e:
+            logger.error(f"Error computing tail risk: {e}")
+            return None
 
-            # Inflation forecast
-            if cpi_data is not None and len(cpi_data) >= 24:
-                inflation_rates = []
-                for i in range(12, len(cpi_data)):
-                    inflation = ((cpi_data.iloc[i] / cpi_data.iloc[i-12]) - 1) * 100
-                    inflation_rates.append(inflation)
-                
-                recent_avg = np.mean(inflation_rates[-6:])  # Last 6 months
-                trend = np.polyfit(range(len(inflation_rates[-12:])), inflation_rates[-12:], 1)[0]
-                
-                inflation_forecast = []
-                for i in range(periods):
-                    forecast_value = recent_avg + (trend * i * 0.1)  # Slower trend change
-                    forecast_value += np.random.normal(0, 0.2)
-                    inflation_forecast.append(round(forecast_value, 1))
-                
-                forecast_data["datasets"].append({
-                    "label": "Inflation",
-                    "data": inflation_forecast,
-                    "borderColor": "rgb(255, 99, 132)",
-                    "tension": 0.1
-                })
+    async def _refresh_forecast_model(self) -> Tuple[str, pd.DataFrame]:
+        """Current data vintage and history; refits the forecaster when the vintage changes"""
+        history = await self._get_forecast_history()
+        if history is None:
+            raise ValueError("GDP/CPI history unavailable")
+        
+        vintage = hashlib.sha1(
+            history.index.asi8.tobytes() + history.to_numpy().tobytes()
+        ).hexdigest()[:16]
+        if vintage != self._forecast_vintage:
+            # One refit per vintage however many requests arrive while it runs
+            async with self._forecast_lock:
+                if vintage != self._forecast_vintage:
+                    # CPU-bound; keep it off the event loop
+                    fitted = await asyncio.to_thread(self._fit_forecast_model, history)
+                    # New data: drop everything memoized for the previous vintage
+                    self._forecast_cache.clear()
+                    self._bands_cache.clear()
+                    self._tail_risk = None
+                    self._forecast_model, self._forecast_path = fitted
+                    self._forecast_vintage = vintage
+        return vintage, history
+
+    async def _get_forecast_history(self) -> Optional[pd.DataFrame]:
+        """Quarterly annualized GDP growth and year-over-year CPI inflation"""
+        panel = await self.get_panel_data(["GDP", "CPIAUCSL"], freq="Q", years=20)
+        if panel is None or set(panel.columns) != {"GDP", "CPIAUCSL"}:
+            return None
+        
+        history = pd.DataFrame({
+            "GDP Growth": ((panel["GDP"] / panel["GDP"].shift(1)) ** 4 - 1) * 100,
+            "Inflation": (panel["CPIAUCSL"] / panel["CPIAUCSL"].shift(4) - 1) * 100
+        }).dropna()
+        return history if len(history) >= 8 else None
 
+    def _fit_forecast_model(self, history: pd.DataFrame) -> Tuple[Optional[VARResults], Tuple[np.ndarray, str]]:
+        """Fit the forecaster for one vintage; returns the VAR (if any) and its longest forecast path"""
+        try:
+            # No outlier clipping: the latest quarter is the forecast origin and must be served as observed
+            prepared = self.model_service.prepare_data(history, outliers="none")
+            results = self.model_service.train_var_model(prepared, maxlags=4)
+            if results.k_ar == 0:
+                path = np.tile(results.params[0], (self.MAX_FORECAST_PERIODS, 1))
+                return None, (path, "VAR(0)")
+            path = results.forecast(results.endog[-results.k_ar:], steps=self.MAX_FORECAST_PERIODS)
+            return results, (path, f"VAR({results.k_ar})")
         except Exception as e:
-            logger.error(f"Error generating forecast data: {e}")
-            forecast_data = self._get_fallback_forecast(periods)
+            logger.warning(f"VAR forecast failed, using trend extrapolation: {e}")
+            return None, (trend_forecast(history.to_numpy(), self.MAX_FORECAST_PERIODS), "trend")
+
+    async def get_policy_history(self) -> Optional[pd.DataFrame]:
+        """Monthly policy rate, year-over-year CPI inflation and unemployment"""
+        panel = await self.get_panel_data(["FEDFUNDS", "CPIAUCSL", "UNRATE"], freq="M", years=20)
+        if panel is None or set(panel.columns) != {"FEDFUNDS", "CPIAUCSL", "UNRATE"}:
+            return None
+        
+        history = pd.DataFrame({
+            "Interest Rate": panel["FEDFUNDS"],
+            "Inflation": (panel["CPIAUCSL"] / panel["CPIAUCSL"].shift(12) - 1) * 100,
+            "Unemployment": panel["UNRATE"]
+        }).dropna()
+        return history if len(history) >= 36 else None
+
+    async def optimize_policy(self,
+                              targets: Dict[str, float],
+                              weights: Optional[Dict[str, float]] = None,
+                              horizon: int = 12,
+                              smoothing: float = 0.1,
+                              bounds: Tuple[float, float] = (0.0, 10.0),
+                              method: str = "analytic",
+                              n_sims: int = 2000) -> Dict:
+        """Optimal interest-rate path over ``horizon`` months with its simulated fan chart"""
+        if not 1 <= horizon <= self.MAX_POLICY_HORIZON:
+            raise ValueError(f"horizon must be between 1 and {self.MAX_POLICY_HORIZON} months")
+        history = await self.get_policy_history()
+        if history is None:
+            raise ValueError("Policy rate/CPI/unemployment history unavailable")
+        
+        def solve() -> Dict:
+            prepared = self.model_service.prepare_data(history, outliers="none")
+            model = self.model_service.train_var_model(prepared, maxlags=6)
+            optimizer = PolicyOptimizer.from_var(model, "Interest Rate", targets, weights=weights,
+                                                 smoothing=smoothing, bounds=bounds)
+            # In-process: a request must not fork a pool of every core from a server worker thread
+            result = optimizer.optimize(horizon, method=method, n_jobs=1)
+            fan = optimizer.fan_chart(result["policy_path"], n_sims=n_sims)
+            return {"model": f"VAR({model.k_ar})", **result, "fan_chart": fan}
+        
+        # CPU-bound; keep it off the event loop
+        result = await asyncio.to_thread(solve)
+        last = history.index[-1]
+        labels = [(last + pd.DateOffset(months=i)).strftime("%Y-%m") for i in range(1, horizon + 1)]
+        return {
+            "labels": labels,
+            "model": result["model"],
+            "targets": targets,
+            "policy_path": result["policy_path"].round(2).tolist(),
+            "loss": round(result["loss"], 3),
+            "hold_loss": round(result["hold_loss"], 3),
+            "expected": {name: result["expected"][:, i].round(2).tolist() for i, name in enumerate(history.columns)},
+            "fan_chart": {
+                name: {f"p{p}": band.round(2).tolist() for p, band in zip((5, 25, 50, 75, 95), bands)}
+                for name, bands in result["fan_chart"].items()
+            }
+        }
 
-        return forecast_data
+    async def get_risk_assessments(self, tail_risk: Optional[Dict] = None) -> List[Dict]:
+        """Get real-time risk assessments based on current economic conditions
 
-    async def get_risk_assessments(self) -> List[Dict]:
-        """Get real-time risk assessments based on current economic conditions"""
+        ``tail_risk`` is a year-ahead (4 quarter) get_tail_risk result; it is
+        fetched when not supplied.
+        """
         risks = []
         
         try:
+            if tail_risk is None:
+                tail_risk = await self.get_tail_risk(horizon=4)
+            
             # Market volatility risk (using VIX-like calculation)
-            sp500 = yf.download("^GSPC", period="3mo", interval="1d")
+            sp500 = await self._fetch_market_history("^GSPC", period="3mo")
             if not sp500.empty:
                 returns = sp500['Close'].pct_change().dropna()
                 volatility = returns.std() * np.sqrt(252) * 100  # Annualized volatility
@@ -274,7 +516,10 @@ class RealDataService:
                 current_inflation = ((cpi_data.iloc[-1] / cpi_data.iloc[-13]) - 1) * 100
                 
                 risk_level = "High" if current_inflation > 5 else "Medium" if current_inflation > 3 else "Low"
-                probability = min(0.9, current_inflation / 6)
+                # Simulated chance of inflation above 4% within a year, when the VAR is available
+                probability = self._exceedance_probability(tail_risk, "Inflation")
+                if probability is None:
+                    probability = min(0.9, current_inflation / 6)
                 impact = min(0.9, current_inflation / 5)
                 
                 risks.append({
@@ -303,33 +548,70 @@ class RealDataService:
                     "description": f"Recent rate changes indicate {risk_level.lower()} volatility risk"
                 })
 
+            # Recession risk from the simulated GDP growth distribution
+            recession_probability = self._exceedance_probability(tail_risk, "GDP Growth")
+            if recession_probability is not None:
+                gdp = tail_risk["variables"]["GDP Growth"]
+                shortfall = gdp["lower"]["95"]["es"][-1]
+                risk_level = "High" if recession_probability > 0.3 else "Medium" if recession_probability > 0.15 else "Low"
+                
+                risks.append({
+                    "title": "Recession Risk",
+                    "level": risk_level,
+                    "probability": round(recession_probability, 2),
+                    "impact": round(min(0.9, max(0.0, -shortfall) / 5), 2),
+                    "description": f"{recession_probability:.0%} chance of a negative growth quarter within a year; "
+                                   f"in the worst 5% of outcomes growth averages {shortfall:.1f}%"
+                })
+
         except Exception as e:
             logger.error(f"Error calculating risk assessments: {e}")
             risks = self._get_fallback_risks()
 
         return risks
 
-    async def _fetch_fred_data(self, series_id: str, limit: int = 100) -> Optional[pd.Series]:
+    @staticmethod
+    def _exceedance_probability(tail_risk: Optional[Dict], variable: str) -> Optional[float]:
+        """Probability that ``variable`` crosses its first TAIL_RISK_THRESHOLDS rule within the horizon"""
+        if tail_risk is None or variable not in tail_risk["variables"]:
+            return None
+        exceedance = tail_risk["variables"][variable]["exceedance"]
+        return exceedance[0]["within_horizon"] if exceedance else None
+
+    async def _fetch_fred_data(self, series_id: str, limit: Optional[int] = 100, years: int = 10) -> Optional[pd.Series]:
         """Fetch data from FRED API"""
         if not self.fred:
             print(f"❌ FRED API not initialized for {series_id}")
             return None
+        
+        # Get recent data using proper FRED API parameters
+        end_date = datetime.now()
+        start_date = end_date - timedelta(days=365*years)  # Default 10 years to ensure we have enough data
+        
+        prefetched = _prefetched_fred.get()
+        if prefetched is not None and series_id in prefetched:
+            data = prefetched[series_id]
+            if data is None:
+                return None
+            data = data[data.index >= start_date]
+            if limit is not None:
+                data = data.tail(limit)
+            return data if len(data) > 0 else None
             
         try:
             print(f"🔍 Fetching FRED data for {series_id} (limit: {limit})")
             
-            # Get recent data using proper FRED API parameters
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=365*10)  # Last 10 years to ensure we have enough data
-            
             # Use proper FRED API parameters
-            data = self.fred.get_series(
-                series_id, 
-                observation_start=start_date.strftime('%Y-%m-%d'),
-                observation_end=end_date.strftime('%Y-%m-%d'),
-                limit=limit,
-                sort_order='desc'  # Most recent first
-            )
+            params = {
+                "observation_start": start_date.strftime('%Y-%m-%d'),
+                "observation_end": end_date.strftime('%Y-%m-%d'),
+                "sort_order": 'desc'  # Most recent first
+            }
+            if limit is not None:
+                params["limit"] = limit
+            
+            # fredapi is blocking; run it in a worker thread so concurrent fetches overlap
+            data = await asyncio.to_thread(self.fred.get_series, series_id, **params)
             
             if data is not None and len(data) > 0:
                 # Sort by date ascending (oldest first) for proper indexing
@@ -345,6 +627,72 @@ class RealDataService:
             print(f"❌ Error fetching {series_id}: {str(e)}")
             return None
 
+    async def get_panel_data(self,
+                             series_ids: List[str],
+                             freq: str = "Q",
+                             years: int = 10,
+                             use_cache: bool = True) -> Optional[pd.DataFrame]:
+        """Fetch several FRED series concurrently and align them into one float64 panel
+
+        Every series is resampled to ``freq`` (one of D/W/M/Q/A): higher-frequency
+        series are averaged over each period, lower-frequency series are carried
+        forward. The result covers only the window where all series overlap, has
+        no missing values and is backed by a single contiguous float64 block, so
+        it can be passed straight to ``EconomicModelService.train_var_model``.
+        Returns None, without caching, unless every series could be fetched.
+        """
+        if freq not in PANEL_FREQUENCIES:
+            raise ValueError(f"Unsupported panel frequency '{freq}', expected one of {list(PANEL_FREQUENCIES)}")
+        
+        # Preserve caller order but drop duplicates
+        series_ids = list(dict.fromkeys(series_ids))
+        cache_key = (tuple(series_ids), freq, years)
+        
+        if use_cache:
+            cached = self._panel_cache.get(cache_key)
+            if cached is not None and time.monotonic() - cached[0] < self.PANEL_CACHE_TTL:
+                self._panel_cache.move_to_end(cache_key)
+                return cached[1]
+        
+        results = await asyncio.gather(
+            *(self._fetch_fred_data(series_id, limit=None, years=years) for series_id in series_ids)
+        )
+        series = {series_id: data for series_id, data in zip(series_ids, results) if data is not None}
+        
+        missing = [series_id for series_id in series_ids if series_id not in series]
+        if missing:
+            # A partial panel would be cached under the full request; let the next call retry instead
+            logger.warning(f"Panel missing series: {', '.join(missing)}")
+            return None
+        
+        panel = self._align_panel(series, PANEL_FREQUENCIES[freq])
+        if panel.empty:
+            logger.warning(f"Panel series have no overlapping observations at frequency {freq}")
+            return None
+        
+        self._panel_cache[cache_key] = (time.monotonic(), panel)
+        self._panel_cache.move_to_end(cache_key)
+        while len(self._panel_cache) > self.PANEL_CACHE_SIZE:
+            self._panel_cache.popitem(last=False)
+        return panel
+
+    @staticmethod
+    def _align_panel(series: Dict[str, pd.Series], rule: str) -> pd.DataFrame:
+        """Resample series to a common frequency and stack them into one contiguous block"""
+        columns = []
+        for data in series.values():
+            data = pd.to_numeric(data, errors="coerce").astype(np.float64)
+            data.index = pd.DatetimeIndex(data.index)
+            # Mean-aggregate when downsampling, carry forward when upsampling
+            columns.append(data.resample(rule).mean().ffill())
+        
+        aligned = pd.concat(columns, axis=1, join="inner")
+        aligned = aligned.dropna(how="any")
+        
+        # Rebuild from one 2-D array so pandas keeps a single consolidated block
+        values = aligned.to_numpy(dtype=np.float64, copy=True)
+        return pd.DataFrame(values, index=aligned.index, columns=list(series.keys()))
+
     def _get_fallback_indicators(self) -> Dict:
         """Fallback data when APIs are not available - Updated with realistic current values"""
         return {
@@ -362,17 +710,19 @@ class RealDataService:
             "datasets": [
                 {
                     "label": "GDP Growth",
-                    "data": [2.5 + np.random.normal(0, 0.3) for _ in range(periods)],
+                    "data": [2.5] * periods,
                     "borderColor": "rgb(75, 192, 192)",
                     "tension": 0.1
                 },
                 {
                     "label": "Inflation",
-                    "data": [3.2 + np.random.normal(0, 0.2) for _ in range(periods)],
+                    "data": [3.2] * periods,
                     "borderColor": "rgb(255, 99, 132)",
                     "tension": 0.1
                 }
-            ]
+            ],
+            "model": "fallback",
+            "vintage": "fallback"
         }
 
     def _get_fallback_risks(self) -> List[Dict]:
@@ -397,15 +747,13 @@ class RealDataService:
     async def get_market_data(self, symbols: List[str] = None) -> Dict:
         """Get real-time market data"""
         if symbols is None:
-            symbols = ["^GSPC", "^DJI", "^IXIC", "^TNX"]  # S&P 500, Dow, NASDAQ, 10-Year Treasury
+            symbols = DEFAULT_MARKET_SYMBOLS
         
         market_data = {}
         
         try:
-            for symbol in symbols:
-                ticker = yf.Ticker(symbol)
-                hist = ticker.history(period="5d")
-                
+            histories = await asyncio.gather(*(self._fetch_market_history(symbol, period="5d") for symbol in symbols))
+            for symbol, hist in zip(symbols, histories):
                 if not hist.empty:
                     current_price = hist['Close'].iloc[-1]
                     previous_price = hist['Close'].iloc[-2] if len(hist) > 1 else current_price
@@ -422,4 +770,62 @@ class RealDataService:
         except Exception as e:
             logger.error(f"Error fetching market data: {e}")
             
-        return market_data 
\ No newline at end of file
+        return market_data
+
+    async def _fetch_market_history(self, symbol: str, period: str = "5d") -> pd.DataFrame:
+        """Daily price history for a symbol over a yfinance period such as '5d' or '3mo'"""
+        prefetched = _prefetched_market.get()
+        if prefetched is not None and symbol in prefetched:
+            hist = prefetched[symbol]
+            if hist.empty:
+                return hist
+            if period.endswith("mo"):
+                return hist[hist.index >= hist.index[-1] - pd.DateOffset(months=int(period[:-2]))]
+            return hist.tail(int(period[:-1]))
+        
+        # yfinance is blocking; run it in a worker thread so concurrent fetches overlap
+        return await asyncio.to_thread(yf.Ticker(symbol).history, period=period)
+
+    async def get_dashboard(self, fields: Optional[List[str]] = None) -> Dict:
+        """Compute several dashboard panels in one pass over shared upstream data
+
+        The union of FRED series and market symbols needed by the selected
+        panels is fetched once, concurrently. The panels then run concurrently
+        against that shared data, so a series such as CPIAUCSL is requested
+        from FRED once instead of once per panel.
+        """
+        fields = list(DASHBOARD_PANELS) if not fields else list(dict.fromkeys(fields))
+        unknown = [field for field in fields if field not in DASHBOARD_PANELS]
+        if unknown:
+            raise ValueError(f"Unknown dashboard fields: {', '.join(unknown)}")
+        
+        fred_ids = list(dict.fromkeys(sid for field in fields for sid in DASHBOARD_PANELS[field]["fred"]))
+        symbols = list(dict.fromkeys(sym for field in fields for sym in DASHBOARD_PANELS[field]["market"]))
+        years = max(DASHBOARD_PANELS[field]["years"] for field in fields)
+        # Longest market window any panel reads; 3 months covers the 5-day quotes too
+        period = "3mo" if "risks" in fields else "5d"
+        
+        fred_results, market_results = await asyncio.gather(
+            asyncio.gather(*(self._fetch_fred_data(sid, limit=None, years=years) for sid in fred_ids)),
+            asyncio.gather(*(self._fetch_market_history(sym, period=period) for sym in symbols),
+                           return_exceptions=True)
+        )
+        
+        fred_token = _prefetched_fred.set(dict(zip(fred_ids, fred_results)))
+        market_token = _prefetched_market.set({
+            sym: hist for sym, hist in zip(symbols, market_results) if isinstance(hist, pd.DataFrame)
+        })
+        try:
+            panels = {
+                "indicators": self.get_economic_indicators,
+                "forecast": self.get_forecast_data,
+                "risks": self.get_risk_assessments,
+                "market_data": self.get_market_data,
+            }
+            # Tasks copy the current context, so every panel sees the prefetched data
+            results = await asyncio.gather(*(panels[field]() for field in fields))
+        finally:
+            _prefetched_fred.reset(fred_token)
+            _prefetched_market.reset(market_token)
+        
+        return dict(zip(fields, results))
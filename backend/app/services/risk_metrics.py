@@ -0,0 +1,127 @@
+import math
+import numpy as np
+from typing import Dict, List, Optional, Sequence, Tuple
+
+RISK_OPERATORS = (">", "<")
+
+def _tail_levels(level: float) -> str:
+    return f"{level * 100:g}"
+
+class TailRiskAccumulator:
+    """Value at Risk, Expected Shortfall and exceedance probabilities from simulated paths
+
+    Paths arrive in chunks of shape (paths, steps, variables), so the full
+    simulation never has to be held in memory. Both tails are tracked
+    exactly: for every step and variable only the ``m`` lowest and ``m``
+    highest values seen so far are kept (``m`` = the tail size of the lowest
+    confidence level at ``max_paths``), merged with each chunk by a linear
+    ``np.partition``. Exceedance counts and means are running sums; for each
+    threshold the step at which every path first crosses it is counted, so
+    the probability of crossing within any horizon up to ``steps`` is
+    available from one simulation.
+
+    For a level ``q`` over ``n`` paths and ``j = ceil((1 - q) * n)``, the lower
+    VaR is the j-th smallest value and the lower ES the mean of the j
+    smallest; the upper tail mirrors this with the largest values.
+    """
+
+    def __init__(self,
+                 names: Sequence[str],
+                 steps: int,
+                 max_paths: int,
+                 levels: Sequence[float] = (0.95, 0.99),
+                 thresholds: Optional[Dict[str, Sequence[Tuple[str, float]]]] = None):
+        self.names = list(names)
+        self.steps = steps
+        self.levels = sorted(levels)
+        self.tail_size = max(1, math.ceil((1 - self.levels[0]) * max_paths))
+        self.max_paths = max_paths
+        self.count = 0
+        self._sum = np.zeros((steps, len(self.names)))
+        # Retained tails, one row per (step, variable): partitioning along contiguous rows is much faster
+        self._lower = np.empty((steps * len(self.names), 0))
+        self._upper = np.empty((steps * len(self.names), 0))
+
+        self.thresholds: List[Tuple[int, str, float]] = []
+        for name, rules in (thresholds or {}).items():
+            if name not in self.names:
+                raise ValueError(f"Unknown variable '{name}' in thresholds")
+            for operator, value in rules:
+                if operator not in RISK_OPERATORS:
+                    raise ValueError(f"Unknown operator '{operator}', expected one of {RISK_OPERATORS}")
+                self.thresholds.append((self.names.index(name), operator, float(value)))
+        self._step_hits = np.zeros((len(self.thresholds), steps), dtype=np.int64)
+        self._first_hits = np.zeros((len(self.thresholds), steps), dtype=np.int64)
+
+    def update(self, paths: np.ndarray) -> None:
+        """Absorb a chunk of simulated paths (paths, steps, variables)"""
+        if paths.shape[1:] != self._sum.shape:
+            raise ValueError(f"Expected paths of shape (n, {self.steps}, {len(self.names)}), got {paths.shape}")
+        self.update_columns(paths.reshape(len(paths), -1).T)
+
+    def update_columns(self, columns: np.ndarray) -> None:
+        """Absorb a chunk laid out as (steps * variables, paths), step-major rows; avoids a transpose"""
+        k = len(self.names)
+        if columns.ndim != 2 or columns.shape[0] != self.steps * k:
+            raise ValueError(f"Expected columns of shape ({self.steps * k}, n), got {columns.shape}")
+        n = columns.shape[1]
+        if self.count + n > self.max_paths:
+            raise ValueError(f"More than max_paths={self.max_paths} paths supplied")
+        self.count += n
+        self._sum += columns.sum(axis=1).reshape(self.steps, k)
+
+        m = self.tail_size
+        lower = np.concatenate([self._lower, columns], axis=1)
+        self._lower = np.partition(lower, m - 1, axis=1)[:, :m] if lower.shape[1] > m else lower
+        upper = np.concatenate([self._upper, columns], axis=1)
+        self._upper = np.partition(upper, upper.shape[1] - m, axis=1)[:, -m:] if upper.shape[1] > m else upper
+
+        for i, (column, operator, value) in enumerate(self.thresholds):
+            series = columns[column::k]
+            hits = series > value if operator == ">" else series < value
+            self._step_hits[i] += hits.sum(axis=1)
+            crossed = hits.any(axis=0)
+            self._first_hits[i] += np.bincount(hits[:, crossed].argmax(axis=0), minlength=self.steps)
+
+    def result(self) -> Dict[str, Dict]:
+        """Metrics per variable; each array runs over the simulated steps"""
+        if self.count == 0:
+            raise ValueError("No paths have been accumulated")
+        # Sort only the retained tails: lower ascending, upper descending
+        shape = (-1, self.steps, len(self.names))
+        lower = np.sort(self._lower, axis=1).T.reshape(shape)
+        upper = -np.sort(-self._upper, axis=1).T.reshape(shape)
+        lower_cum = np.cumsum(lower, axis=0)
+        upper_cum = np.cumsum(upper, axis=0)
+
+        metrics: Dict[str, Dict] = {
+            name: {"mean": self._sum[:, i] / self.count, "lower": {}, "upper": {}, "exceedance": []}
+            for i, name in enumerate(self.names)
+        }
+        for level in self.levels:
+            j = max(1, math.ceil((1 - level) * self.count))
+            for i, name in enumerate(self.names):
+                metrics[name]["lower"][_tail_levels(level)] = {
+                    "var": lower[j - 1, :, i], "es": lower_cum[j - 1, :, i] / j
+                }
+                metrics[name]["upper"][_tail_levels(level)] = {
+                    "var": upper[j - 1, :, i], "es": upper_cum[j - 1, :, i] / j
+                }
+        for i, (column, operator, value) in enumerate(self.thresholds):
+            metrics[self.names[column]]["exceedance"].append({
+                "operator": operator,
+                "threshold": value,
+                "by_step": self._step_hits[i] / self.count,
+                # Entry h-1: probability of crossing at some step within the first h steps
+                "within_horizon": np.cumsum(self._first_hits[i]) / self.count
+            })
+        return metrics
+
+def tail_risk_metrics(simulations: np.ndarray,
+                      names: Sequence[str],
+                      levels: Sequence[float] = (0.95, 0.99),
+                      thresholds: Optional[Dict[str, Sequence[Tuple[str, float]]]] = None) -> Dict[str, Dict]:
+    """Tail metrics of a complete simulation array (paths, steps, variables) in one pass"""
+    accumulator = TailRiskAccumulator(names, simulations.shape[1], len(simulations), levels, thresholds)
+    accumulator.update(simulations)
+    return accumulator.result()
@@ -0,0 +1,184 @@
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.services.alerting import AlertEngine
+from app.services.real_data_service import RealDataService
+
+logger = logging.getLogger(__name__)
+
+# Longest FRED history pulled into the store
+HISTORY_YEARS = 60
+
+class SeriesStore:
+    """Local store of full series histories indexed by a sorted int64 date array
+
+    Each series is held as two aligned arrays (nanosecond timestamps, float64
+    values), kept in memory and persisted as ``<series_id>.npz`` under
+    ``root``. Range queries are two binary searches on the date array, so their
+    cost does not depend on how much history is stored. Series ids starting
+    with ``^`` are market symbols (Yahoo Finance daily closes); everything else
+    is a FRED series. When an ``alert_engine`` is attached, every stored
+    refresh is fed to it so rules on that series see the new observations,
+    and ``watch_alerts`` keeps the series that have rules refreshed in the
+    background. At most ``max_series`` series stay in memory and
+    ``max_files`` on disk (least recently used/written go first); ids that
+    upstream could not resolve are not retried for ``missing_ttl`` seconds.
+    """
+
+    def __init__(self,
+                 data_service: RealDataService,
+                 root: str,
+                 ttl: float = 6 * 3600,
+                 alert_engine: Optional[AlertEngine] = None,
+                 max_series: int = 256,
+                 max_files: int = 2048,
+                 missing_ttl: float = 300):
+        self.data_service = data_service
+        self.root = root
+        self.ttl = ttl
+        self.alert_engine = alert_engine
+        self.max_series = max_series
+        self.max_files = max_files
+        self.missing_ttl = missing_ttl
+        self._series: "OrderedDict[str, Tuple[float, np.ndarray, np.ndarray]]" = OrderedDict()
+        # Ids upstream failed to resolve -> time of the failure
+        self._missing: "OrderedDict[str, float]" = OrderedDict()
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._alert_task: Optional[asyncio.Task] = None
+
+    def _path(self, series_id: str) -> str:
+        safe_id = "".join(ch if ch.isalnum() or ch in "-_" else "_" for ch in series_id)
+        return os.path.join(self.root, f"{safe_id}.npz")
+
+    def put(self, series_id: str, data: pd.Series) -> None:
+        """Store a series, replacing any existing history"""
+        data = data.dropna()
+        data = data[~data.index.duplicated(keep="last")].sort_index()
+        dates = pd.DatetimeIndex(data.index).tz_localize(None).as_unit("ns").asi8.copy()
+        values = data.to_numpy(dtype=np.float64).copy()
+        os.makedirs(self.root, exist_ok=True)
+        with open(self._path(series_id), "wb") as handle:
+            np.savez(handle, dates=dates, values=values)
+        self._remember(series_id, (time.time(), dates, values))
+        self._prune_files()
+        if self.alert_engine is not None:
+            self.alert_engine.ingest(series_id, dates, values)
+
+    def _load(self, series_id: str) -> Optional[Tuple[float, np.ndarray, np.ndarray]]:
+        entry = self._series.get(series_id)
+        if entry is not None:
+            self._series.move_to_end(series_id)
+            return entry
+        path = self._path(series_id)
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as stored:
+            entry = (os.path.getmtime(path), stored["dates"], stored["values"])
+        self._remember(series_id, entry)
+        return entry
+
+    def _remember(self, series_id: str, entry: Tuple[float, np.ndarray, np.ndarray]) -> None:
+        self._series[series_id] = entry
+        self._series.move_to_end(series_id)
+        self._missing.pop(series_id, None)
+        while len(self._series) > self.max_series:
+            evicted, _ = self._series.popitem(last=False)
+            lock = self._locks.get(evicted)
+            if lock is not None and not lock.locked():
+                del self._locks[evicted]
+
+    def _prune_files(self) -> None:
+        """Delete the least recently written files beyond ``max_files``"""
+        files = [entry for entry in os.scandir(self.root) if entry.name.endswith(".npz")]
+        if len(files) <= self.max_files:
+            return
+        files.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in files[:len(files) - self.max_files]:
+            os.remove(entry.path)
+
+    def _recently_missing(self, series_id: str) -> bool:
+        failed = self._missing.get(series_id)
+        return failed is not None and time.monotonic() - failed < self.missing_ttl
+
+    async def _fetch(self, series_id: str) -> Optional[pd.Series]:
+        if series_id.startswith("^"):
+            hist = await self.data_service._fetch_market_history(series_id, period="max")
+            return hist["Close"] if not hist.empty else None
+        return await self.data_service._fetch_fred_data(series_id, limit=None, years=HISTORY_YEARS)
+
+    async def get(self, series_id: str, max_age: Optional[float] = None) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """Dates and values for a series, refreshing from upstream when missing or older than ``max_age`` (default ttl)"""
+        max_age = self.ttl if max_age is None else max_age
+        entry = self._load(series_id)
+        if entry is not None and time.time() - entry[0] < max_age:
+            return entry[1], entry[2]
+        if entry is None and self._recently_missing(series_id):
+            return None
+
+        # One refresh per series at a time; concurrent readers wait for it
+        lock = self._locks.setdefault(series_id, asyncio.Lock())
+        try:
+            async with lock:
+                entry = self._load(series_id)
+                if entry is not None and time.time() - entry[0] < max_age:
+                    return entry[1], entry[2]
+                if entry is None and self._recently_missing(series_id):
+                    return None
+                data = await self._fetch(series_id)
+                if data is not None and len(data) > 0:
+                    self.put(series_id, data)
+                    entry = self._series[series_id]
+                elif entry is not None:
+                    logger.warning(f"Refresh of {series_id} failed, serving stale history")
+                else:
+                    # Unknown or failing id: do not go upstream again on every request
+                    self._missing[series_id] = time.monotonic()
+                    self._missing.move_to_end(series_id)
+                    while len(self._missing) > self.max_series:
+                        self._missing.popitem(last=False)
+        finally:
+            if series_id not in self._series:
+                # Keep locks only for series that are held
+                self._locks.pop(series_id, None)
+        return (entry[1], entry[2]) if entry is not None else None
+
+    async def query(self,
+                    series_id: str,
+                    start: Optional[pd.Timestamp] = None,
+                    end: Optional[pd.Timestamp] = None) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """Observations with start <= date <= end as zero-copy views of the stored arrays"""
+        stored = await self.get(series_id)
+        if stored is None:
+            return None
+        dates, values = stored
+        lo = 0 if start is None else int(np.searchsorted(dates, pd.Timestamp(start).value, side="left"))
+        hi = len(dates) if end is None else int(np.searchsorted(dates, pd.Timestamp(end).value, side="right"))
+        return dates[lo:hi], values[lo:hi]
+
+    def watch_alerts(self, interval: float) -> None:
+        """Refresh every series the alert engine has rules on each ``interval`` seconds
+
+        Starts one background task if none is running; it stops by itself
+        once no rules are left, and the next watch_alerts call restarts it.
+        """
+        if self.alert_engine is None or (self._alert_task is not None and not self._alert_task.done()):
+            return
+        self._alert_task = asyncio.create_task(self._alert_refresh_loop(interval))
+
+    async def _alert_refresh_loop(self, interval: float) -> None:
+        while self.alert_engine.series:
+            results = await asyncio.gather(
+                *(self.get(series_id, max_age=interval) for series_id in self.alert_engine.series),
+                return_exceptions=True
+            )
+            for result in results:
+                if isinstance(result, Exception):
+                    logger.error(f"Alert series refresh failed: {result}")
+            await asyncio.sleep(interval)
@@ -0,0 +1,71 @@
+import numpy as np
+from typing import Tuple
+
+def _bucket_edges(n: int, n_buckets: int) -> np.ndarray:
+    return np.linspace(0, n, n_buckets + 1).astype(np.int64)
+
+def minmax_downsample(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Indices of the minimum and maximum of each of n_out // 2 equal buckets, in order
+
+    Keeps every spike visible, which suits volatile daily market series.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 2:
+        return np.arange(n)
+    n_buckets = n_out // 2
+    size = -(-n // n_buckets)
+    # Pad to a rectangle so all buckets reduce in one call; padding never wins min or max
+    padded = np.full(n_buckets * size, np.nan)
+    padded[:n] = y
+    blocks = padded.reshape(n_buckets, size)
+    valid = ~np.isnan(blocks).all(axis=1)
+    blocks = blocks[valid]
+    offsets = np.flatnonzero(valid) * size
+    lo = offsets + np.nanargmin(blocks, axis=1)
+    hi = offsets + np.nanargmax(blocks, axis=1)
+    return np.unique(np.concatenate([lo, hi]))
+
+def lttb_downsample(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Indices chosen by Largest-Triangle-Three-Buckets
+
+    First and last points are always kept. For each inner bucket the point
+    forming the largest triangle with the previously selected point and the
+    next bucket's mean is chosen; the area is evaluated for a whole bucket at
+    once.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = x.astype(np.float64)
+    y = y.astype(np.float64)
+    # Inner buckets span points 1..n-2
+    edges = 1 + _bucket_edges(n - 2, n_out - 2)
+    sums_x = np.add.reduceat(x[1:-1], edges[:-1] - 1)
+    sums_y = np.add.reduceat(y[1:-1], edges[:-1] - 1)
+    counts = np.diff(edges)
+    mean_x = np.append(sums_x / counts, x[-1])
+    mean_y = np.append(sums_y / counts, y[-1])
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for bucket in range(n_out - 2):
+        start, stop = edges[bucket], edges[bucket + 1]
+        bx, by = x[start:stop], y[start:stop]
+        cx, cy = mean_x[bucket + 1], mean_y[bucket + 1]
+        area = np.abs((x[a] - cx) * (by - y[a]) - (x[a] - bx) * (cy - y[a]))
+        a = start + int(np.argmax(area))
+        selected[bucket + 1] = a
+    return selected
+
+def downsample(x: np.ndarray, y: np.ndarray, n_out: int, method: str = "lttb") -> Tuple[np.ndarray, np.ndarray]:
+    """Reduce a series to about n_out points with 'lttb', 'minmax' or 'none'"""
+    if method == "none":
+        return x, y
+    if method == "lttb":
+        index = lttb_downsample(x, y, n_out)
+    elif method == "minmax":
+        index = minmax_downsample(x, y, n_out)
+    else:
+        raise ValueError(f"Unknown downsampling method '{method}'")
+    return x[index], y[index]
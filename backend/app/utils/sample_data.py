@@ -1,7 +1,14 @@
+import inspect
+import os
 import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional, Union
+from scipy.signal import lfilter
+
+from app.utils.shock_propagation import (
+    decay_kernel, propagate_shocks, random_shocks, random_spillovers, score_scenarios
+)
 
 def generate_sample_economic_data(
     start_date: datetime = datetime(2020, 1, 1),
@@ -58,13 +65,22 @@ def generate_sample_economic_data(
 
 def generate_sample_scenario(
     base_data: pd.DataFrame,
-    shock_size: float = 0.5
+    shock_size: float = 0.5,
+    duration: int = 12,
+    rng: Optional[np.random.Generator] = None
 ) -> Dict[str, Any]:
-    """Generate a sample economic scenario with shocks"""
+    """Generate a sample economic scenario with shocks
+
+    The shock fades out linearly over ``duration`` periods and spills over
+    to the other indicators; pass a seeded ``rng`` for reproducible output.
+    ``results`` is a DataFrame shaped like ``base_data``.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
     
     # Select random indicator and time period
-    indicator = np.random.choice(base_data.columns)
-    shock_period = np.random.randint(0, len(base_data))
+    shocks = random_shocks(1, base_data.shape[1], len(base_data), size=shock_size, rng=rng)
+    indicator = base_data.columns[shocks["indicators"][0]]
+    shock_period = int(shocks["periods"][0])
     
     # Create scenario parameters
     scenario = {
@@ -74,50 +90,197 @@ def generate_sample_scenario(
             "shock_indicator": indicator,
             "shock_size": shock_size,
             "shock_period": shock_period,
-            "duration": 12  # months
+            "duration": duration  # months
         }
     }
     
-    # Generate scenario results
-    results = base_data.copy()
-    shock = shock_size * base_data[indicator].iloc[shock_period]
-    results.loc[results.index[shock_period:], indicator] += shock
-    
-    # Add spillover effects
-    for other_indicator in base_data.columns:
-        if other_indicator != indicator:
-            spillover = 0.3 * shock * np.random.randn()  # Random spillover effect
-            results.loc[results.index[shock_period:], other_indicator] += spillover
-    
-    scenario["results"] = results.to_dict()
+    # Generate scenario results, including spillover effects
+    results = propagate_shocks(
+        base_data.to_numpy(dtype=np.float64),
+        shocks["indicators"], shocks["periods"], shocks["sizes"],
+        spillovers=random_spillovers(base_data.shape[1], rng=rng),
+        kernel=decay_kernel(len(base_data), half_life=duration / 2, kind="linear")
+    )
+    scenario["results"] = pd.DataFrame(results[0], index=base_data.index, columns=base_data.columns)
     
     return scenario
 
+def generate_sample_scenarios(
+    base_data: pd.DataFrame,
+    n_scenarios: int = 1000,
+    shock_size: Union[float, tuple] = (0.1, 0.5),
+    duration: int = 12,
+    seed: Optional[int] = None
+) -> Dict[str, Any]:
+    """Generate many single-shock scenarios in one broadcast operation
+
+    Returns the shock parameters as arrays, the (scenarios, periods,
+    indicators) result panels and their vectorised risk scores.
+    """
+    rng = np.random.default_rng(seed)
+    shocks = random_shocks(n_scenarios, base_data.shape[1], len(base_data), size=shock_size, rng=rng)
+    panels = propagate_shocks(
+        base_data.to_numpy(dtype=np.float64),
+        shocks["indicators"], shocks["periods"], shocks["sizes"],
+        spillovers=random_spillovers(base_data.shape[1], rng=rng),
+        kernel=decay_kernel(len(base_data), half_life=duration / 2, kind="linear")
+    )
+    return {
+        "indicators": base_data.columns[shocks["indicators"]].to_numpy(),
+        "periods": shocks["periods"],
+        "sizes": shocks["sizes"],
+        "results": panels,
+        "risk": score_scenarios(panels)
+    }
+
 def generate_sample_risk_assessment(
-    scenario: Dict[str, Any]
+    scenario: Dict[str, Any],
+    rng: Optional[np.random.Generator] = None
 ) -> Dict[str, Any]:
     """Generate a sample risk assessment for a scenario"""
+    rng = rng if rng is not None else np.random.default_rng()
     
-    # Calculate risk metrics
-    results = pd.DataFrame(scenario["results"])
-    volatility = results.std()
-    max_change = results.diff().abs().max()
-    
-    # Determine risk level
-    if max_change.max() > 2.0 or volatility.max() > 1.0:
-        risk_level = "High"
-    elif max_change.max() > 1.0 or volatility.max() > 0.5:
-        risk_level = "Medium"
-    else:
-        risk_level = "Low"
+    # Calculate risk metrics straight from the result array
+    results = scenario["results"]
+    if isinstance(results, dict):
+        # Scenarios serialised with the old to_dict() format
+        results = pd.DataFrame(results)
+    values = results.to_numpy(dtype=np.float64) if isinstance(results, pd.DataFrame) else np.asarray(results)
+    risk_level = str(score_scenarios(values)["risk_level"][0])
     
     # Generate assessment
     assessment = {
         "risk_level": risk_level,
-        "probability": np.random.uniform(0.1, 0.9),
-        "impact": np.random.uniform(0.1, 1.0),
+        "probability": rng.uniform(0.1, 0.9),
+        "impact": rng.uniform(0.1, 1.0),
         "description": f"Risk assessment for {scenario['name']}",
         "mitigation_strategy": "Implement monitoring and early warning system"
     }
     
-    return assessment 
\ No newline at end of file
+    return assessment 
+
+def random_correlation(n_indicators: int,
+                       n_factors: int = 3,
+                       seed: Optional[int] = None) -> np.ndarray:
+    """Random positive-definite correlation matrix with a few common factors, like real macro panels"""
+    rng = np.random.default_rng(seed)
+    loadings = rng.normal(0, 1, size=(n_indicators, n_factors))
+    covariance = loadings @ loadings.T + np.diag(rng.uniform(0.5, 1.5, n_indicators))
+    scale = 1 / np.sqrt(np.diag(covariance))
+    return covariance * scale[:, None] * scale[None, :]
+
+def _panel_dates(start_date: datetime, end_date: datetime, freq: str) -> pd.DatetimeIndex:
+    return pd.date_range(start=start_date, end=end_date, freq=freq)
+
+def iter_synthetic_panel(n_indicators: int = 100,
+                         start_date: datetime = datetime(1990, 1, 1),
+                         end_date: datetime = datetime(2023, 12, 31),
+                         freq: str = "D",
+                         covariance: Optional[np.ndarray] = None,
+                         means: Optional[np.ndarray] = None,
+                         persistence: float = 0.98,
+                         chunk_rows: int = 50_000,
+                         dtype: Union[str, np.dtype] = np.float64,
+                         seed: Optional[int] = None) -> Iterator[pd.DataFrame]:
+    """Stream a synthetic panel of mean-reverting AR(1) indicators in time-ordered chunks
+
+    Innovations are drawn from ``covariance`` (default: a random factor
+    correlation matrix) through one Cholesky factor, so the indicators are
+    cross-correlated. Each chunk is generated with one vectorised draw and
+    one IIR filter pass; the AR state carries across chunks, so memory use
+    depends on ``chunk_rows`` and not on the length of the panel.
+    """
+    rng = np.random.default_rng(seed)
+    dates = _panel_dates(start_date, end_date, freq)
+    if covariance is None:
+        covariance = random_correlation(n_indicators, seed=rng.integers(2**32))
+    covariance = np.asarray(covariance, dtype=np.float64)
+    if covariance.shape != (n_indicators, n_indicators):
+        raise ValueError(f"covariance must be {n_indicators}x{n_indicators}, got {covariance.shape}")
+    chol = np.linalg.cholesky(covariance)
+    if means is None:
+        means = rng.uniform(0, 5, n_indicators)
+    means = np.asarray(means, dtype=np.float64)
+    columns = [f"IND_{i:04d}" for i in range(n_indicators)]
+
+    # Start from the stationary distribution; lfilter's state is persistence * previous deviation
+    initial = rng.standard_normal(n_indicators) @ chol.T / np.sqrt(1 - persistence ** 2)
+    state = (persistence * initial)[None, :]
+    for start in range(0, len(dates), chunk_rows):
+        rows = min(chunk_rows, len(dates) - start)
+        innovations = rng.standard_normal((rows, n_indicators)) @ chol.T
+        deviations, state = lfilter([1.0], [1.0, -persistence], innovations, axis=0, zi=state)
+        values = (deviations + means).astype(dtype, copy=False)
+        yield pd.DataFrame(values, index=dates[start:start + rows], columns=columns)
+
+def generate_synthetic_panel(n_indicators: int = 100, **kwargs: Any) -> pd.DataFrame:
+    """In-memory version of iter_synthetic_panel"""
+    return pd.concat(list(iter_synthetic_panel(n_indicators, **kwargs)))
+
+def write_synthetic_panel(path: str, fmt: str = "npy", **kwargs: Any) -> int:
+    """Stream a synthetic panel to disk chunk by chunk and return the number of rows written
+
+    ``npy`` writes one (rows, indicators) array through a memory-mapped file
+    (dates go next to it, ``data.npy`` -> ``data.dates.npy``); ``parquet``
+    appends row groups and needs pyarrow.
+    """
+    chunks = iter_synthetic_panel(**kwargs)
+    if fmt == "npy":
+        # The memory map needs the full shape up front; take it from the same arguments and defaults
+        options = inspect.signature(iter_synthetic_panel).bind(**kwargs)
+        options.apply_defaults()
+        args = options.arguments
+        dates = _panel_dates(args["start_date"], args["end_date"], args["freq"])
+        out = np.lib.format.open_memmap(path, mode="w+", dtype=np.dtype(args["dtype"]),
+                                        shape=(len(dates), args["n_indicators"]))
+        written = 0
+        for chunk in chunks:
+            out[written:written + len(chunk)] = chunk.to_numpy()
+            written += len(chunk)
+        out.flush()
+        np.save(os.path.splitext(path)[0] + ".dates.npy", dates.values)
+        return written
+    if fmt == "parquet":
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Writing Parquet requires pyarrow (pip install pyarrow)") from e
+        writer = None
+        written = 0
+        try:
+            for chunk in chunks:
+                table = pa.Table.from_pandas(chunk, preserve_index=True)
+                if writer is None:
+                    writer = pq.ParquetWriter(path, table.schema)
+                writer.write_table(table)
+                written += len(chunk)
+        finally:
+            if writer is not None:
+                writer.close()
+        return written
+    raise ValueError(f"Unknown output format '{fmt}', expected 'npy' or 'parquet'")
+
+def generate_scenario_batch(base_data: pd.DataFrame,
+                            n_scenarios: int = 1000,
+                            horizon: int = 12,
+                            covariance: Optional[np.ndarray] = None,
+                            persistence: float = 0.9,
+                            seed: Optional[int] = None) -> np.ndarray:
+    """Simulate n_scenarios future paths from the last row of base_data in one batch
+
+    Returns an array of shape (n_scenarios, horizon, indicators). Each path
+    is the last observation plus an AR(1) deviation whose shocks are drawn
+    from ``covariance`` (default: covariance of base_data's period changes).
+    All scenarios are drawn and filtered in one vectorised call.
+    """
+    rng = np.random.default_rng(seed)
+    values = base_data.to_numpy(dtype=np.float64)
+    if covariance is None:
+        covariance = np.cov(np.diff(values, axis=0), rowvar=False)
+    covariance = np.atleast_2d(covariance)
+    # Small ridge keeps the factorisation valid for rank-deficient sample covariances
+    chol = np.linalg.cholesky(covariance + 1e-12 * np.eye(len(covariance)))
+    shocks = rng.standard_normal((n_scenarios, horizon, values.shape[1])) @ chol.T
+    return values[-1] + lfilter([1.0], [1.0, -persistence], shocks, axis=1)
+
@@ -0,0 +1,114 @@
+import numpy as np
+from typing import Dict, Optional, Union
+
+RISK_LEVELS = np.array(["Low", "Medium", "High"])
+
+def decay_kernel(length: int, half_life: Optional[float] = 12, kind: str = "exponential") -> np.ndarray:
+    """Share of a shock still in effect t periods after it hits, for t = 0..length-1
+
+    ``exponential`` halves every ``half_life`` periods, ``linear`` fades to
+    zero over ``2 * half_life`` periods, and ``step`` (or no half-life) keeps
+    the shock permanently.
+    """
+    t = np.arange(length, dtype=np.float64)
+    if kind == "step" or half_life is None:
+        return np.ones(length)
+    if kind == "exponential":
+        return np.exp(-np.log(2) * t / half_life)
+    if kind == "linear":
+        return np.clip(1 - t / (2 * half_life), 0, None)
+    raise ValueError(f"Unknown kernel kind '{kind}'")
+
+def random_spillovers(n_indicators: int,
+                      scale: float = 0.3,
+                      rng: Optional[np.random.Generator] = None) -> np.ndarray:
+    """Spillover matrix S where S[i, j] is the share of a shock to i passed on to j (zero diagonal)"""
+    rng = rng if rng is not None else np.random.default_rng()
+    spillovers = scale * rng.standard_normal((n_indicators, n_indicators))
+    np.fill_diagonal(spillovers, 0.0)
+    return spillovers
+
+def random_shocks(n_shocks: int,
+                  n_indicators: int,
+                  n_periods: int,
+                  size: Union[float, tuple] = 0.5,
+                  rng: Optional[np.random.Generator] = None) -> Dict[str, np.ndarray]:
+    """Draw shock (indicator, period, size) triples; ``size`` is fixed or a (low, high) range"""
+    rng = rng if rng is not None else np.random.default_rng()
+    sizes = rng.uniform(*size, n_shocks) if isinstance(size, tuple) else np.full(n_shocks, float(size))
+    return {
+        "indicators": rng.integers(0, n_indicators, n_shocks),
+        "periods": rng.integers(0, n_periods, n_shocks),
+        "sizes": sizes
+    }
+
+def propagate_shocks(base: np.ndarray,
+                     indicators: np.ndarray,
+                     periods: np.ndarray,
+                     sizes: np.ndarray,
+                     spillovers: Optional[np.ndarray] = None,
+                     kernel: Optional[np.ndarray] = None,
+                     spillover_kernel: Optional[np.ndarray] = None,
+                     relative: bool = True,
+                     combine: bool = False) -> np.ndarray:
+    """Apply many shocks to a (periods, indicators) base panel in one broadcast operation
+
+    Shock s hits indicator ``indicators[s]`` at ``periods[s]`` with magnitude
+    ``sizes[s]`` (a fraction of the base value at that point when
+    ``relative``). Its effect decays along ``kernel`` and spills over to the
+    other indicators through ``spillovers`` along ``spillover_kernel``
+    (default: the same kernel). Returns one scenario panel per shock with
+    shape (shocks, periods, indicators), or the base plus the sum of all
+    shocks when ``combine`` is set.
+    """
+    base = np.asarray(base, dtype=np.float64)
+    n_periods, n_indicators = base.shape
+    indicators = np.asarray(indicators, dtype=np.int64)
+    periods = np.asarray(periods, dtype=np.int64)
+    sizes = np.asarray(sizes, dtype=np.float64)
+    kernel = decay_kernel(n_periods) if kernel is None else np.asarray(kernel, dtype=np.float64)
+    spillover_kernel = kernel if spillover_kernel is None else np.asarray(spillover_kernel, dtype=np.float64)
+    if spillovers is None:
+        spillovers = np.zeros((n_indicators, n_indicators))
+
+    magnitude = sizes * base[periods, indicators] if relative else sizes
+
+    # lag[s, t] = periods since shock s hit; kernels are zero before the shock
+    lag = np.arange(n_periods)[None, :] - periods[:, None]
+    active = lag >= 0
+    lag = np.clip(lag, 0, n_periods - 1)
+    direct = np.where(active, kernel[lag], 0.0) * magnitude[:, None]
+    spill = np.where(active, spillover_kernel[lag], 0.0) * magnitude[:, None]
+
+    if combine:
+        # Sum over shocks without materialising the (shocks, periods, indicators) impulses
+        combined = base + np.einsum("st,sk->tk", spill, spillovers[indicators])
+        np.add.at(combined, (slice(None), indicators), direct.T)
+        return combined
+
+    # (shocks, periods, 1) * (shocks, 1, indicators) -> per-shock impulse on every indicator
+    impact = spill[:, :, None] * spillovers[indicators][:, None, :]
+    impact[np.arange(len(indicators)), :, indicators] += direct
+    return base[None, :, :] + impact
+
+def score_scenarios(panels: np.ndarray,
+                    high: tuple = (2.0, 1.0),
+                    medium: tuple = (1.0, 0.5)) -> Dict[str, np.ndarray]:
+    """Vectorised risk scoring of (scenarios, periods, indicators) panels
+
+    A scenario is High risk when its largest period-to-period move exceeds
+    ``high[0]`` or any indicator's volatility exceeds ``high[1]``, Medium on
+    the ``medium`` thresholds, otherwise Low (the rules used by
+    generate_sample_risk_assessment).
+    """
+    panels = np.asarray(panels, dtype=np.float64)
+    if panels.ndim == 2:
+        panels = panels[None]
+    volatility = panels.std(axis=1, ddof=1).max(axis=1)
+    max_change = np.abs(np.diff(panels, axis=1)).max(axis=(1, 2))
+    level = np.select(
+        [(max_change > high[0]) | (volatility > high[1]), (max_change > medium[0]) | (volatility > medium[1])],
+        [2, 1],
+        default=0
+    )
+    return {"risk_level": RISK_LEVELS[level], "volatility": volatility, "max_change": max_change}
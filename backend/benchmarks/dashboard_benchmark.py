@@ -0,0 +1,110 @@
+"""Compare the aggregated /dashboard endpoint with the four separate dashboard calls.
+
+Upstream FRED and Yahoo Finance clients are replaced by synthetic ones that
+sleep for a fixed latency and count requests, so the benchmark runs offline
+and reports upstream call count and latency percentiles per page load.
+
+    cd backend
+    python -m benchmarks.dashboard_benchmark --iterations 50 --latency 0.05
+"""
+import argparse
+import asyncio
+import threading
+import time
+from typing import Dict, List
+
+import httpx
+import numpy as np
+import pandas as pd
+
+from app.main import app
+from app.api.api_v1.endpoints import economic
+from app.services import real_data_service as real_data_module
+
+SEPARATE_ENDPOINTS = ["/indicators", "/forecast", "/risk-assessment", "/market-data"]
+PREFIX = "/api/v1/economic"
+
+class UpstreamCounter:
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def hit(self) -> None:
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.latency)
+
+class SyntheticFred:
+    def __init__(self, counter: UpstreamCounter):
+        self.counter = counter
+
+    def get_series(self, series_id: str, **kwargs) -> pd.Series:
+        self.counter.hit()
+        freq = "QS" if series_id in ("GDP", "GDPC1") else "MS"
+        index = pd.date_range(end=pd.Timestamp.now().normalize(), periods=240 if freq == "MS" else 80, freq=freq)
+        values = 100 * np.cumprod(1 + 0.002 + 0.001 * np.sin(np.arange(len(index))))
+        data = pd.Series(values, index=index)
+        limit = kwargs.get("limit")
+        return data.iloc[::-1].head(limit) if limit else data.iloc[::-1]
+
+class SyntheticTicker:
+    counter: UpstreamCounter = None
+
+    def __init__(self, symbol: str):
+        self.symbol = symbol
+
+    def history(self, period: str = "5d") -> pd.DataFrame:
+        self.counter.hit()
+        index = pd.bdate_range(end=pd.Timestamp.now().normalize(), periods=63)
+        close = 4000 * np.cumprod(1 + 0.01 * np.sin(np.arange(len(index))))
+        return pd.DataFrame({"Close": close}, index=index)
+
+def percentile(samples: List[float], q: float) -> float:
+    return float(np.percentile(samples, q) * 1000)
+
+async def run(iterations: int, latency: float) -> Dict[str, Dict[str, float]]:
+    counter = UpstreamCounter(latency)
+    service = economic.real_data_service
+    service.fred = SyntheticFred(counter)
+    SyntheticTicker.counter = counter
+    real_data_module.yf.Ticker = SyntheticTicker
+    # Measure cold page loads: no panel cache carried between iterations
+    service.PANEL_CACHE_TTL = 0
+
+    async def separate(client: httpx.AsyncClient) -> None:
+        await asyncio.gather(*(client.get(PREFIX + path) for path in SEPARATE_ENDPOINTS))
+
+    async def aggregated(client: httpx.AsyncClient) -> None:
+        await client.get(PREFIX + "/dashboard")
+
+    report = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        for name, page_load in (("separate", separate), ("dashboard", aggregated)):
+            timings = []
+            counter.calls = 0
+            for _ in range(iterations):
+                start = time.perf_counter()
+                await page_load(client)
+                timings.append(time.perf_counter() - start)
+            report[name] = {
+                "upstream_calls_per_load": counter.calls / iterations,
+                "p50_ms": percentile(timings, 50),
+                "p95_ms": percentile(timings, 95),
+            }
+    return report
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--latency", type=float, default=0.05, help="Simulated upstream latency in seconds")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args.iterations, args.latency))
+    print(f"{'mode':<10} {'upstream calls':>15} {'p50 ms':>10} {'p95 ms':>10}")
+    for name, row in report.items():
+        print(f"{name:<10} {row['upstream_calls_per_load']:>15.1f} {row['p50_ms']:>10.1f} {row['p95_ms']:>10.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Throughput of concurrent handlers using the async database layer vs blocking sessions.
+
+Each simulated request reads the latest indicators, inserts one row and
+awaits a simulated upstream call. With the synchronous session every query
+blocks the event loop, so concurrent requests serialise; the async engine
+lets them overlap.
+
+    cd backend
+    python -m benchmarks.db_benchmark --requests 500 --concurrency 50
+    python -m benchmarks.db_benchmark --sync-url postgresql://... --async-url postgresql+asyncpg://...
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from datetime import datetime, timezone
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base import Base
+from app.db.bulk import bulk_insert_indicators
+from app.db.session import make_async_engine, pool_options
+from app.models.economic import EconomicIndicator
+
+def indicator_row(i: int) -> dict:
+    return {
+        "indicator_type": "CPIAUCSL",
+        "value": 300.0 + i * 0.01,
+        "timestamp": datetime.now(timezone.utc),
+        "source": "benchmark",
+        "confidence_interval": 0.1,
+        "metadata_": {"seq": i},
+    }
+
+LATEST = select(EconomicIndicator).order_by(EconomicIndicator.id.desc()).limit(50)
+
+async def run_sync(url: str, requests: int, concurrency: int, upstream_latency: float) -> float:
+    engine = create_engine(url, **pool_options(url))
+    Session = sessionmaker(bind=engine, autoflush=False)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def handler(i: int) -> None:
+        async with semaphore:
+            with Session() as db:
+                db.execute(LATEST).scalars().all()
+                db.add(EconomicIndicator(**indicator_row(i)))
+                db.commit()
+            await asyncio.sleep(upstream_latency)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(handler(i) for i in range(requests)))
+    elapsed = time.perf_counter() - start
+    engine.dispose()
+    return requests / elapsed
+
+async def run_async(url: str, requests: int, concurrency: int, upstream_latency: float) -> float:
+    engine = make_async_engine(url)
+    Session = async_sessionmaker(engine, expire_on_commit=False)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def handler(i: int) -> None:
+        async with semaphore:
+            async with Session() as db:
+                (await db.execute(LATEST)).scalars().all()
+                await bulk_insert_indicators(db, [indicator_row(i)])
+            await asyncio.sleep(upstream_latency)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(handler(i) for i in range(requests)))
+    elapsed = time.perf_counter() - start
+    await engine.dispose()
+    return requests / elapsed
+
+async def run_bulk(url: str, rows: int) -> float:
+    engine = make_async_engine(url)
+    Session = async_sessionmaker(engine, expire_on_commit=False)
+    start = time.perf_counter()
+    async with Session() as db:
+        await bulk_insert_indicators(db, [indicator_row(i) for i in range(rows)])
+    elapsed = time.perf_counter() - start
+    await engine.dispose()
+    return rows / elapsed
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--upstream-latency", type=float, default=0.01)
+    parser.add_argument("--bulk-rows", type=int, default=20000)
+    parser.add_argument("--sync-url", default=None)
+    parser.add_argument("--async-url", default=None)
+    args = parser.parse_args()
+
+    if args.sync_url is None or args.async_url is None:
+        path = os.path.join(tempfile.mkdtemp(), "benchmark.db")
+        args.sync_url = f"sqlite:///{path}"
+        args.async_url = f"sqlite+aiosqlite:///{path}"
+
+    setup = create_engine(args.sync_url)
+    Base.metadata.create_all(setup)
+    setup.dispose()
+
+    sync_rps = asyncio.run(run_sync(args.sync_url, args.requests, args.concurrency, args.upstream_latency))
+    async_rps = asyncio.run(run_async(args.async_url, args.requests, args.concurrency, args.upstream_latency))
+    bulk_rps = asyncio.run(run_bulk(args.async_url, args.bulk_rows))
+    print(f"sync sessions : {sync_rps:10.1f} requests/s")
+    print(f"async engine  : {async_rps:10.1f} requests/s")
+    print(f"bulk insert   : {bulk_rps:10.1f} rows/s")
+
+if __name__ == "__main__":
+    main()
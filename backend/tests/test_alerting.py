@@ -0,0 +1,91 @@
+import asyncio
+import operator
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from app.services.alerting import AlertEngine, MemoryAlertSink
+from app.services.series_store import SeriesStore
+
+OPERATORS = {">": operator.gt, ">=": operator.ge, "<": operator.lt, "<=": operator.le}
+
+def _feature(values: pd.Series, transform: str, window: int, over: int) -> np.ndarray:
+    if transform == "level":
+        feature = values
+    elif transform == "change":
+        feature = values - values.shift(window)
+    elif transform == "pct_change":
+        feature = (values / values.shift(window) - 1) * 100
+    else:
+        feature = ((values / values.shift(1) - 1) * 100).rolling(window).std()
+    if over:
+        feature = feature - feature.shift(over)
+    return feature.to_numpy()
+
+def test_engine_matches_brute_force_evaluation():
+    rng = np.random.default_rng(0)
+    n = 400
+    dates = pd.date_range("2000-01-01", periods=n, freq="D")
+    x = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    engine = AlertEngine()
+
+    rules = []
+    for _ in range(1000):
+        transform = str(rng.choice(["level", "change", "pct_change", "volatility"]))
+        window = 1 if transform == "level" else int(rng.integers(2, 20))
+        over = int(rng.integers(0, 3))
+        op = str(rng.choice(list(OPERATORS)))
+        feature = _feature(pd.Series(x), transform, window, over)
+        threshold = float(np.nanquantile(feature, rng.uniform(0.1, 0.9)))
+        rule = engine.add_rule("S", op, threshold, transform=transform, window=window, over=over)
+        rules.append((rule["rule_id"], feature, op, threshold))
+
+    # First batch only warms up; later observations arrive in overlapping replays and one at a time
+    events = engine.ingest("S", dates[:200], x[:200])
+    events += engine.ingest("S", dates[:300], x[:300])
+    for i in range(300, n):
+        events += engine.ingest("S", dates[i:i + 1], x[i:i + 1])
+
+    expected = Counter()
+    for rule_id, feature, op, threshold in rules:
+        for i in range(199, n):
+            now, before = feature[i], feature[i - 1]
+            if np.isnan(now):
+                continue
+            if OPERATORS[op](now, threshold) and (np.isnan(before) or not OPERATORS[op](before, threshold)):
+                expected[(rule_id, dates[i].isoformat())] += 1
+    assert Counter((event["rule_id"], event["date"]) for event in events) == expected
+
+def test_remove_rule_drops_feature_state():
+    engine = AlertEngine()
+    rule = engine.add_rule("S", ">", 1.0)
+    assert engine.series == ["S"]
+    assert engine.remove_rule(rule["rule_id"])
+    assert engine.series == []
+    assert not engine.remove_rule(rule["rule_id"])
+
+def test_watch_alerts_refreshes_rule_series_in_background(tmp_path):
+    sink = MemoryAlertSink()
+    engine = AlertEngine(sinks=[sink])
+    store = SeriesStore(None, str(tmp_path), alert_engine=engine)
+    history = pd.Series([1.0, 2.0, 3.0], index=pd.date_range("2020-01-01", periods=3, freq="MS"))
+
+    async def fetch(series_id):
+        # Each refresh publishes one more observation, the last one crossing the threshold
+        nonlocal history
+        history = pd.concat([history, pd.Series([10.0], index=[history.index[-1] + pd.DateOffset(months=1)])])
+        return history
+
+    store._fetch = fetch
+
+    async def run():
+        engine.add_rule("X", ">", 5.0)
+        store.watch_alerts(0.01)
+        await asyncio.sleep(0.1)
+        engine.remove_rule(1)
+        await asyncio.sleep(0.05)
+        return store._alert_task.done()
+
+    assert asyncio.run(run())
+    assert [event["series_id"] for event in sink.events] == ["X"]
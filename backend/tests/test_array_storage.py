@@ -0,0 +1,99 @@
+import asyncio
+import datetime
+
+import numpy as np
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+import app.models.user  # noqa: F401  (registers the users table the results reference)
+from app.db.array_storage import (decode_arrays, encode_arrays, json_results_to_arrays, migrate_json_results,
+                                  open_array_file, write_array_file)
+from app.db.base_class import Base
+from app.models.economic import ModelResult
+
+def _results():
+    rng = np.random.default_rng(0)
+    return {
+        "paths": rng.normal(size=(50, 12, 3)),
+        "counts": np.arange(7, dtype=np.int32),
+        "flags": np.array([True, False, True]),
+        "model": "VAR(2)",
+        "as_of": datetime.datetime(2024, 3, 31, 12, 0),
+        "loss": np.float64(1.25),
+    }
+
+@pytest.mark.parametrize("compress", [True, False])
+def test_blob_round_trip(compress):
+    results = _results()
+    decoded = decode_arrays(encode_arrays(results, compress=compress))
+    for name in ("paths", "counts", "flags"):
+        assert decoded[name].dtype == results[name].dtype
+        np.testing.assert_array_equal(decoded[name], results[name])
+    assert decoded["model"] == "VAR(2)"
+    assert decoded["as_of"] == "2024-03-31T12:00:00"
+    assert decoded["loss"] == 1.25
+
+def test_array_file_is_memory_mapped(tmp_path):
+    results = _results()
+    write_array_file(str(tmp_path / "r.bin"), results)
+    mapped = open_array_file(str(tmp_path / "r.bin"))
+    np.testing.assert_array_equal(mapped["paths"], results["paths"])
+    assert not mapped["paths"].flags.writeable
+
+def test_unsupported_values_are_rejected():
+    with pytest.raises(TypeError):
+        encode_arrays({"names": np.array(["a", "b"], dtype=object)})
+    with pytest.raises(TypeError):
+        encode_arrays({"handle": object()})
+
+def test_only_lossless_lists_become_arrays():
+    converted = json_results_to_arrays({
+        "forecast": [[1, 2.5], [3, 4]],
+        "series": {"GDP": [1.0, 2.0], "CPI": [3, 4]},
+        "years": ["2020", "2021"],
+        "mask": [True, False],
+        "gaps": [1.0, None],
+        "ragged": [[1, 2], [3]],
+        "mixed": {"GDP": [1.0, 2.0], "note": ["a", "b"]},
+        "empty": [],
+    })
+    np.testing.assert_array_equal(converted["forecast"], [[1, 2.5], [3, 4]])
+    np.testing.assert_array_equal(converted["series"], [[1, 3], [2, 4]])
+    assert converted["series__columns"] == ["GDP", "CPI"]
+    for key in ("years", "mask", "gaps", "ragged", "mixed", "empty"):
+        assert not isinstance(converted[key], np.ndarray)
+
+def test_migrate_json_results_on_sqlite(tmp_path):
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'm.db'}")
+        try:
+            async with engine.begin() as connection:
+                await connection.run_sync(Base.metadata.create_all)
+            sessions = async_sessionmaker(engine, expire_on_commit=False)
+            async with sessions() as session:
+                session.add_all([
+                    ModelResult(model_type="var", results={"forecast": [[1.0, 2.0], [3.0, 4.0]], "years": ["2020"]}),
+                    ModelResult(model_type="var", results={"series": {"GDP": [1, 2, 3]}, "gaps": [1.0, None]}),
+                    ModelResult(model_type="var", results=[1, 2]),
+                    ModelResult(model_type="var", results=None),
+                ])
+                await session.commit()
+                migrated = await migrate_json_results(session, ModelResult, batch_size=2)
+                again = await migrate_json_results(session, ModelResult)
+                rows = (await session.execute(select(ModelResult).order_by(ModelResult.id))).scalars().all()
+            return migrated, again, rows
+        finally:
+            await engine.dispose()
+
+    migrated, again, rows = asyncio.run(run())
+    assert (migrated, again) == (4, 0)
+    first, second, third, null = [row.results_blob for row in rows]
+    np.testing.assert_array_equal(first["forecast"], [[1.0, 2.0], [3.0, 4.0]])
+    assert first["years"] == ["2020"]
+    np.testing.assert_array_equal(second["series"], [[1], [2], [3]])
+    assert second["gaps"] == [1.0, None]
+    assert third == {"results": [1, 2]}
+    # The JSON column stores None as JSON null, which is kept as an attr
+    assert null == {"results": None}
+    assert rows[0].results == {"forecast": [[1.0, 2.0], [3.0, 4.0]], "years": ["2020"]}
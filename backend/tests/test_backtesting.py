@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+import pytest
+from statsmodels.tsa.vector_ar.var_model import VAR
+
+from app.services.backtesting import BacktestService, trend_forecast
+
+def _data(n=90):
+    rng = np.random.default_rng(0)
+    y = np.zeros((n, 2))
+    for t in range(1, n):
+        y[t] = np.array([[0.6, 0.1], [0.2, 0.5]]) @ y[t - 1] + rng.normal(size=2)
+    return pd.DataFrame(y + [2.0, 3.0], columns=["gdp", "cpi"], index=pd.date_range("2000-01-01", periods=n, freq="QS"))
+
+@pytest.mark.parametrize("window", ["expanding", "rolling"])
+@pytest.mark.parametrize("n_jobs", [1, 3])
+def test_incremental_var_matches_refit_at_every_origin(window, n_jobs):
+    data, lags, horizon, window_size = _data(), 2, 4, 30
+    result = BacktestService().run(data, horizon=horizon, window=window, window_size=window_size,
+                                   min_train=35, step=3, lags=lags, n_jobs=n_jobs)
+    y = data.to_numpy()
+    for origin_date, errors in zip(result["origins"], result["errors"]):
+        origin = data.index.get_loc(origin_date)
+        start = 0 if window == "expanding" else origin - lags - window_size
+        fitted = VAR(y[start:origin]).fit(lags)
+        assert fitted.nobs == (origin - lags if window == "expanding" else window_size)
+        expected = fitted.forecast(y[origin - lags:origin], steps=horizon) - y[origin:origin + horizon]
+        np.testing.assert_allclose(errors, expected, atol=1e-8)
+
+def test_trend_rolling_window_and_cache():
+    data = _data()
+    service = BacktestService()
+    result = service.run(data.iloc[:-5], forecaster="trend", window="rolling", window_size=12, cache_key="d")
+    y = data.to_numpy()
+    origin = data.index.get_loc(result["origins"][0])
+    np.testing.assert_allclose(result["errors"][0], trend_forecast(y[origin - 12:origin], 4) - y[origin:origin + 4])
+    extended = service.run(data, forecaster="trend", window="rolling", window_size=12, cache_key="d")
+    assert extended["n_evaluated"] == 5
+    np.testing.assert_allclose(extended["errors"][:-5], result["errors"])
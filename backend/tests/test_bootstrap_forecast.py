@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+import pytest
+from statsmodels.tsa.vector_ar.var_model import VAR
+
+from app.services.economic_model import EconomicModelService, stacked_var_coefs, var_forecast_path
+
+def _results(lags=2):
+    rng = np.random.default_rng(3)
+    y = np.zeros((160, 2))
+    for t in range(1, 160):
+        y[t] = np.array([[0.6, 0.1], [0.2, 0.5]]) @ y[t - 1] + rng.normal(size=2)
+    return VAR(pd.DataFrame(y + [2.0, 3.0], columns=["GDP Growth", "Inflation"])).fit(lags)
+
+@pytest.mark.parametrize("lags", [1, 3])
+def test_forecast_path_matches_statsmodels(lags):
+    results = _results(lags)
+    history = np.asarray(results.endog)
+    np.testing.assert_allclose(var_forecast_path(stacked_var_coefs(results), history, 12),
+                               results.forecast(history[-lags:], steps=12), atol=1e-10)
+
+@pytest.mark.parametrize("reestimate", [False, True])
+def test_bootstrap_bands_are_ordered_and_reproducible(reestimate):
+    service, results = EconomicModelService(), _results()
+    bands = service.bootstrap_forecast(results, steps=8, n_boot=400, reestimate=reestimate, seed=1)
+    for name in ("point", "median", "lower_ci", "upper_ci"):
+        assert bands[name].shape == (8, 2)
+    np.testing.assert_allclose(bands["point"], results.forecast(np.asarray(results.endog)[-2:], steps=8))
+    assert np.all(bands["lower_ci"] < bands["median"]) and np.all(bands["median"] < bands["upper_ci"])
+    assert np.all(bands["lower_ci"] < bands["point"]) and np.all(bands["point"] < bands["upper_ci"])
+    # Uncertainty grows with the horizon
+    width = bands["upper_ci"] - bands["lower_ci"]
+    assert np.all(width[-1] > width[0])
+    again = service.bootstrap_forecast(results, steps=8, n_boot=400, reestimate=reestimate, seed=1)
+    np.testing.assert_array_equal(again["upper_ci"], bands["upper_ci"])
+
+def test_bootstrap_width_matches_gaussian_forecast_error():
+    results = _results(1)
+    bands = EconomicModelService().bootstrap_forecast(results, steps=4, n_boot=4000, reestimate=False, seed=0)
+    sd = np.sqrt(np.diagonal(results.forecast_cov(4), axis1=1, axis2=2))
+    np.testing.assert_allclose(bands["upper_ci"] - bands["lower_ci"], 2 * 1.959964 * sd, rtol=0.1)
+
+def test_parallel_bootstrap_is_reproducible():
+    service, results = EconomicModelService(), _results()
+    first = service.bootstrap_forecast(results, steps=4, n_boot=300, seed=2, n_jobs=2)
+    second = service.bootstrap_forecast(results, steps=4, n_boot=300, seed=2, n_jobs=2)
+    np.testing.assert_array_equal(first["lower_ci"], second["lower_ci"])
@@ -0,0 +1,71 @@
+import asyncio
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.correlation import CorrelationService, EWCovariance, RollingCovariance, covariance_to_correlation
+
+def _data():
+    rng = np.random.default_rng(0)
+    return rng.normal(size=(500, 4)) @ rng.normal(size=(4, 4))
+
+def test_ew_covariance_matches_pandas_unbiased():
+    x = _data()
+    estimator = EWCovariance(4, halflife=12)
+    estimator.update(x[:250])
+    for row in x[250:]:
+        estimator.update(row)
+    expected = pd.DataFrame(x).ewm(halflife=12, adjust=False).cov().iloc[-4:].to_numpy()
+    np.testing.assert_allclose(estimator.covariance, expected, rtol=1e-10)
+
+def test_rolling_covariance_matches_np_cov_for_any_batching():
+    x = _data()
+    estimator = RollingCovariance(4, window=60)
+    seen = 0
+    for size in [3, 1, 70, 10, 1, 5, 100, 30, 200, 80]:
+        estimator.update(x[seen:seen + size])
+        seen += size
+        np.testing.assert_allclose(estimator.covariance, np.cov(x[max(0, seen - 60):seen].T), atol=1e-10)
+
+def test_correlation_from_covariance():
+    x = _data()[-60:]
+    np.testing.assert_allclose(covariance_to_correlation(np.cov(x.T)), np.corrcoef(x.T))
+
+def test_ew_and_rolling_agree_on_stationary_data():
+    rng = np.random.default_rng(1)
+    x = rng.normal(size=(8000, 2)) @ np.array([[1.0, 0.5], [0.0, 1.0]])
+    ew, rolling = EWCovariance(2, halflife=1000), RollingCovariance(2, window=3000)
+    ew.update(x)
+    rolling.update(x)
+    np.testing.assert_allclose(ew.covariance, rolling.covariance, rtol=0.15)
+
+class _PanelSource:
+    def __init__(self, n=120):
+        self.n = n
+        self.drop = set()
+
+    async def get_panel_data(self, series_ids, freq="M", years=20):
+        dates = pd.date_range("2000-01-31", periods=self.n, freq="M")
+        rng = np.random.default_rng(len(series_ids))
+        columns = [series_id for series_id in series_ids if series_id not in self.drop]
+        return pd.DataFrame(rng.normal(size=(self.n, len(columns))).cumsum(axis=0), index=dates, columns=columns)
+
+def test_partial_panel_is_rejected_and_tracker_keeps_working():
+    source = _PanelSource()
+    service = CorrelationService(source)
+    source.drop = {"UNRATE"}
+    with pytest.raises(ValueError, match="only has"):
+        asyncio.run(service.get_matrix(["GDPC1", "CPIAUCSL", "UNRATE"]))
+    source.drop = set()
+    source.n += 1
+    matrix = asyncio.run(service.get_matrix(["GDPC1", "CPIAUCSL", "UNRATE"]))
+    assert matrix["labels"] == ["GDPC1", "CPIAUCSL", "UNRATE"]
+    assert np.asarray(matrix["covariance"]).shape == (3, 3)
+
+def test_trackers_are_bounded():
+    service = CorrelationService(_PanelSource())
+    service.MAX_TRACKERS = 3
+    for i in range(5):
+        asyncio.run(service.covariance([f"A{i}", f"B{i}"]))
+    assert [key[0] for key in service._trackers] == [("A2", "B2"), ("A3", "B3"), ("A4", "B4")]
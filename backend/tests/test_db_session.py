@@ -0,0 +1,39 @@
+import asyncio
+import importlib
+import sys
+
+import pytest
+from sqlalchemy import text
+
+from app.core.config import Settings
+
+@pytest.mark.parametrize("url, expected", [
+    ("postgresql://u:p@db/app", "postgresql+asyncpg://u:p@db/app"),
+    ("postgresql+psycopg2://u:p@db/app", "postgresql+asyncpg://u:p@db/app"),
+    ("sqlite:///x.db", "sqlite+aiosqlite:///x.db"),
+    ("sqlite://", "sqlite+aiosqlite://"),
+])
+def test_async_uri_uses_async_driver(url, expected):
+    assert Settings(SQLALCHEMY_DATABASE_URI=url).async_database_uri == expected
+
+def test_sqlite_url_imports_and_serves_both_engines(monkeypatch, tmp_path):
+    monkeypatch.setenv("SQLALCHEMY_DATABASE_URI", f"sqlite:///{tmp_path / 'x.db'}")
+    for module in ("app.core.config", "app.db.session"):
+        sys.modules.pop(module, None)
+    try:
+        session = importlib.import_module("app.db.session")
+        with session.engine.connect() as connection:
+            assert connection.execute(text("select 1")).scalar() == 1
+
+        async def query():
+            engine = session.get_async_engine()
+            try:
+                async with engine.connect() as connection:
+                    return (await connection.execute(text("select 1"))).scalar()
+            finally:
+                await engine.dispose()
+
+        assert asyncio.run(query()) == 1
+    finally:
+        for module in ("app.core.config", "app.db.session"):
+            sys.modules.pop(module, None)
@@ -0,0 +1,53 @@
+import math
+
+import numpy as np
+import pytest
+
+from app.utils.downsampling import downsample, lttb_downsample, minmax_downsample
+
+def _reference_lttb(x, y, n_out):
+    """Point-by-point Largest-Triangle-Three-Buckets as published by Steinarsson"""
+    n = len(x)
+    every = (n - 2) / (n_out - 2)
+    selected = [0]
+    a = 0
+    for i in range(n_out - 2):
+        avg_start = math.floor((i + 1) * every) + 1
+        avg_end = min(math.floor((i + 2) * every) + 1, n)
+        avg_x = sum(x[avg_start:avg_end]) / (avg_end - avg_start)
+        avg_y = sum(y[avg_start:avg_end]) / (avg_end - avg_start)
+        best, best_area = None, -1.0
+        for j in range(math.floor(i * every) + 1, math.floor((i + 1) * every) + 1):
+            area = abs((x[a] - avg_x) * (y[j] - y[a]) - (x[a] - x[j]) * (avg_y - y[a])) / 2
+            if area > best_area:
+                best, best_area = j, area
+        selected.append(best)
+        a = best
+    selected.append(n - 1)
+    return selected
+
+@pytest.mark.parametrize("n, n_out", [(10, 3), (100, 7), (1000, 100), (1001, 250), (5000, 999)])
+def test_lttb_matches_reference(n, n_out):
+    rng = np.random.default_rng(n)
+    x = np.cumsum(rng.uniform(0.5, 1.5, n))
+    y = np.cumsum(rng.normal(size=n))
+    assert lttb_downsample(x, y, n_out).tolist() == _reference_lttb(x.tolist(), y.tolist(), n_out)
+
+def test_minmax_keeps_extremes_of_every_bucket():
+    rng = np.random.default_rng(0)
+    y = rng.normal(size=1003)
+    index = minmax_downsample(np.arange(1003), y, 100)
+    assert np.all(np.diff(index) > 0)
+    assert y.argmax() in index and y.argmin() in index
+    size = -(-1003 // 50)
+    for start in range(0, 1003, size):
+        block = y[start:start + size]
+        assert start + block.argmax() in index and start + block.argmin() in index
+
+def test_small_series_and_none_are_returned_whole():
+    x, y = np.arange(5), np.arange(5.0)
+    for method in ("lttb", "minmax", "none"):
+        out_x, out_y = downsample(x, y, 10, method)
+        assert out_x.tolist() == x.tolist() and out_y.tolist() == y.tolist()
+    with pytest.raises(ValueError):
+        downsample(x, y, 3, "mean")
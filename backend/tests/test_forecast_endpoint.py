@@ -0,0 +1,50 @@
+import asyncio
+import threading
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.api_v1.endpoints import economic
+from test_risk_metrics import _history
+
+def _client():
+    app = FastAPI()
+    app.include_router(economic.router)
+    return TestClient(app)
+
+def test_fallback_forecast_is_not_cacheable(monkeypatch):
+    async def unavailable():
+        return None
+    monkeypatch.setattr(economic.real_data_service, "_get_forecast_history", unavailable)
+    response = _client().get("/forecast?periods=4")
+    assert response.status_code == 200
+    assert response.json()["vintage"] == "fallback"
+    assert "etag" not in response.headers
+    assert response.headers["cache-control"] == "no-store"
+
+def test_vintage_forecast_is_fitted_once_off_the_event_loop(monkeypatch):
+    service = economic.real_data_service
+    history = _history()
+
+    async def forecast_history():
+        return history
+    monkeypatch.setattr(service, "_get_forecast_history", forecast_history)
+    monkeypatch.setattr(service, "_forecast_vintage", None)
+    fitted_on = []
+    fit = service._fit_forecast_model
+
+    def recorded(data):
+        fitted_on.append(threading.current_thread() is threading.main_thread())
+        return fit(data)
+    monkeypatch.setattr(service, "_fit_forecast_model", recorded)
+
+    async def run():
+        return await asyncio.gather(*(service.get_forecast_data(periods) for periods in (4, 8, 12)))
+    results = asyncio.run(run())
+    assert fitted_on == [False]
+    assert len({result["vintage"] for result in results}) == 1
+
+    response = _client().get("/forecast?periods=4")
+    etag = response.headers["etag"]
+    assert response.headers["cache-control"] == "public, max-age=300"
+    assert _client().get("/forecast?periods=4", headers={"If-None-Match": etag}).status_code == 304
@@ -0,0 +1,39 @@
+import asyncio
+
+from app.services.live_updates import LiveUpdateBroadcaster, diff_snapshots
+
+class _Dashboard:
+    def __init__(self):
+        self.tick = 0
+
+    async def get_dashboard(self, fields=None):
+        self.tick += 1
+        return {"indicators": {"gdp": self.tick}, "market_data": {"spx": 100 + self.tick}}
+
+def test_diff_snapshots_keeps_changed_and_removed_leaves():
+    old = {"a": {"x": 1, "y": 2}, "b": 3}
+    new = {"a": {"x": 1, "y": 5}, "c": 4}
+    assert diff_snapshots(old, new) == {"a": {"y": 5}, "c": 4, "b": None}
+
+def test_slow_subscriber_resyncs_but_keeps_its_alerts():
+    async def run():
+        broadcaster = LiveUpdateBroadcaster(_Dashboard(), interval=3600, queue_size=2)
+        subscriber = await broadcaster.subscribe()
+        broadcaster._task.cancel()
+        for i in range(6):
+            await broadcaster.poll_once()
+            broadcaster.publish_alert({"name": f"rule-{i}"})
+        messages = []
+        while True:
+            message = await subscriber.next_message(timeout=0.01)
+            if message is None:
+                break
+            messages.append(message)
+        broadcaster.unsubscribe(subscriber)
+        return subscriber, messages
+
+    subscriber, messages = asyncio.run(run())
+    assert subscriber.resyncs > 0
+    assert [m["data"]["name"] for m in messages if m["type"] == "alert"] == [f"rule-{i}" for i in range(6)]
+    state = [m for m in messages if m["type"] != "alert"]
+    assert state[-1]["data"]["indicators"]["gdp"] == 6
@@ -0,0 +1,33 @@
+import asyncio
+
+import numpy as np
+import pandas as pd
+
+from app.services.real_data_service import RealDataService
+
+def _service(failing):
+    service = RealDataService()
+    dates = pd.date_range("2010-01-01", periods=120, freq="MS")
+
+    async def fetch(series_id, limit=100, years=10):
+        if series_id in failing:
+            return None
+        return pd.Series(np.arange(120, dtype=float) + len(series_id), index=dates)
+    service._fetch_fred_data = fetch
+    return service
+
+def test_partial_panel_is_neither_returned_nor_cached():
+    failing = {"UNRATE"}
+    service = _service(failing)
+    assert asyncio.run(service.get_panel_data(["CPIAUCSL", "UNRATE"], freq="M")) is None
+    failing.clear()
+    panel = asyncio.run(service.get_panel_data(["CPIAUCSL", "UNRATE"], freq="M"))
+    assert list(panel.columns) == ["CPIAUCSL", "UNRATE"]
+    assert len(panel) == 120
+
+def test_panel_cache_is_bounded():
+    service = _service(set())
+    service.PANEL_CACHE_SIZE = 2
+    for series_id in ["A", "B", "C"]:
+        asyncio.run(service.get_panel_data([series_id, "CPIAUCSL"], freq="M"))
+    assert [key[0] for key in service._panel_cache] == [("B", "CPIAUCSL"), ("C", "CPIAUCSL")]
@@ -0,0 +1,64 @@
+import asyncio
+
+import numpy as np
+import pandas as pd
+import pytest
+from statsmodels.tsa.vector_ar.var_model import VAR
+
+from app.services.economic_model import stacked_var_coefs
+from app.services.policy_optimizer import PolicyOptimizer
+from app.services.real_data_service import RealDataService
+
+NAMES = ["Interest Rate", "Inflation", "Unemployment"]
+
+def _var_results():
+    rng = np.random.default_rng(0)
+    y = np.zeros((240, 3))
+    y[0] = [3, 3, 5]
+    a = np.array([[0.9, 0.05, -0.05], [-0.05, 0.9, 0.0], [0.04, -0.02, 0.95]])
+    for t in range(1, 240):
+        y[t] = [3, 3, 5] + a @ (y[t - 1] - [3, 3, 5]) + rng.normal(size=3) * [0.2, 0.2, 0.1]
+    return VAR(pd.DataFrame(y, columns=NAMES)).fit(2)
+
+def test_analytic_path_is_a_bounded_local_minimum():
+    optimizer = PolicyOptimizer.from_var(_var_results(), "Interest Rate", {"Inflation": 2.0, "Unemployment": 4.0})
+    result = optimizer.optimize(12)
+    path = result["policy_path"]
+    assert result["loss"] <= result["hold_loss"]
+    for i in range(12):
+        for step in (0.01, -0.01):
+            nudged = np.clip(path + step * np.eye(12)[i], *optimizer.bounds)
+            assert optimizer.loss(nudged[None])[0] >= result["loss"] - 1e-9
+
+def test_cem_approaches_analytic_optimum():
+    optimizer = PolicyOptimizer.from_var(_var_results(), "Interest Rate", {"Inflation": 2.0, "Unemployment": 4.0})
+    exact = optimizer.optimize(6)["loss"]
+    searched = optimizer.optimize(6, method="cem", n_restarts=2, n_jobs=1)["loss"]
+    assert exact <= searched <= exact * 1.05
+
+def test_singular_shock_covariance_is_accepted():
+    results = _var_results()
+    sigma_u = np.asarray(results.sigma_u).copy()
+    sigma_u[2] = sigma_u[1]
+    sigma_u[:, 2] = sigma_u[:, 1]
+    optimizer = PolicyOptimizer(
+        stacked_var_coefs(results), np.asarray(results.endog), sigma_u, NAMES,
+        "Interest Rate", {"Inflation": 2.0}
+    )
+    fan = optimizer.fan_chart(np.full(6, 3.0), n_sims=200)
+    assert np.isfinite(fan["Inflation"]).all()
+
+@pytest.mark.parametrize("horizon", [0, 61, 10_000])
+def test_optimize_policy_rejects_out_of_range_horizon(horizon):
+    service = RealDataService()
+    with pytest.raises(ValueError, match="horizon"):
+        asyncio.run(service.optimize_policy({"Inflation": 2.0}, horizon=horizon))
+
+def test_empty_targets_are_rejected():
+    with pytest.raises(ValueError, match="target"):
+        PolicyOptimizer.from_var(_var_results(), "Interest Rate", {})
+
+def test_single_target_path():
+    optimizer = PolicyOptimizer.from_var(_var_results(), "Interest Rate", {"Inflation": 2.0})
+    assert optimizer.target_index.dtype.kind == "i"
+    assert optimizer.optimize(36)["policy_path"].shape == (36,)
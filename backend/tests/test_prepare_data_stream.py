@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.economic_model import EconomicModelService
+
+def _chunks(frame: pd.DataFrame, size: int):
+    return [frame.iloc[start:start + size] for start in range(0, len(frame), size)]
+
+def _panel() -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    values = rng.normal(size=(60, 3))
+    values[rng.random(values.shape) < 0.25] = np.nan
+    values[:7, 1] = np.nan   # column observed only from row 7
+    values[20:35, 2] = np.nan  # gap spanning several chunks
+    values[5, 0] = 25.0        # outlier
+    return pd.DataFrame(values, columns=["a", "b", "c"], index=pd.date_range("2000-01-01", periods=60, freq="MS"))
+
+def test_gap_is_carried_forward_not_back_filled():
+    service = EconomicModelService()
+    frame = pd.DataFrame({"a": [1, 2, 3, np.nan, np.nan, 6]}, dtype=float)
+    streamed = pd.concat(service.prepare_data_stream(_chunks(frame, 3), outliers="none"))
+    assert streamed["a"].tolist() == [1, 2, 3, 3, 3, 6]
+    assert streamed["a"].tolist() == service.prepare_data(frame, outliers="none")["a"].tolist()
+
+@pytest.mark.parametrize("outliers", ["none", "winsorize", "mask", "drop"])
+@pytest.mark.parametrize("size", [1, 2, 5, 7, 13, 60])
+def test_stream_matches_whole_panel(outliers, size):
+    service = EconomicModelService()
+    frame = _panel()
+    bounds = service.outlier_bounds(frame)
+    expected = service.prepare_data(frame, outliers=outliers, bounds=bounds)
+    streamed = pd.concat(service.prepare_data_stream(_chunks(frame, size), outliers=outliers, bounds=bounds))
+    pd.testing.assert_frame_equal(streamed, expected)
+
+def test_unobserved_column_does_not_hold_back_the_stream():
+    service = EconomicModelService()
+    n = 50
+    frame = pd.DataFrame({"a": np.arange(n, dtype=float), "b": np.nan},
+                         index=pd.date_range("2000-01-01", periods=n, freq="D"))
+    frame.iloc[40:, 1] = 7.0
+    read = []
+
+    def chunks():
+        for chunk in _chunks(frame, 5):
+            read.append(len(chunk))
+            yield chunk
+    stream = service.prepare_data_stream(chunks(), outliers="none", max_pending_rows=10)
+    first = next(stream)
+    # Emitted as soon as the cap is reached, not after the column's first observation at row 40
+    assert len(first) == 10 and sum(read) == 10
+    streamed = pd.concat([first, *stream])
+    assert streamed["a"].tolist() == frame["a"].tolist()
+
+def test_capped_stream_fills_late_column_forward_only():
+    service = EconomicModelService()
+    frame = pd.DataFrame({"a": np.arange(30, dtype=float), "b": np.nan},
+                         index=pd.date_range("2000-01-01", periods=30, freq="D"))
+    frame.iloc[20, 1] = 7.0
+    streamed = pd.concat(service.prepare_data_stream(_chunks(frame, 4), outliers="none", max_pending_rows=8))
+    assert streamed["b"].iloc[:20].isna().all()
+    assert (streamed["b"].iloc[20:] == 7.0).all()
+    assert streamed["a"].tolist() == frame["a"].tolist()
@@ -0,0 +1,61 @@
+import asyncio
+import threading
+import time
+
+from app.core.profiling import ProfileStore, SamplingProfiler
+
+def _busy_in_worker(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        sum(range(1000))
+
+def test_work_offloaded_to_threads_is_sampled_and_labelled():
+    async def handler():
+        profiler = SamplingProfiler(threading.get_ident(), interval=0.002)
+        profiler.start()
+        try:
+            await asyncio.to_thread(_busy_in_worker, 0.2)
+        finally:
+            profiler.stop()
+        return profiler
+
+    profiler = asyncio.run(handler())
+    worker_samples = sum(
+        count for stack, count in profiler.samples.items()
+        if stack[-1].startswith("_busy_in_worker") and stack[0].startswith("[asyncio_")
+    )
+    assert worker_samples >= 5
+    assert not any(stack[0] == "[request-profiler]" for stack in profiler.samples)
+
+def test_idle_pool_workers_are_skipped():
+    async def handler():
+        # Leaves an idle worker thread behind in the default executor
+        await asyncio.to_thread(lambda: None)
+        profiler = SamplingProfiler(threading.get_ident(), interval=0.002)
+        profiler.start()
+        await asyncio.sleep(0.05)
+        profiler.stop()
+        return profiler
+
+    profiler = asyncio.run(handler())
+    assert all(not stack[0].startswith("[asyncio_") for stack in profiler.samples)
+
+def test_store_keeps_only_the_newest_profiles():
+    store = ProfileStore(maxlen=2)
+    profiler = SamplingProfiler(threading.get_ident())
+    for path in ("/a", "/b", "/c"):
+        store.add("GET", path, 200, 0.01, profiler)
+    assert [profile["path"] for profile in store.list()] == ["/c", "/b"]
+    assert store.get(1) is None and store.get(3)["folded"] == ""
+
+def test_sampling_needs_a_token(monkeypatch, caplog):
+    from app import main
+    monkeypatch.setattr(main.settings, "PROFILING_TOKEN", "")
+    monkeypatch.setattr(main.settings, "PROFILING_SAMPLE_RATE", 1.0)
+    with caplog.at_level("WARNING"):
+        middleware = main.ProfilingMiddleware(None)
+    assert not middleware.enabled and middleware.sample_rate == 0
+    assert "PROFILING_TOKEN" in caplog.text
+    monkeypatch.setattr(main.settings, "PROFILING_TOKEN", "secret")
+    middleware = main.ProfilingMiddleware(None)
+    assert middleware.enabled and middleware.sample_rate == 1.0
@@ -0,0 +1,124 @@
+import asyncio
+
+import numpy as np
+import pandas as pd
+import pytest
+from statsmodels.tsa.vector_ar.var_model import VAR
+
+from app.core.config import settings
+from app.services.economic_model import (EconomicModelService, simulate_var_paths, stacked_var_coefs,
+                                         var_forecast_path, var_impulse_matrix)
+from app.services.real_data_service import RealDataService
+from app.services.risk_metrics import TailRiskAccumulator, tail_risk_metrics
+
+NAMES = ["GDP Growth", "Inflation"]
+THRESHOLDS = {"GDP Growth": [("<", 0.0)], "Inflation": [(">", 4.0)]}
+
+def _history(n=80):
+    rng = np.random.default_rng(0)
+    y = np.zeros((n, 2))
+    y[0] = [2.0, 3.0]
+    for t in range(1, n):
+        y[t] = [2.0, 3.0] + np.array([[0.5, 0.1], [0.05, 0.8]]) @ (y[t - 1] - [2.0, 3.0]) + rng.normal(size=2) * [1.5, 0.5]
+    index = pd.period_range("2005Q1", periods=n, freq="Q").to_timestamp()
+    return pd.DataFrame(y, index=index, columns=NAMES)
+
+def _paths(n=4000, steps=6):
+    rng = np.random.default_rng(1)
+    return np.cumsum(rng.normal(size=(n, steps, 2)), axis=1) + [1.0, 3.5]
+
+def test_tails_match_sorted_simulations():
+    paths = _paths()
+    metrics = tail_risk_metrics(paths, NAMES, levels=(0.95, 0.99))
+    for level, key in [(0.95, "95"), (0.99, "99")]:
+        j = int(np.ceil((1 - level) * len(paths)))
+        ordered = np.sort(paths, axis=0)
+        for i, name in enumerate(NAMES):
+            lower, upper = metrics[name]["lower"][key], metrics[name]["upper"][key]
+            np.testing.assert_allclose(lower["var"], np.quantile(paths[:, :, i], 1 - level, axis=0, method="inverted_cdf"))
+            np.testing.assert_allclose(lower["es"], ordered[:j, :, i].mean(axis=0))
+            np.testing.assert_allclose(upper["var"], ordered[-j, :, i])
+            np.testing.assert_allclose(upper["es"], ordered[-j:, :, i].mean(axis=0))
+            np.testing.assert_allclose(metrics[name]["mean"], paths[:, :, i].mean(axis=0))
+
+def test_exceedance_by_step_and_within_every_horizon():
+    paths = _paths()
+    metrics = tail_risk_metrics(paths, NAMES, thresholds=THRESHOLDS)
+    for i, name in enumerate(NAMES):
+        (exceedance,) = metrics[name]["exceedance"]
+        hits = paths[:, :, i] < 0.0 if exceedance["operator"] == "<" else paths[:, :, i] > 4.0
+        np.testing.assert_allclose(exceedance["by_step"], hits.mean(axis=0))
+        for h in range(1, paths.shape[1] + 1):
+            assert exceedance["within_horizon"][h - 1] == pytest.approx(hits[:, :h].any(axis=1).mean())
+
+def test_chunked_updates_match_one_pass():
+    paths = _paths()
+    accumulator = TailRiskAccumulator(NAMES, paths.shape[1], len(paths), thresholds=THRESHOLDS)
+    for chunk in np.array_split(paths, [7, 500, 510, 2600]):
+        accumulator.update(chunk)
+    chunked, whole = accumulator.result(), tail_risk_metrics(paths, NAMES, thresholds=THRESHOLDS)
+    for name in NAMES:
+        for side in ("lower", "upper"):
+            for key, tail in whole[name][side].items():
+                np.testing.assert_allclose(chunked[name][side][key]["var"], tail["var"])
+                np.testing.assert_allclose(chunked[name][side][key]["es"], tail["es"])
+        np.testing.assert_allclose(chunked[name]["exceedance"][0]["within_horizon"], whole[name]["exceedance"][0]["within_horizon"])
+
+def test_impulse_matrix_reproduces_simulated_paths():
+    results = VAR(_history()).fit(3)
+    coefs, history = stacked_var_coefs(results), np.asarray(results.endog)
+    shocks = np.random.default_rng(2).normal(size=(50, 10, 2))
+    expected = simulate_var_paths(coefs, history, shocks)
+    linear = var_forecast_path(coefs, history, 10).reshape(-1) + shocks.reshape(50, -1) @ var_impulse_matrix(coefs, 10)
+    np.testing.assert_allclose(linear.reshape(expected.shape), expected, atol=1e-12)
+    np.testing.assert_allclose(simulate_var_paths(coefs, history, np.zeros((1, 10, 2)))[0],
+                               results.forecast(history[-3:], steps=10), atol=1e-12)
+
+def test_simulated_tails_follow_the_gaussian_forecast_distribution():
+    results = VAR(_history()).fit(1)
+    metrics = EconomicModelService().simulate_tail_risk(results, n_paths=200_000, forecast_steps=4, chunk_size=30_000)
+    mse = results.forecast_cov(4)
+    point = results.forecast(np.asarray(results.endog)[-1:], steps=4)
+    for i, name in enumerate(NAMES):
+        expected = point[:, i] - 1.6448536 * np.sqrt(mse[:, i, i])
+        np.testing.assert_allclose(metrics[name]["lower"]["95"]["var"], expected, atol=0.03)
+
+def test_every_horizon_is_a_slice_of_one_simulation_per_vintage(monkeypatch):
+    monkeypatch.setattr(settings, "TAIL_RISK_PATHS", 5000)
+    service = RealDataService()
+    history = _history()
+
+    async def forecast_history():
+        return history
+    monkeypatch.setattr(service, "_get_forecast_history", forecast_history)
+    calls = []
+    simulate = service.model_service.simulate_tail_risk
+
+    def counted(*args, **kwargs):
+        calls.append(kwargs["forecast_steps"])
+        return simulate(*args, **kwargs)
+    monkeypatch.setattr(service.model_service, "simulate_tail_risk", counted)
+
+    async def run():
+        return await asyncio.gather(service.get_tail_risk(4), service.get_tail_risk(8), service.get_tail_risk(24))
+    short, medium, full = asyncio.run(run())
+    assert calls == [service.MAX_FORECAST_PERIODS]
+    assert short["n_paths"] == 5000
+    for result in (short, medium):
+        h = result["horizon"]
+        for name in NAMES:
+            variable, longest = result["variables"][name], full["variables"][name]
+            assert variable["mean"] == longest["mean"][:h]
+            assert variable["lower"]["95"]["var"] == longest["lower"]["95"]["var"][:h]
+            assert variable["exceedance"][0]["by_step"] == longest["exceedance"][0]["by_step"][:h]
+    within = [r["variables"]["GDP Growth"]["exceedance"][0]["within_horizon"] for r in (short, medium, full)]
+    assert within == sorted(within)
+
+    history = history.iloc[:-1]
+    asyncio.run(service.get_tail_risk(4))
+    assert len(calls) == 2
+
+@pytest.mark.parametrize("horizon", [0, 25])
+def test_tail_risk_rejects_out_of_range_horizon(horizon):
+    with pytest.raises(ValueError, match="horizon"):
+        asyncio.run(RealDataService().get_tail_risk(horizon))
@@ -0,0 +1,22 @@
+from datetime import datetime
+
+import numpy as np
+
+from app.utils.sample_data import generate_synthetic_panel, write_synthetic_panel
+
+def test_npy_panel_matches_in_memory_panel(tmp_path):
+    options = dict(n_indicators=5, start_date=datetime(2000, 1, 1), end_date=datetime(2000, 12, 31),
+                   chunk_rows=50, dtype=np.float32, seed=4)
+    path = tmp_path / "panel.npy"
+    rows = write_synthetic_panel(str(path), **options)
+    expected = generate_synthetic_panel(**options)
+    assert rows == len(expected) == 366
+    stored = np.load(path)
+    assert stored.dtype == np.float32
+    np.testing.assert_array_equal(stored, expected.to_numpy())
+    np.testing.assert_array_equal(np.load(tmp_path / "panel.dates.npy"), expected.index.values)
+
+def test_npy_panel_uses_iterator_defaults(tmp_path):
+    rows = write_synthetic_panel(str(tmp_path / "p.npy"), n_indicators=2, freq="MS", seed=0)
+    assert rows == len(generate_synthetic_panel(2, freq="MS", seed=0))
+    assert np.load(tmp_path / "p.npy").shape == (rows, 2)
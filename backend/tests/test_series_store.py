@@ -0,0 +1,52 @@
+import asyncio
+import os
+
+import numpy as np
+import pandas as pd
+
+from app.services.series_store import SeriesStore
+
+class _Upstream:
+    def __init__(self, known):
+        self.known = known
+        self.calls = []
+
+    async def _fetch_fred_data(self, series_id, limit=None, years=60):
+        self.calls.append(series_id)
+        if series_id not in self.known:
+            return None
+        return pd.Series(np.arange(100, dtype=float), index=pd.date_range("2000-01-01", periods=100, freq="MS"))
+
+def test_query_slices_by_inclusive_dates(tmp_path):
+    store = SeriesStore(_Upstream({"CPI"}), str(tmp_path))
+    dates, values = asyncio.run(store.query("CPI", start=pd.Timestamp("2001-01-01"), end=pd.Timestamp("2001-06-15")))
+    assert pd.DatetimeIndex(dates).strftime("%Y-%m").tolist() == [f"2001-0{m}" for m in range(1, 7)]
+    assert values.tolist() == [12.0, 13.0, 14.0, 15.0, 16.0, 17.0]
+    dates, _ = asyncio.run(store.query("CPI", start=pd.Timestamp("2008-04-01")))
+    assert len(dates) == 1
+    dates, _ = asyncio.run(store.query("CPI", end=pd.Timestamp("1999-12-31")))
+    assert len(dates) == 0
+    # Reloaded from disk by a fresh store without going upstream
+    upstream = _Upstream(set())
+    dates, values = asyncio.run(SeriesStore(upstream, str(tmp_path)).query("CPI"))
+    assert len(values) == 100 and upstream.calls == []
+
+def test_unknown_ids_are_not_refetched_within_missing_ttl(tmp_path):
+    upstream = _Upstream(set())
+    store = SeriesStore(upstream, str(tmp_path), missing_ttl=60)
+    for _ in range(3):
+        assert asyncio.run(store.get("NOPE")) is None
+    assert upstream.calls == ["NOPE"]
+    store.missing_ttl = 0
+    assert asyncio.run(store.get("NOPE")) is None
+    assert upstream.calls == ["NOPE", "NOPE"]
+    assert store._locks == {}
+
+def test_memory_and_disk_are_bounded(tmp_path):
+    ids = [f"S{i}" for i in range(6)]
+    store = SeriesStore(_Upstream(set(ids)), str(tmp_path), max_series=2, max_files=3)
+    for i, series_id in enumerate(ids):
+        asyncio.run(store.get(series_id))
+        os.utime(store._path(series_id), (i, i))
+    assert list(store._series) == ["S4", "S5"]
+    assert sorted(os.listdir(tmp_path)) == ["S3.npz", "S4.npz", "S5.npz"]
@@ -0,0 +1,17 @@
+import numpy as np
+
+from app.utils.shock_propagation import propagate_shocks, random_spillovers
+
+def test_combined_equals_sum_of_individual_scenarios():
+    rng = np.random.default_rng(0)
+    base = rng.uniform(1, 5, size=(40, 4))
+    n_shocks = 25
+    # Repeated indicators exercise the unbuffered accumulation of the direct term
+    indicators = rng.integers(0, 4, n_shocks)
+    periods = rng.integers(0, 40, n_shocks)
+    sizes = rng.normal(0, 0.1, n_shocks)
+    spillovers = random_spillovers(4, rng=rng)
+
+    panels = propagate_shocks(base, indicators, periods, sizes, spillovers)
+    combined = propagate_shocks(base, indicators, periods, sizes, spillovers, combine=True)
+    np.testing.assert_allclose(combined, base + (panels - base).sum(axis=0))
@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+import pytest
+from statsmodels.tsa.vector_ar.var_model import VAR
+
+from app.services.economic_model import EconomicModelService, lag_design_matrix
+
+def _data(n=150):
+    rng = np.random.default_rng(0)
+    y = np.zeros((n, 3))
+    a = np.array([[0.5, 0.1, 0.0], [0.1, 0.4, 0.1], [0.0, 0.2, 0.3]])
+    for t in range(2, n):
+        y[t] = a @ y[t - 1] - 0.2 * y[t - 2] + rng.normal(size=3)
+    return pd.DataFrame(y, columns=["a", "b", "c"])
+
+def test_lag_design_matrix_rows():
+    y = _data().to_numpy()
+    design = lag_design_matrix(y, 3)
+    assert design.shape == (len(y) - 3, 1 + 3 * 3)
+    for row, t in [(0, 3), (50, 53), (len(y) - 4, len(y) - 1)]:
+        np.testing.assert_array_equal(design[row], np.concatenate([[1.0], y[t - 1], y[t - 2], y[t - 3]]))
+
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_select_var_order_matches_statsmodels(n_jobs):
+    data = _data()
+    table = EconomicModelService().select_var_order(data, maxlags=6, n_jobs=n_jobs).sort_index()
+    reference = VAR(data).select_order(6)
+    for criterion in ("aic", "bic", "hqic"):
+        np.testing.assert_allclose(table[criterion], np.asarray(reference.ics[criterion])[1:], rtol=1e-10)
+        assert table[criterion].idxmin() == reference.selected_orders[criterion]
+    assert (table["n_origins"] == 8).all()
+    assert table["oos_rmse"].notna().all()
+
+def test_select_var_order_ranking_and_validation():
+    service = EconomicModelService()
+    table = service.select_var_order(_data(), maxlags=4, rank_by="bic", n_jobs=1)
+    assert table["bic"].is_monotonic_increasing
+    assert table["bic_rank"].iloc[0] == 1
+    with pytest.raises(ValueError):
+        service.select_var_order(_data(), maxlags=4, rank_by="fpe", n_jobs=1)
+    with pytest.raises(ValueError):
+        service.select_var_order(_data(20), maxlags=6, n_jobs=1)